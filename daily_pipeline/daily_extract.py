@@ -4,14 +4,23 @@
 
 import asyncio
 import os
+import gzip
+import json
 from datetime import datetime, timedelta
+from tempfile import SpooledTemporaryFile
 import logging
 
 import aiohttp
 from bs4 import BeautifulSoup
+from botocore.client import BaseClient
+from botocore.exceptions import BotoCoreError, ClientError
+
+from daily_load import get_archive_partition
 
 
 BASE_URL = "https://caselaw.nationalarchives.gov.uk/atom.xml?per_page=9999"
+SPOOL_THRESHOLD = 5 * 1024 * 1024
+ARCHIVE_RANGE_SIZE = 1024 * 1024
 
 
 async def get_judgments_from_atom_feed(url: str) -> list[dict[str, str]]:
@@ -80,3 +89,107 @@ async def download_days_judgments(folder_path: str) -> None:
             await task
         yesterday = datetime.today() - timedelta(days=1)
         logging.info("All judgments for day %s downloaded.", yesterday.strftime("%B %d %Y"))
+
+
+async def download_url_to_buffer(url: str, file_name: str,
+                                 spool_threshold: int = SPOOL_THRESHOLD) -> dict:
+    """Downloads a file from a URL into memory, spilling to a temporary file
+    only once it grows past the spool threshold.
+    Returns a staged judgment dictionary, or None if the download failed."""
+    async with aiohttp.ClientSession() as session:
+        try:
+            async with session.get(url, timeout=60) as response:
+                response.raise_for_status()
+                buffer = SpooledTemporaryFile(max_size=spool_threshold)
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    buffer.write(chunk)
+            buffer.seek(0)
+            logging.info("Downloaded %s to memory", url)
+            return {"title": file_name, "xml": buffer}
+        except asyncio.TimeoutError:
+            logging.error("Timeout error while downloading %s", url)
+        except aiohttp.ClientError as e:
+            logging.error("Error downloading file from URL %s: %s", url, str(e))
+        return None
+
+
+async def fetch_days_judgments() -> list[dict]:
+    """Handles getting and downloading judgments for previous day into memory.
+    Returns a list of staged judgment dictionaries."""
+    daily_link = create_daily_atom_feed_url()
+    daily_judgments = await get_judgments_from_atom_feed(daily_link)
+    if not daily_judgments:
+        return []
+    staged_judgments = await asyncio.gather(
+        *[download_url_to_buffer(judgment["link"], judgment["title"])
+          for judgment in daily_judgments])
+    yesterday = datetime.today() - timedelta(days=1)
+    logging.info("All judgments for day %s downloaded.", yesterday.strftime("%B %d %Y"))
+    return [judgment for judgment in staged_judgments if judgment]
+
+
+def stage_judgments_from_folder(folder_path: str) -> list[dict]:
+    """Opens every downloaded judgment in a folder for processing.
+    Returns a list of staged judgment dictionaries."""
+    return [{"title": file_name,
+             "xml": open(os.path.join(folder_path, file_name), "rb")}  # pylint: disable=consider-using-with
+            for file_name in sorted(os.listdir(folder_path))]
+
+
+def get_archive_manifest(s3_client: BaseClient, bucket_name: str, day: datetime) -> list[dict]:
+    """Fetches the manifest of judgments archived for a judgment date.
+    Returns an empty list if nothing was archived for that date."""
+    manifest_key = f"{get_archive_partition(day.strftime('%Y-%m-%d'))}/manifest.json"
+    try:
+        response = s3_client.get_object(Bucket=bucket_name, Key=manifest_key)
+        return json.loads(response["Body"].read())
+    except (ClientError, ValueError):
+        return []
+
+
+def read_object_range(s3_client: BaseClient, bucket_name: str, s3_key: str,
+                      start: int, end: int) -> bytes:
+    """Returns the bytes of an S3 object between two inclusive offsets."""
+    response = s3_client.get_object(Bucket=bucket_name, Key=s3_key,
+                                    Range=f"bytes={start}-{end}")
+    return response["Body"].read()
+
+
+async def download_archived_xml(s3_client: BaseClient, bucket_name: str, entry: dict,
+                                semaphore: asyncio.Semaphore,
+                                range_size: int = ARCHIVE_RANGE_SIZE) -> dict:
+    """Downloads an archived judgment with concurrent ranged GETs and decompresses it.
+    Returns a staged judgment dictionary, or None if the download failed."""
+    async def read_range(start: int) -> bytes:
+        async with semaphore:
+            return await asyncio.to_thread(read_object_range, s3_client, bucket_name,
+                                           entry["key"], start,
+                                           min(start + range_size, entry["size"]) - 1)
+    try:
+        parts = await asyncio.gather(*[read_range(start)
+                                       for start in range(0, entry["size"], range_size)])
+        xml_content = gzip.decompress(b"".join(parts))
+    except (BotoCoreError, ClientError, OSError) as e:
+        logging.error("Error reading archived judgment %s: %s", entry["key"], str(e))
+        return None
+    buffer = SpooledTemporaryFile(max_size=SPOOL_THRESHOLD)
+    buffer.write(xml_content)
+    buffer.seek(0)
+    return {"title": entry["title"], "xml": buffer}
+
+
+async def fetch_archived_judgments(s3_client: BaseClient, bucket_name: str,
+                                   start_date: datetime, end_date: datetime) -> list[dict]:
+    """Reads every judgment archived between two judgment dates (inclusive) back from S3,
+    at most as many ranges at once as the client has connections.
+    Returns a list of staged judgment dictionaries."""
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    manifests = await asyncio.gather(*[asyncio.to_thread(get_archive_manifest, s3_client,
+                                                         bucket_name, day) for day in days])
+    semaphore = asyncio.Semaphore(s3_client.meta.config.max_pool_connections)
+    staged_judgments = await asyncio.gather(
+        *[download_archived_xml(s3_client, bucket_name, entry, semaphore)
+          for manifest in manifests for entry in manifest])
+    logging.info("Read %s archived judgments between %s and %s.", len(staged_judgments),
+                 start_date.strftime("%B %d %Y"), end_date.strftime("%B %d %Y"))
+    return [judgment for judgment in staged_judgments if judgment]
@@ -1,16 +1,23 @@
 """Seeding initial judgment data."""
 import os
+import re
+import gzip
+import json
+import hashlib
 import logging
 import asyncio
+from time import perf_counter
+from datetime import date, datetime, timezone
 
 import psycopg2
 from psycopg2.extensions import connection
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import RealDictCursor, execute_values
 from botocore.exceptions import BotoCoreError
 from boto3 import client
 from botocore.client import BaseClient
 from botocore.config import Config
-from botocore.exceptions import NoCredentialsError, PartialCredentialsError
+from botocore.exceptions import NoCredentialsError, PartialCredentialsError, ClientError
 
 def get_db_connection(dbname: str, user: str, password: str, host: str, port: str) -> connection:
     """Establishes a connection to PostgreSQL.
@@ -24,222 +31,426 @@ def get_db_connection(dbname: str, user: str, password: str, host: str, port: st
         raise psycopg2.DatabaseError("Error connecting to database.") from e
 
 
-def get_judgment_type_mapping(conn: connection) -> dict:
-    """Gets map of existing judgment types from database.
-    Returns a dictionary."""
-    with conn.cursor() as cursor:
-        cursor.execute("""select judgment_type, judgment_type_id from judgment_type""")
-        return {x["judgment_type"].lower(): x["judgment_type_id"] for x in cursor.fetchall()}
-
-
-def get_court_mapping(conn: connection) -> dict:
-    """Gets map of existing courts from database.
-    Returns a dictionary."""
-    with conn.cursor() as cursor:
-        cursor.execute("""select court_id, court_name from court""")
-        return {x["court_name"].lower(): x["court_id"] for x in cursor.fetchall()}
+DIMENSION_TABLES = {
+    "role": ("role_id", "role_name"),
+    "court": ("court_id", "court_name"),
+    "chamber": ("chamber_id", "chamber_name"),
+    "judgment_type": ("judgment_type_id", "judgment_type")
+}
+
+
+def select_dimension_ids(cursor: connection.cursor, table: str, names: set[str]) -> dict:
+    """Looks up existing ids for the given names in a dimension table.
+    Returns a dictionary of lower-cased names to ids."""
+    if not names:
+        return {}
+    id_column, name_column = DIMENSION_TABLES[table]
+    cursor.execute(f"""select {id_column}, {name_column} from {table}
+                   where lower({name_column}) = any(%s)""", (sorted(names),))
+    return {x[name_column].lower(): x[id_column] for x in cursor.fetchall()}
+
+
+def upsert_dimension_names(cursor: connection.cursor, table: str, names: set[str]) -> dict:
+    """Inserts any new names into a dimension table and returns ids for every name,
+    existing or new, in one statement.
+    Returns a dictionary of lower-cased names to ids."""
+    if not names:
+        return {}
+    id_column, name_column = DIMENSION_TABLES[table]
+    upsert_query = f"""insert into {table} ({name_column}) values %s
+                    on conflict (lower({name_column}))
+                    do update set {name_column} = excluded.{name_column}
+                    returning {id_column}, {name_column}"""
+    rows = execute_values(cursor, upsert_query, [(name,) for name in sorted(names)],
+                          page_size=len(names), fetch=True)
+    return {x[name_column].lower(): x[id_column] for x in rows}
+
+
+def resolve_base_maps(conn: connection, combined_data: list[dict]) -> dict[dict]:
+    """Upserts the roles, courts and chambers named in a batch of judgments
+    and looks up ids only for the names in that batch.
+    Returns a dictionary of dictionaries."""
+    roles = {party['party_role'].lower()
+             for case in combined_data
+             for party in case['parties']}
+    rulings = {case['ruling'].lower() for case in combined_data}
+    courts = {(case['court_name'] or '').lower() for case in combined_data}
+    chambers = {counsel['chamber_name'].lower()
+                for case in combined_data
+                for party in case['parties']
+                for counsel in party['counsels']}
+    judgment_types = {case['type_of_crime'].lower() for case in combined_data}
 
+    try:
+        with conn.cursor() as cursor:
+            role_map = upsert_dimension_names(
+                cursor, "role", {role for role in roles if is_valid_name(role)})
+            role_map.update(select_dimension_ids(cursor, "role", rulings - role_map.keys()))
+            court_map = upsert_dimension_names(
+                cursor, "court", {court for court in courts if is_valid_name(court)})
+            chamber_map = upsert_dimension_names(
+                cursor, "chamber", {chamber for chamber in chambers if is_valid_name(chamber)})
+            judgment_type_map = select_dimension_ids(cursor, "judgment_type", judgment_types)
+        conn.commit()
+    except psycopg2.Error as e:
+        conn.rollback()
+        logging.error("Error resolving base tables: %s", str(e))
+        raise
+    return {
+        "role_map" : role_map,
+        "chamber_map" : chamber_map,
+        "court_map" : court_map,
+        "judgment_type_map": judgment_type_map
+        }
 
-def get_role_mapping(conn: connection) -> dict:
-    """Gets map of existing roles from database.
-    Returns a dictionary."""
-    with conn.cursor() as cursor:
-        cursor.execute("""select role_id, role_name from role""")
-        return {x["role_name"].lower(): x["role_id"] for x in cursor.fetchall()}
 
+def is_valid_name(name: str) -> bool:
+    """Checks a name is non-empty and fits in the database columns.
+    Returns a boolean."""
+    return bool(name) and len(name) <= 100
 
-def get_chamber_mapping(conn: connection) -> dict:
-    """Gets map of existing chambers from database.
-    Returns a dictionary."""
-    with conn.cursor() as cursor:
-        cursor.execute("""select chamber_name, chamber_id from chamber""")
-        return {x["chamber_name"].lower(): x["chamber_id"] for x in cursor.fetchall()}
 
+def build_judgment_rows(combined_data: list[dict], base_maps: dict[dict]) -> dict[list]:
+    """Builds the rows for every table from a batch of judgments in memory.
+    Returns a dictionary of row lists keyed by table."""
+    role_map = base_maps["role_map"]
+    chamber_map = base_maps["chamber_map"]
+    court_map = base_maps["court_map"]
+    judgment_type_map = base_maps["judgment_type_map"]
 
-def get_counsel_mapping(conn: connection) -> dict:
-    """Gets map of existing counsels from database.
-    Returns a dictionary."""
-    with conn.cursor() as cursor:
-        cursor.execute("""select counsel_name, counsel_id from counsel""")
-        return {x["counsel_name"].lower(): x["counsel_id"] for x in cursor.fetchall()}
+    judgment_rows = []
+    party_rows = []
+    counsels = {}
+    assignment_keys = []
+    seen_citations = set()
 
+    for case in combined_data:
+        in_favour_of = case['ruling'].lower()
+        judgment_type = case['type_of_crime'].lower()
+        judgment_date = case['judgment_date']
+        judge_name = case['judge']
+        neutral_citation = case['neutral_citation']
+        judgment_summary = case['judgment_description']
+        court_name = (case['court_name'] or '').lower()
+        if not (court_name and judgment_date and neutral_citation and
+                court_map.get(court_name) and role_map.get(in_favour_of) and
+                judgment_type_map.get(judgment_type) and
+                all(len(x) <= 100 for x in [in_favour_of, judgment_type, judgment_date,
+                                            judge_name, neutral_citation, court_name])):
+            continue
+        if neutral_citation in seen_citations:
+            logging.warning("Skipping duplicate judgment %s in batch.", neutral_citation)
+            continue
+        seen_citations.add(neutral_citation)
+
+        judgment_rows.append((neutral_citation,
+                              court_map.get(court_name),
+                              judgment_date,
+                              judgment_summary,
+                              role_map.get(in_favour_of),
+                              judgment_type_map.get(judgment_type),
+                              judge_name,
+                              case.get('extraction_model'),
+                              case.get('prompt_version')))
+        for party in case['parties']:
+            party_name = party.get('party_name', '').lower()
+            party_role = party.get('party_role', '').lower()
+            if not (is_valid_name(party_name) and role_map.get(party_role)):
+                continue
+            party_rows.append((party_name, role_map[party_role], neutral_citation))
+            for counsel in party['counsels']:
+                counsel_name = counsel.get('counsel_name', '').lower()
+                if not is_valid_name(counsel_name):
+                    continue
+                counsels.setdefault(
+                    counsel_name, chamber_map.get(counsel.get('chamber_name', '').lower()))
+                assignment_keys.append((neutral_citation, party_name, counsel_name))
 
-def get_base_maps(conn: connection) -> dict[dict]:
-    """Gets base maps from database.
-    Returns a dictionary of dictionaries."""
-    role_mapping = get_role_mapping(conn)
-    chamber_mapping = get_chamber_mapping(conn)
-    court_mapping = get_court_mapping(conn)
-    judgment_type_mapping = get_judgment_type_mapping(conn)
-    counsel_mapping = get_counsel_mapping(conn)
     return {
-        "role_map" : role_mapping,
-        "chamber_map" : chamber_mapping,
-        "court_map" : court_mapping,
-        "judgment_type_map": judgment_type_mapping,
-        "counsel_map": counsel_mapping
+        "judgment": judgment_rows,
+        "party": party_rows,
+        "counsel": sorted(counsels.items()),
+        "counsel_assignment": assignment_keys
         }
 
-def seed_db_base_tables(combined_data: list[dict], conn: connection, base_maps: dict[dict]) -> None:
-    """Seeds all the base tables.
-    Returns None."""
-    cursor = conn.cursor()
-    roles = {party['party_role'].lower()
-            for case in combined_data
-            for party in case['parties']}
-
-    roles = [(role,) for role in roles if role not in base_maps["role_map"] and len(role) <= 100]
-    role_insert_query = """insert into role (role_name) values %s returning role_id, role_name"""
-    execute_values(cursor, role_insert_query, roles)
-    conn.commit()
 
-
-    courts = {(case['court_name'].lower())
-                for case in combined_data
-                }
-    courts = [(court,) for court in courts if court not in base_maps["court_map"] \
-              and len(court) <= 100]
-    court_insert_query = """insert into court
-                            (court_name) 
-                            values %s 
-                            returning court_id, court_name"""
-    execute_values(cursor, court_insert_query, courts)
-    conn.commit()
-
-    chambers = {
-        (counsel['chamber_name'].lower())
-        for case in combined_data
-        for party in case['parties']
-        for counsel in party['counsels']
-    }
-    chambers = [(chamber,) for chamber in chambers if chamber not in base_maps["chamber_map"] \
-                and len(chamber) <= 100]
-    chambers_insert_query = """insert into chamber
-                                (chamber_name) 
-                                values %s 
-                                returning chamber_id, chamber_name"""
-    execute_values(cursor, chambers_insert_query, chambers)
-
-    conn.commit()
-    cursor.close()
+def upsert_judgment_table(cursor: connection.cursor, judgment_table_data: list[tuple]) -> dict:
+    """Upserts judgment table data into judgment table in one statement, keyed on
+    neutral citation. Rows identical to the stored judgment are left untouched.
+    Returns counts of inserted, updated and unchanged judgments."""
+    judgment_table_upsert_query = """insert into judgment
+    (neutral_citation, court_id, judgment_date, judgment_summary,
+     in_favour_of, judgment_type_id, judge_name, extraction_model, prompt_version)
+    values %s
+    on conflict (neutral_citation) do update set
+        court_id = excluded.court_id,
+        judgment_date = excluded.judgment_date,
+        judgment_summary = excluded.judgment_summary,
+        in_favour_of = excluded.in_favour_of,
+        judgment_type_id = excluded.judgment_type_id,
+        judge_name = excluded.judge_name,
+        extraction_model = excluded.extraction_model,
+        prompt_version = excluded.prompt_version
+    where (judgment.court_id, judgment.judgment_date, judgment.judgment_summary,
+           judgment.in_favour_of, judgment.judgment_type_id, judgment.judge_name,
+           judgment.extraction_model, judgment.prompt_version)
+        is distinct from
+          (excluded.court_id, excluded.judgment_date, excluded.judgment_summary,
+           excluded.in_favour_of, excluded.judgment_type_id, excluded.judge_name,
+           excluded.extraction_model, excluded.prompt_version)
+    returning neutral_citation, (xmax = 0) as inserted"""
+    rows = execute_values(cursor, judgment_table_upsert_query,
+                judgment_table_data, page_size=len(judgment_table_data), fetch=True)
+    inserted = sum(1 for x in rows if x["inserted"])
+    return {
+        "inserted": inserted,
+        "updated": len(rows) - inserted,
+        "unchanged": len(judgment_table_data) - len(rows)
+        }
 
 
-def insert_judgment_table(conn: connection, cursor: connection.cursor,
-                          judgment_table_data: list[tuple]) -> None:
-    """Inserts judgment table data into judgment table.
+def delete_judgment_children(cursor: connection.cursor, neutral_citations: list[str]) -> None:
+    """Deletes the party and counsel assignment rows of the given judgments
+    so they can be replaced.
     Returns None."""
-    judgment_table_insert_query = """insert into judgment
-    values %s"""
-    execute_values(cursor, judgment_table_insert_query,
-                judgment_table_data)
-    conn.commit()
+    cursor.execute("""delete from counsel_assignment
+                   where party_id in (select party_id from party
+                                      where neutral_citation = any(%s))""",
+                   (neutral_citations,))
+    cursor.execute("""delete from party where neutral_citation = any(%s)""",
+                   (neutral_citations,))
 
 
-def insert_party_table(conn: connection, cursor: connection.cursor,
-                       party_table_data: list[tuple]) -> dict:
-    """Inserts party table data into party table.
-    Returns map of party names and ids."""
+def insert_party_table(cursor: connection.cursor, party_table_data: list[tuple]) -> dict:
+    """Inserts party table data into party table in one statement.
+    Returns map of (neutral citation, party name) to party ids."""
     party_table_insert_query = """insert into party (party_name, role_id, neutral_citation)
-                                                values %s returning party_name, party_id"""
-    execute_values(cursor, party_table_insert_query,
-                party_table_data)
-    conn.commit()
-    party_map = {x["party_name"].lower(): x["party_id"] for x in cursor.fetchall()}
-    return party_map
+                                                values %s
+                                                returning party_name, neutral_citation, party_id"""
+    rows = execute_values(cursor, party_table_insert_query,
+                party_table_data, page_size=len(party_table_data), fetch=True)
+    return {(x["neutral_citation"], x["party_name"].lower()): x["party_id"] for x in rows}
 
 
-def insert_counsel_table(conn: connection, cursor: connection.cursor,
-                         counsel_table_data: list[tuple]) -> dict:
-    """Inserts counsel table data into counsel table.
-    Returns map of new counsel names and ids."""
+def insert_counsel_table(cursor: connection.cursor, counsel_table_data: list[tuple]) -> dict:
+    """Upserts counsel table data into counsel table in one statement,
+    keeping the chamber of counsels that already exist.
+    Returns map of counsel names and ids for the whole batch."""
     counsel_table_insert_query = """insert into counsel (counsel_name, chamber_id)
-                                                values %s returning counsel_name, counsel_id"""
-    execute_values(cursor, counsel_table_insert_query, counsel_table_data)
-    conn.commit()
-    counsel_map = {x["counsel_name"].lower(): x["counsel_id"] for x in cursor.fetchall()}
-    return counsel_map
+                                                values %s
+                                                on conflict (lower(counsel_name))
+                                                do update set counsel_name = excluded.counsel_name
+                                                returning counsel_name, counsel_id"""
+    rows = execute_values(cursor, counsel_table_insert_query, counsel_table_data,
+                          page_size=len(counsel_table_data), fetch=True)
+    return {x["counsel_name"].lower(): x["counsel_id"] for x in rows}
 
 
-def insert_counsel_assignment_table(conn: connection, cursor: connection.cursor,
+def insert_counsel_assignment_table(cursor: connection.cursor,
                                     counsel_assignment_table_data: list[tuple]) -> None:
-    """Inserts counsel assignment table data into counsel assignment table.
+    """Inserts counsel assignment table data into counsel assignment table in one statement.
     Returns None."""
     counsel_assignment_insert_query = """insert into counsel_assignment
                                                     (party_id,counsel_id)
                                                     values %s"""
     execute_values(cursor, counsel_assignment_insert_query,
-                counsel_assignment_table_data)
-    conn.commit()
+                counsel_assignment_table_data, page_size=len(counsel_assignment_table_data))
 
 
 def seed_judgment_data(conn: connection, combined_data: list[dict],
-                       base_maps: dict[dict, dict]) -> None:
-    """Seeds judgment data into database.
+                       base_maps: dict[dict, dict]) -> dict:
+    """Seeds a batch of judgment data into database in a single transaction,
+    writing each table once. Existing judgments are updated and their parties
+    and counsel assignments replaced, so a batch can be safely rerun.
+    Nothing is committed if any statement fails.
+    Returns counts of inserted, updated and unchanged judgments."""
+    rows = build_judgment_rows(combined_data, base_maps)
+    if not rows["judgment"]:
+        logging.info("No valid judgments to seed.")
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+    try:
+        with conn.cursor() as cursor:
+            counts = upsert_judgment_table(cursor, rows["judgment"])
+            delete_judgment_children(cursor, [row[0] for row in rows["judgment"]])
+            party_map = insert_party_table(cursor, rows["party"]) if rows["party"] else {}
+            counsel_map = insert_counsel_table(cursor, rows["counsel"]) if rows["counsel"] else {}
+            counsel_assignment_table_data = [
+                (party_map[(neutral_citation, party_name)], counsel_map[counsel_name])
+                for neutral_citation, party_name, counsel_name in rows["counsel_assignment"]
+            ]
+            if counsel_assignment_table_data:
+                insert_counsel_assignment_table(cursor, counsel_assignment_table_data)
+        conn.commit()
+    except psycopg2.Error as e:
+        conn.rollback()
+        logging.error("Error seeding judgment data, batch rolled back: %s", str(e))
+        raise
+    logging.info("Seeded judgments: %s inserted, %s updated, %s unchanged.",
+                 counts["inserted"], counts["updated"], counts["unchanged"])
+    return counts
+
+
+def create_load_pool(max_connections: int, dbname: str, user: str, password: str,
+                     host: str, port: str) -> dict:
+    """Creates a thread-safe PostgreSQL connection pool for concurrent loads,
+    with a semaphore so callers wait for a free connection instead of erroring.
+    Returns a dictionary holding the pool, semaphore and load statistics."""
+    try:
+        pool = ThreadedConnectionPool(
+            1, max_connections, dbname=dbname, user=user, password=password,
+            host=host, port=port, cursor_factory=RealDictCursor)
+    except psycopg2.DatabaseError as e:
+        raise psycopg2.DatabaseError("Error connecting to database.") from e
+    return {
+        "pool": pool,
+        "semaphore": asyncio.Semaphore(max_connections),
+        "stats": {"batches": 0, "pool_wait_seconds": 0.0, "query_seconds": 0.0,
+                  "inserted": 0, "updated": 0, "unchanged": 0}
+        }
+
+
+def load_judgments(conn: connection, combined_data: list[dict]) -> dict:
+    """Resolves base tables and seeds a batch of judgments on one connection.
+    Returns counts of inserted, updated and unchanged judgments."""
+    mappings = resolve_base_maps(conn, combined_data)
+    return seed_judgment_data(conn, combined_data, mappings)
+
+
+async def load_judgments_async(load_pool: dict, combined_data: list[dict]) -> dict:
+    """Loads a batch of judgments on a pooled connection in a worker thread,
+    recording time spent waiting for a connection and running queries.
+    Returns counts of inserted, updated and unchanged judgments."""
+    stats = load_pool["stats"]
+    wait_start = perf_counter()
+    async with load_pool["semaphore"]:
+        conn = await asyncio.to_thread(load_pool["pool"].getconn)
+        stats["pool_wait_seconds"] += perf_counter() - wait_start
+        query_start = perf_counter()
+        try:
+            counts = await asyncio.to_thread(load_judgments, conn, combined_data)
+        finally:
+            stats["query_seconds"] += perf_counter() - query_start
+            load_pool["pool"].putconn(conn)
+    stats["batches"] += 1
+    for key, value in counts.items():
+        stats[key] += value
+    return counts
+
+
+def log_load_stats(load_pool: dict) -> None:
+    """Logs the pool wait time, query time and row counts of all loads.
     Returns None."""
-    role_map = base_maps["role_map"]
-    chamber_map = base_maps["chamber_map"]
-    court_map = base_maps["court_map"]
-    judgment_type_map = base_maps["judgment_type_map"]
-    counsel_map = base_maps["counsel_map"]
+    stats = load_pool["stats"]
+    logging.info("Loaded %s batches: %s inserted, %s updated, %s unchanged.",
+                 stats["batches"], stats["inserted"], stats["updated"], stats["unchanged"])
+    logging.info("Database pool wait %.2fs, query time %.2fs.",
+                 stats["pool_wait_seconds"], stats["query_seconds"])
 
-    for case in combined_data:
-        judgment_table_data = []
-        party_table_data = []
-        counsel_table_data = []
-        counsel_assignment_table_data = []
 
-        in_favour_of = case['ruling'].lower()
-        judgment_type = case['type_of_crime'].lower()
-        judgment_date = case['judgment_date']
-        judge_name = case['judge']
-        neutral_citation = case['neutral_citation']
-        judgment_summary = case['judgment_description']
-        court_name = case['court_name'].lower()
-        if court_name and judgment_date and neutral_citation and \
-            court_map.get(court_name) and role_map.get(in_favour_of.lower()) and \
-            judgment_type_map.get(judgment_type) and \
-                all(len(x) <= 100 for x in [in_favour_of, judgment_type, judgment_date,
-                                            judge_name, neutral_citation, court_name]):
-            for party in case['parties']:
-                party_name = party.get('party_name', '').lower()
-                party_role = party.get('party_role', '').lower()
-                if len(party_name) <= 100 and len(party_name) != 0 and \
-                    len(party_role) <= 100 and len(party_role) != 0:
-                    party_table_data.append((party_name,
-                                            role_map[party_role],
-                                            neutral_citation))
-                    for counsel in party['counsels']:
-                        chamber_id = chamber_map[counsel['chamber_name'].lower()]
-                        counsel_name = counsel.get('counsel_name', '').lower()
-                        if len(counsel_name) <= 100:
-                            if counsel_name not in counsel_map:
-                                counsel_table_data.append((counsel_name, chamber_id))
-            judgment_table_data.append((neutral_citation,
-                                        court_map.get(court_name),
-                                        judgment_date,
-                                        judgment_summary,
-                                        role_map.get(in_favour_of.lower()),
-                                        judgment_type_map.get(judgment_type),
-                                        judge_name))
+DASHBOARD_VIEWS = ["judgments_by_court", "judgments_by_type", "judgments_by_date_and_type",
+                   "judgments_by_judge", "judgments_by_chamber", "judgment_filter_facets",
+                   "chamber_judgment_stats"]
 
+
+def refresh_dashboard_views(conn: connection) -> None:
+    """Refreshes the dashboard's materialised aggregates without blocking readers,
+    committing after each view so one failure does not undo the others."""
+    for view in DASHBOARD_VIEWS:
+        start = perf_counter()
+        try:
             with conn.cursor() as cursor:
-                insert_judgment_table(conn, cursor, judgment_table_data)
-                party_map = insert_party_table(conn, cursor, party_table_data)
-                new_counsel_map = insert_counsel_table(conn, cursor, counsel_table_data)
-                counsel_map.update(new_counsel_map)
-            for party in case['parties']:
-                party_name = party.get('party_name', '')
-                party_role = party.get('party_role', '')
-                if len(party_name) <= 100 and len(party_name) != 0 and \
-                    len(party_role) <= 100 and len(party_role) != 0:
-                    party_id = party_map[party['party_name'].lower()]
-                    for counsel in party['counsels']:
-                        counsel_name = counsel.get('counsel_name', '')
-                        if len(counsel_name) <= 100 and len(counsel_name) != 0:
-                            counsel_id = counsel_map[counsel['counsel_name'].lower()]
-                            counsel_assignment_table_data.append((party_id, counsel_id))
-            with conn.cursor() as cursor:
-                insert_counsel_assignment_table(conn, cursor, counsel_assignment_table_data)
+                cursor.execute(f"refresh materialized view concurrently {view}")
+            conn.commit()
+        except psycopg2.Error as e:
+            conn.rollback()
+            logging.error("Error refreshing %s: %s", view, str(e))
+            continue
+        logging.info("Refreshed %s in %.2fs", view, perf_counter() - start)
+
+
+JUDGMENT_OF_THE_DAY_QUERY = """
+    INSERT INTO judgment_of_the_day (featured_date, neutral_citation)
+    SELECT %(day)s, j.neutral_citation
+    FROM judgment j
+    JOIN court c ON j.court_id = c.court_id
+    WHERE length(j.judgment_summary) >= %(min_summary_length)s
+      AND (%(court_name)s::text IS NULL OR c.court_name = %(court_name)s)
+    ORDER BY md5(j.neutral_citation || %(day)s::text)
+    LIMIT 1
+    ON CONFLICT (featured_date) DO NOTHING"""
+
+
+def select_judgment_of_the_day(conn: connection, day: date, min_summary_length: int = 0,
+                               court_name: str = None) -> None:
+    """Stores the judgment featured on the dashboard for a day, chosen by hashing each
+    citation with the date so every run on that day agrees, from judgments with at least
+    min_summary_length characters of summary and from one court when court_name is given.
+    A day keeps the judgment first chosen for it."""
+    with conn.cursor() as cursor:
+        cursor.execute(JUDGMENT_OF_THE_DAY_QUERY,
+                       {"day": day, "min_summary_length": min_summary_length,
+                        "court_name": court_name.lower() if court_name else None})
+    conn.commit()
+
+
+HOME_SNAPSHOT_QUERY = """
+    INSERT INTO home_snapshot (home_snapshot_id, snapshot, built_at)
+    SELECT 1, jsonb_build_object(
+        'most_recent_judgment', (
+            SELECT to_jsonb(r) FROM (
+                SELECT neutral_citation, court_id, judgment_date, judgment_summary
+                FROM judgment ORDER BY judgment_date DESC LIMIT 1) r),
+        'judgment_of_the_day', (
+            SELECT to_jsonb(r) FROM (
+                SELECT j.neutral_citation, j.judgment_summary, j.judgment_date
+                FROM judgment_of_the_day f
+                JOIN judgment j ON f.neutral_citation = j.neutral_citation
+                ORDER BY f.featured_date DESC LIMIT 1) r),
+        'cases_over_time', (
+            SELECT COALESCE(jsonb_agg(to_jsonb(r) ORDER BY r.judgment_date), '[]') FROM (
+                SELECT judgment_date, judgment_type, judgment_count
+                FROM judgments_by_date_and_type) r),
+        'cases_by_type', (
+            SELECT COALESCE(jsonb_agg(to_jsonb(r)), '[]') FROM (
+                SELECT judgment_type AS "Judgment Type", case_count AS "Case Count"
+                FROM judgments_by_type) r),
+        'cases_by_court', (
+            SELECT COALESCE(jsonb_agg(to_jsonb(r) ORDER BY r."Case Count" DESC), '[]') FROM (
+                SELECT court_name AS "Court", case_count AS "Case Count"
+                FROM judgments_by_court ORDER BY case_count DESC LIMIT 10) r),
+        'recent_judgments', (
+            SELECT COALESCE(jsonb_agg(to_jsonb(r)), '[]') FROM (
+                SELECT j.neutral_citation AS judgment, c.court_name AS court
+                FROM judgment j
+                JOIN court c ON j.court_id = c.court_id
+                WHERE j.judgment_date = (SELECT MAX(judgment_date) FROM judgment)) r)
+    ), NOW()
+    ON CONFLICT (home_snapshot_id) DO UPDATE
+    SET snapshot = EXCLUDED.snapshot, built_at = EXCLUDED.built_at"""
+
+
+def refresh_home_snapshot(conn: connection) -> None:
+    """Rebuilds the document the dashboard home page renders from, so the page needs
+    one query instead of one per section. Run after the dashboard views are refreshed."""
+    with conn.cursor() as cursor:
+        cursor.execute(HOME_SNAPSHOT_QUERY)
+    conn.commit()
+    logging.info("Refreshed the home page snapshot.")
+
+
+BUMP_DATA_VERSION_QUERY = """UPDATE data_version SET version = version + 1, updated_at = NOW()
+    RETURNING version"""
+
+
+def bump_data_version(conn: connection) -> int:
+    """Marks the loaded data as changed so the dashboard drops its cached query results.
+    Returns the new data version."""
+    with conn.cursor() as cursor:
+        cursor.execute(BUMP_DATA_VERSION_QUERY)
+        version = cursor.fetchone()["version"]
+    conn.commit()
+    logging.info("Data version is now %s", version)
+    return version
 
 
 async def create_client(aws_access_key_id: str, aws_secret_access_key: str) -> BaseClient:
@@ -259,40 +470,197 @@ async def create_client(aws_access_key_id: str, aws_secret_access_key: str) -> B
         raise
 
 
-async def upload_file_to_s3(s3_client: BaseClient, local_file_path: str,
-                            bucket_name: str, s3_key: str) -> None:
-    """Uploads a locally saved file to an S3 bucket."""
+def create_upload_semaphore(s3_client: BaseClient) -> asyncio.Semaphore:
+    """Returns a semaphore limiting concurrent uploads to the client's connection pool size."""
+    return asyncio.Semaphore(s3_client.meta.config.max_pool_connections)
+
+
+def prepare_upload_body(file_content: bytes, s3_key: str) -> tuple[bytes, dict]:
+    """Gzip-compresses html files so they are stored compressed in S3.
+    Returns the body to upload and any extra put_object arguments."""
+    if s3_key.endswith(".html"):
+        return (gzip.compress(file_content, mtime=0),
+                {"ContentEncoding": "gzip", "ContentType": "text/html; charset=utf-8"})
+    return file_content, {}
+
+
+def is_unchanged_in_s3(s3_client: BaseClient, bucket_name: str, s3_key: str,
+                       md5: str, manifest: dict = None) -> bool:
+    """Checks whether an object with the same MD5 is already stored in S3, using the
+    upload manifest when it has the key and a HEAD request for its ETag otherwise.
+    Returns a boolean."""
+    if manifest is not None and manifest.get(s3_key) == md5:
+        return True
     try:
-        if not os.path.exists(local_file_path):
-            raise FileNotFoundError(f"File not found: {local_file_path}")
-        with open(local_file_path, 'rb') as file:
+        response = s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+    except ClientError:
+        return False
+    return response.get("ETag", "").strip('"') == md5
+
+
+async def upload_bytes_to_s3(s3_client: BaseClient, content: bytes,
+                             bucket_name: str, s3_key: str,
+                             semaphore: asyncio.Semaphore = None, manifest: dict = None) -> bool:
+    """Uploads content held in memory to an S3 bucket, skipping it if S3 already
+    holds identical content. Html is stored gzip-compressed.
+    Returns whether the content was uploaded."""
+    body, extra_args = prepare_upload_body(content, s3_key)
+    md5 = hashlib.md5(body).hexdigest()
+    try:
+        async with semaphore or create_upload_semaphore(s3_client):
+            if await asyncio.to_thread(is_unchanged_in_s3, s3_client, bucket_name,
+                                       s3_key, md5, manifest):
+                logging.info("Skipping unchanged file %s", s3_key)
+                if manifest is not None:
+                    manifest[s3_key] = md5
+                return False
             await asyncio.to_thread(
                 s3_client.put_object,
                 Bucket=bucket_name,
                 Key=s3_key,
-                Body=file
+                Body=body,
+                **extra_args
             )
-    except FileNotFoundError as e:
-        logging.error("Error: %s", str(e))
-    except BotoCoreError as e:
-        logging.error("AWS S3 error while uploading file '%s' to '%s/%s': %s",
-                      local_file_path, bucket_name, s3_key, str(e))
-
-
-async def upload_multiple_files_to_s3(s3_client: BaseClient, folder_path: str,
-                                      bucket_name: str) -> None:
-    """Uploads multiple files to S3 concurrently.
-
-    Args:
-        s3_client (BaseClient): The S3 client.
-        folder_path: str. The folder in which the judgment files are currently saved.
-        bucket_name (str): The S3 bucket name.
-    """
-    files = os.listdir(folder_path)
-    file_paths = [os.path.join(folder_path, file) for file in files]
-    upload_tasks = [
-        upload_file_to_s3(s3_client, file_path, bucket_name, file)
-        for (file, file_path) in zip(files, file_paths)
-    ]
-    await asyncio.gather(*upload_tasks)
-    logging.info("Files uploaded successfully")
+    except (BotoCoreError, ClientError) as e:
+        logging.error("AWS S3 error while uploading '%s/%s': %s",
+                      bucket_name, s3_key, str(e))
+        return False
+    if manifest is not None:
+        manifest[s3_key] = md5
+    return True
+
+
+ARCHIVE_PREFIX = "raw-xml"
+
+
+def get_archive_partition(judgment_date: str) -> str:
+    """Returns the S3 prefix holding a judgment date's archived xml and manifest."""
+    return f"{ARCHIVE_PREFIX}/date={judgment_date or 'unknown'}"
+
+
+def get_archive_key(judgment_data: dict, xml_file_name: str) -> str:
+    """Returns the date and court partitioned S3 key for a judgment's archived xml."""
+    court = re.sub(r"[^a-z0-9]+", "-", (judgment_data.get("court_name") or "").lower())
+    return (f"{get_archive_partition(judgment_data.get('judgment_date'))}"
+            f"/court={court.strip('-') or 'unknown'}/{xml_file_name}.gz")
+
+
+async def archive_xml_to_s3(s3_client: BaseClient, xml_content: bytes, bucket_name: str,
+                            judgment_data: dict, xml_file_name: str,
+                            semaphore: asyncio.Semaphore = None) -> dict | None:
+    """Stores a judgment's raw xml gzip-compressed in S3 so it can be reprocessed
+    without downloading it again.
+    Returns the judgment's archive manifest entry, or None if the upload failed."""
+    body = gzip.compress(xml_content, mtime=0)
+    s3_key = get_archive_key(judgment_data, xml_file_name)
+    stored = {}
+    await upload_bytes_to_s3(s3_client, body, bucket_name, s3_key, semaphore, stored)
+    if s3_key not in stored:
+        return None
+    return {"neutral_citation": judgment_data.get("neutral_citation"),
+            "judgment_date": judgment_data.get("judgment_date"),
+            "court_name": judgment_data.get("court_name"),
+            "title": xml_file_name,
+            "key": s3_key,
+            "size": len(body)}
+
+
+def save_archive_manifests(s3_client: BaseClient, bucket_name: str,
+                           manifest_entries: list[dict]) -> None:
+    """Merges archive manifest entries into the manifest of each judgment date.
+    Returns None."""
+    entries_by_date = {}
+    for entry in manifest_entries:
+        entries_by_date.setdefault(entry["judgment_date"], []).append(entry)
+    for judgment_date, entries in entries_by_date.items():
+        manifest_key = f"{get_archive_partition(judgment_date)}/manifest.json"
+        try:
+            response = s3_client.get_object(Bucket=bucket_name, Key=manifest_key)
+            manifest = {entry["key"]: entry for entry in json.loads(response["Body"].read())}
+        except (ClientError, ValueError):
+            manifest = {}
+        manifest.update({entry["key"]: entry for entry in entries})
+        try:
+            s3_client.put_object(Bucket=bucket_name, Key=manifest_key,
+                                 Body=json.dumps(sorted(manifest.values(),
+                                                        key=lambda e: e["key"])).encode("utf-8"),
+                                 ContentType="application/json")
+        except (BotoCoreError, ClientError) as e:
+            logging.error("AWS S3 error while saving archive manifest '%s': %s",
+                          manifest_key, str(e))
+
+
+def split_s3_path(path: str) -> tuple[str, str]:
+    """Returns the bucket and key of an s3://bucket/key path."""
+    bucket_name, _, s3_key = path.removeprefix("s3://").partition("/")
+    return bucket_name, s3_key
+
+
+def save_extraction_outputs(judgment_data: list[dict], destination: str,
+                            s3_client: BaseClient = None, run_id: str = None) -> list[str]:
+    """Writes each judgment's extraction output, including its model and prompt version,
+    as a JSONL part file under the partition of its judgment date. The destination is
+    a local folder or an s3://bucket/prefix path.
+    Returns the paths written."""
+    run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    records_by_date = {}
+    for record in judgment_data:
+        records_by_date.setdefault(record.get("judgment_date") or "unknown", []).append(record)
+    paths = []
+    for judgment_date, records in records_by_date.items():
+        path = f"{destination.rstrip('/')}/date={judgment_date}/part-{run_id}.jsonl"
+        body = "".join(json.dumps(record, sort_keys=True, default=str) + "\n"
+                       for record in records).encode("utf-8")
+        try:
+            if path.startswith("s3://"):
+                bucket_name, s3_key = split_s3_path(path)
+                s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=body,
+                                     ContentType="application/x-ndjson")
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(body)
+        except (BotoCoreError, ClientError, OSError) as e:
+            logging.error("Error saving extraction outputs to %s: %s", path, str(e))
+            continue
+        paths.append(path)
+    return paths
+
+
+def list_extraction_partitions(source: str, s3_client: BaseClient = None) -> dict[str, list[str]]:
+    """Finds every JSONL part file in a local or s3:// extraction archive.
+    Returns a dictionary of judgment dates to their part file paths, oldest run first."""
+    if source.startswith("s3://"):
+        bucket_name, prefix = split_s3_path(source.rstrip("/") + "/")
+        paginator = s3_client.get_paginator("list_objects_v2")
+        paths = [f"s3://{bucket_name}/{obj['Key']}"
+                 for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+                 for obj in page.get("Contents", [])]
+    else:
+        paths = [os.path.join(folder, file_name)
+                 for folder, _, file_names in os.walk(source) for file_name in file_names]
+    partitions = {}
+    for path in sorted(paths):
+        match = re.search(r"date=([^/]+)/part-[^/]+\.jsonl$", path)
+        if match:
+            partitions.setdefault(match.group(1), []).append(path)
+    return partitions
+
+
+def read_extraction_partition(paths: list[str], s3_client: BaseClient = None) -> list[dict]:
+    """Reads the part files of one judgment date, keeping only the latest
+    extraction output of each judgment.
+    Returns a list of judgment dictionaries."""
+    records = {}
+    for path in paths:
+        if path.startswith("s3://"):
+            bucket_name, s3_key = split_s3_path(path)
+            body = s3_client.get_object(Bucket=bucket_name, Key=s3_key)["Body"].read()
+        else:
+            with open(path, "rb") as f:
+                body = f.read()
+        for line in body.decode("utf-8").splitlines():
+            if line.strip():
+                record = json.loads(line)
+                records[record.get("neutral_citation")] = record
+    return list(records.values())
@@ -5,6 +5,11 @@ import os
 from bs4 import BeautifulSoup
 
 
+def parse_judgment_xml(xml_content: bytes) -> BeautifulSoup:
+    """Parses judgment xml held in memory, returns the parsed document."""
+    return BeautifulSoup(xml_content, 'xml')
+
+
 def get_metadata(xml_filename: str) -> dict:
     """Returns the meta data that can be easily extracted from the xml"""
 
@@ -13,6 +18,11 @@ def get_metadata(xml_filename: str) -> dict:
             soup = BeautifulSoup(file, 'xml')
     except FileNotFoundError:
         logging.error('File was not found - %s', xml_filename)
+    return extract_metadata(soup)
+
+
+def extract_metadata(soup: BeautifulSoup) -> dict:
+    """Returns the meta data that can be easily extracted from a parsed xml"""
     metadata = {
         'court_name': '',
         'neutral_citation': '',
@@ -32,6 +42,11 @@ def get_metadata(xml_filename: str) -> dict:
     return metadata
 
 
+def get_html_file_name(xml_file_name: str) -> str:
+    """Returns the html file name for a judgment xml file name."""
+    return xml_file_name.replace('xml', 'html')
+
+
 def convert_judgment(html_folder_path: str, xml_file_path: str, xml_file_name: str) -> None:
     """Converts the judgment xml to html and then saved, returns None."""
     os.makedirs(html_folder_path, exist_ok=True)
@@ -41,11 +56,18 @@ def convert_judgment(html_folder_path: str, xml_file_path: str, xml_file_name: s
     except FileNotFoundError:
         logging.error('File was not found - %s', xml_file_path)
 
-    judgment_html = soup.find('judgmentBody')
+    judgment_html = extract_judgment_html(soup)
     if judgment_html:
         html_file_path = os.path.join(html_folder_path,
-                                      xml_file_name.replace('xml', 'html'))
+                                      get_html_file_name(xml_file_name))
         with open(html_file_path, 'w', encoding='UTF-8') as file:
-            file.write(str(judgment_html))
-    else:
-        logging.error("No judgmentBody found in the XML.")
+            file.write(judgment_html)
+
+
+def extract_judgment_html(soup: BeautifulSoup) -> str:
+    """Returns the judgment body of a parsed xml as html, or None if it has no body."""
+    judgment_html = soup.find('judgmentBody')
+    if judgment_html:
+        return str(judgment_html)
+    logging.error("No judgmentBody found in the XML.")
+    return None
@@ -2,19 +2,129 @@
 
 
 import os
+import math
 from os import environ as ENV
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
 import asyncio
 
 from dotenv import load_dotenv
+from openai import OpenAI
+from botocore.client import BaseClient
 
-from daily_extract import download_days_judgments
+from daily_extract import (download_days_judgments, fetch_days_judgments,
+                           stage_judgments_from_folder, fetch_archived_judgments)
+from daily_parse_xml import get_html_file_name
 from daily_prompt_engineering import get_client
-from daily_transform import process_all_judgments
-from daily_load import (get_db_connection, get_base_maps,
-                  seed_db_base_tables, seed_judgment_data,
-                  create_client, upload_multiple_files_to_s3)
+from daily_transform import process_staged_judgment
+from daily_export import export_judgment_snapshot
+from daily_load import (create_load_pool, load_judgments_async, log_load_stats,
+                  refresh_dashboard_views, refresh_home_snapshot, bump_data_version,
+                  select_judgment_of_the_day,
+                  create_client, create_upload_semaphore, upload_bytes_to_s3,
+                  archive_xml_to_s3, save_archive_manifests, save_extraction_outputs)
+
+
+async def gather_step(step: str, tasks: list[asyncio.Task]) -> list:
+    """Waits for every task of one pipeline step, logging each one that failed.
+    Returns the results of the tasks that succeeded."""
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error("Error %s: %s", step, str(result))
+    return [result for result in results if not isinstance(result, Exception)]
+
+
+async def process_load_and_upload(staged_judgments: list[dict],
+                                  api_client: OpenAI, load_pool: dict,
+                                  s3_client: BaseClient, bucket_name: str) -> list[dict]:
+    """Processes staged judgments one at a time, uploading each finished judgment's html
+    and archiving its raw xml while the next one is being extracted. Finished judgments
+    are loaded in one batch per pool connection, each batch in a single transaction,
+    as soon as the batch fills.
+    Returns the extraction output of every judgment."""
+    judgment_outputs = []
+    batch_size = math.ceil(len(staged_judgments) / load_pool["pool"].maxconn)
+    batch = []
+    load_tasks = []
+    upload_tasks = []
+    archive_tasks = []
+    upload_semaphore = create_upload_semaphore(s3_client)
+    logging.info("Processing judgments...")
+    for staged_judgment in staged_judgments:
+        try:
+            judgment_data, html = await asyncio.to_thread(
+                process_staged_judgment, staged_judgment, api_client)
+            staged_judgment["xml"].seek(0)
+            xml_content = staged_judgment["xml"].read()
+        finally:
+            staged_judgment["xml"].close()
+        judgment_outputs.append(judgment_data)
+        batch.append(judgment_data)
+        if len(batch) == batch_size:
+            load_tasks.append(asyncio.create_task(load_judgments_async(load_pool, batch)))
+            batch = []
+        if html:
+            upload_tasks.append(asyncio.create_task(upload_bytes_to_s3(
+                s3_client, html.encode('utf-8'), bucket_name,
+                get_html_file_name(staged_judgment["title"]), upload_semaphore)))
+        archive_tasks.append(asyncio.create_task(archive_xml_to_s3(
+            s3_client, xml_content, bucket_name, judgment_data,
+            staged_judgment["title"], upload_semaphore)))
+    if batch:
+        load_tasks.append(asyncio.create_task(load_judgments_async(load_pool, batch)))
+    await gather_step("loading judgments", load_tasks)
+    await gather_step("uploading judgment html", upload_tasks)
+    manifest_entries = [entry for entry in await gather_step("archiving judgment xml",
+                                                             archive_tasks) if entry]
+    await asyncio.to_thread(save_archive_manifests, s3_client, bucket_name, manifest_entries)
+    logging.info("Successfully processed judgments.")
+    return judgment_outputs
+
+
+async def stage_days_judgments(staging_mode: str, s3_client: BaseClient,
+                               bucket_name: str, day: datetime) -> list[dict]:
+    """Downloads the previous day's judgments, keeping them in memory unless
+    the staging mode is 'disk'. The 'archive' mode instead reads back the raw xml
+    archived for that judgment date, so a day can be rerun without the National Archives.
+    Returns a list of staged judgment dictionaries."""
+    if staging_mode == "archive":
+        return await fetch_archived_judgments(s3_client, bucket_name, day, day)
+    if staging_mode == "disk":
+        await download_days_judgments("judgments")
+        return stage_judgments_from_folder("judgments")
+    return await fetch_days_judgments()
+
+
+def refresh_views(load_pool: dict, data_loaded: bool = True) -> None:
+    """Refreshes the dashboard aggregates, today's featured judgment and the home page
+    snapshot on a pooled connection once loading is done, then bumps the data version
+    so the dashboard picks up the new data. The aggregates are left alone when no
+    judgments were loaded, but today's featured judgment is still chosen."""
+    conn = load_pool["pool"].getconn()
+    try:
+        if data_loaded:
+            refresh_dashboard_views(conn)
+        select_judgment_of_the_day(conn, date.today(),
+                                   int(ENV.get("FEATURED_MIN_SUMMARY_LENGTH", "0")),
+                                   ENV.get("FEATURED_COURT"))
+        refresh_home_snapshot(conn)
+        bump_data_version(conn)
+    finally:
+        load_pool["pool"].putconn(conn)
+
+
+def export_loaded_months(load_pool: dict, judgment_outputs: list[dict]) -> None:
+    """Rewrites the Parquet snapshot partitions of every judgment month just loaded."""
+    months = {judgment["judgment_date"][:7] for judgment in judgment_outputs
+              if judgment.get("judgment_date")}
+    conn = load_pool["pool"].getconn()
+    try:
+        export_judgment_snapshot(conn, ENV.get("PARQUET_EXPORT",
+                                               f"s3://{ENV['BUCKET_NAME']}/parquet/judgments"),
+                                 sorted(months), ENV["ACCESS_KEY"], ENV["SECRET_KEY"])
+    finally:
+        load_pool["pool"].putconn(conn)
 
 
 async def main() -> None:
@@ -23,34 +133,36 @@ async def main() -> None:
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     api_client = get_client(ENV["OPENAI_KEY"])
-    conn = get_db_connection(dbname=ENV['DB_NAME'], user=ENV['DB_USER'],
-                             password=ENV['DB_PASSWORD'], host=ENV['DB_HOST'],
-                             port=ENV['DB_PORT'])
+    load_pool = create_load_pool(int(ENV.get("DB_POOL_SIZE", "4")),
+                                 dbname=ENV['DB_NAME'], user=ENV['DB_USER'],
+                                 password=ENV['DB_PASSWORD'], host=ENV['DB_HOST'],
+                                 port=ENV['DB_PORT'])
     my_aws_access_key_id = ENV["ACCESS_KEY"]
     my_aws_secret_access_key = ENV["SECRET_KEY"]
     s_three = await create_client(my_aws_access_key_id, my_aws_secret_access_key)
     yesterday = datetime.today() - timedelta(days=1)
     logging.info("Judgments for Day %s", yesterday.strftime("%B %d %Y"))
     logging.info("------------------")
-    await download_days_judgments("judgments")
-    if os.listdir("judgments"):
-        judgment_data = process_all_judgments("judgments", "judgments_html", api_client)
-        mappings = get_base_maps(conn)
-        seed_db_base_tables(judgment_data, conn, mappings)
-        updated_mappings = get_base_maps(conn)
-        seed_judgment_data(conn, judgment_data, updated_mappings)
-        await upload_multiple_files_to_s3(s_three, "judgments_html", ENV["BUCKET_NAME"])
-        judgment_filepaths = [os.path.join("judgments", file) for
-                                file in os.listdir("judgments")]
-        judgment_html_filepaths = [os.path.join("judgments_html", file) for
-                                file in os.listdir("judgments_html")]
-        for judgment in judgment_filepaths:
-            os.remove(judgment)
-        for judgment_html in judgment_html_filepaths:
-            os.remove(judgment_html)
-
-
-    conn.close()
+    staging_mode = ENV.get("STAGING_MODE", "memory")
+    staged_judgments = await stage_days_judgments(staging_mode, s_three, ENV["BUCKET_NAME"],
+                                                  yesterday)
+    if staged_judgments:
+        judgment_outputs = await process_load_and_upload(staged_judgments, api_client,
+                                                         load_pool, s_three, ENV["BUCKET_NAME"])
+        log_load_stats(load_pool)
+        refresh_views(load_pool)
+        save_extraction_outputs(judgment_outputs,
+                                ENV.get("EXTRACTION_ARCHIVE",
+                                        f"s3://{ENV['BUCKET_NAME']}/extractions"),
+                                s_three)
+        export_loaded_months(load_pool, judgment_outputs)
+    else:
+        refresh_views(load_pool, data_loaded=False)
+    if staging_mode == "disk":
+        for judgment in os.listdir("judgments"):
+            os.remove(os.path.join("judgments", judgment))
+
+    load_pool["pool"].closeall()
 
 
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ from pydantic import BaseModel
 load_dotenv()
 
 GPT_MODEL = "gpt-4o-mini"
+# Bump whenever the prompt or the output schema changes.
+PROMPT_VERSION = "1"
 
 
 class Counsel(BaseModel):
@@ -52,6 +54,10 @@ def get_xml_data(filename: str) -> str:
     with open(filename, 'r', encoding='UTF-8') as file:
         return file.read()[:100000]
 
+def get_xml_text(xml_content: bytes) -> str:
+    """Decodes xml held in memory and returns a string with the xml data"""
+    return xml_content.decode('UTF-8', errors='replace')[:100000]
+
 def get_case_summary(model: str, client: OpenAI, case: str) -> dict:
     """Returns a dictionary for a judgment containing summary information"""
     prompt = f"""
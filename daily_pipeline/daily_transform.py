@@ -1,24 +1,19 @@
 """Transforming judgment xml to data ready to upload to database."""
-import os
-import logging
-
 from openai import OpenAI
 
-from daily_parse_xml import get_metadata, convert_judgment
-from daily_prompt_engineering import get_xml_data, get_case_summary
+from daily_parse_xml import parse_judgment_xml, extract_metadata, extract_judgment_html
+from daily_prompt_engineering import get_xml_text, get_case_summary, GPT_MODEL, PROMPT_VERSION
+
+EXTRACTION_VERSION = {"extraction_model": GPT_MODEL, "prompt_version": PROMPT_VERSION}
+
 
-def process_all_judgments(folder_path: str, html_folder_path: str, api_client: OpenAI) -> list[dict]:
-    """Process judgment data, extracting relevant information and returning a list of dicts."""
-    judgment_data = []
-    judgment_files = os.listdir(folder_path)
-    logging.info("Processing judgments...")
-    for judgment in judgment_files:
-        file_path = os.path.join(folder_path, judgment)
-        convert_judgment(html_folder_path, file_path, judgment)
-        judgment_xml = get_xml_data(file_path)
-        metadata = get_metadata(file_path)
-        api_data = get_case_summary("gpt-4o-mini", api_client, judgment_xml)
-        combined_judgment_data = metadata | api_data
-        judgment_data.append(combined_judgment_data)
-    logging.info("Successfully processed judgments.")
-    return judgment_data
+def process_staged_judgment(staged_judgment: dict, api_client: OpenAI) -> tuple[dict, str]:
+    """Extracts metadata, case summary and html from a judgment staged in a buffer,
+    parsing the xml only once and without touching the judgments folders.
+    Returns the combined judgment data and the judgment html."""
+    staged_judgment["xml"].seek(0)
+    xml_content = staged_judgment["xml"].read()
+    soup = parse_judgment_xml(xml_content)
+    metadata = extract_metadata(soup)
+    api_data = get_case_summary(GPT_MODEL, api_client, get_xml_text(xml_content))
+    return metadata | api_data | EXTRACTION_VERSION, extract_judgment_html(soup)
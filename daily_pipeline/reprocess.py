@@ -0,0 +1,138 @@
+"""Re-extracts judgments whose stored extraction came from an older prompt or model."""
+from os import environ as ENV
+import logging
+import asyncio
+
+from dotenv import load_dotenv
+from openai import OpenAI
+from botocore.client import BaseClient
+from psycopg2.extensions import connection
+
+from daily_extract import get_archive_manifest, download_archived_xml
+from daily_prompt_engineering import get_client, get_xml_text, GPT_MODEL, PROMPT_VERSION
+from daily_transform import process_staged_judgment
+from daily_load import (get_db_connection, create_load_pool, load_judgments_async,
+                        log_load_stats, create_client, save_extraction_outputs)
+from daily_pipeline import refresh_views
+
+
+# Rough size of the instructions wrapped around each transcript, in tokens.
+PROMPT_OVERHEAD_TOKENS = 500
+
+
+def select_stale_judgments(conn: connection, limit: int) -> list[dict]:
+    """Finds judgments extracted with a different model or prompt version than
+    the current ones, newest first.
+    Returns a list of dictionaries with each judgment's citation and date."""
+    query = """select neutral_citation, judgment_date from judgment
+    where extraction_model is distinct from %s or prompt_version is distinct from %s
+    order by judgment_date desc, neutral_citation
+    limit %s"""
+    with conn.cursor() as cursor:
+        cursor.execute(query, (GPT_MODEL, PROMPT_VERSION, limit))
+        return cursor.fetchall()
+
+
+def find_archive_entries(s3_client: BaseClient, bucket_name: str,
+                         stale_judgments: list[dict]) -> list[dict]:
+    """Looks up each stale judgment's archived xml in the manifest of its judgment date.
+    Returns the manifest entries found, in the order of the stale judgments."""
+    entries = {}
+    for judgment_date in {judgment["judgment_date"] for judgment in stale_judgments}:
+        for entry in get_archive_manifest(s3_client, bucket_name, judgment_date):
+            entries[entry["neutral_citation"]] = entry
+    found = [entries[judgment["neutral_citation"]] for judgment in stale_judgments
+             if judgment["neutral_citation"] in entries]
+    if len(found) < len(stale_judgments):
+        logging.warning("%s stale judgments have no archived xml and were skipped.",
+                        len(stale_judgments) - len(found))
+    return found
+
+
+def estimate_tokens(xml_content: bytes) -> int:
+    """Returns the approximate number of prompt tokens needed to re-extract a judgment."""
+    return len(get_xml_text(xml_content)) // 4 + PROMPT_OVERHEAD_TOKENS
+
+
+async def reprocess_judgments(entries: list[dict], s3_client: BaseClient, bucket_name: str,
+                              api_client: OpenAI, load_pool: dict, token_budget: int,
+                              concurrency: int) -> tuple[list[dict], dict]:
+    """Re-extracts archived judgments concurrently and upserts each one as soon as it
+    is ready. Judgments that would take the estimated token use over the budget are
+    skipped, so they are picked up by the next run.
+    Returns the new extraction outputs and the progress counts."""
+    progress = {"total": len(entries), "done": 0, "failed": 0, "skipped": 0, "tokens": 0}
+    judgment_outputs = []
+    semaphore = asyncio.Semaphore(concurrency)
+    range_semaphore = asyncio.Semaphore(s3_client.meta.config.max_pool_connections)
+
+    async def reprocess(entry: dict) -> None:
+        async with semaphore:
+            staged_judgment = await download_archived_xml(s3_client, bucket_name,
+                                                          entry, range_semaphore)
+            if staged_judgment is None:
+                progress["failed"] += 1
+                return
+            try:
+                tokens = estimate_tokens(staged_judgment["xml"].read())
+                if progress["tokens"] + tokens > token_budget:
+                    progress["skipped"] += 1
+                    return
+                progress["tokens"] += tokens
+                judgment_data, _ = await asyncio.to_thread(
+                    process_staged_judgment, staged_judgment, api_client)
+            finally:
+                staged_judgment["xml"].close()
+            await load_judgments_async(load_pool, [judgment_data])
+        judgment_outputs.append(judgment_data)
+        progress["done"] += 1
+        logging.info("Reprocessed %s (%s/%s done, %s failed, ~%s of %s tokens used)",
+                     entry["neutral_citation"], progress["done"], progress["total"],
+                     progress["failed"], progress["tokens"], token_budget)
+
+    results = await asyncio.gather(*[reprocess(entry) for entry in entries],
+                                   return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            progress["failed"] += 1
+            logging.error("Error reprocessing judgment: %s", str(result))
+    return judgment_outputs, progress
+
+
+async def main() -> None:
+    """Main reprocessing function."""
+    load_dotenv()
+    logger = logging.getLogger()
+    logger.setLevel(logging.INFO)
+    db_config = {"dbname": ENV['DB_NAME'], "user": ENV['DB_USER'],
+                 "password": ENV['DB_PASSWORD'], "host": ENV['DB_HOST'],
+                 "port": ENV['DB_PORT']}
+    conn = get_db_connection(**db_config)
+    stale_judgments = select_stale_judgments(conn, int(ENV.get("REPROCESS_LIMIT", "1000")))
+    conn.close()
+    logging.info("%s judgments are not on %s prompt version %s.",
+                 len(stale_judgments), GPT_MODEL, PROMPT_VERSION)
+    if not stale_judgments:
+        return
+
+    s_three = await create_client(ENV["ACCESS_KEY"], ENV["SECRET_KEY"])
+    entries = find_archive_entries(s_three, ENV["BUCKET_NAME"], stale_judgments)
+    load_pool = create_load_pool(int(ENV.get("DB_POOL_SIZE", "2")), **db_config)
+    judgment_outputs, progress = await reprocess_judgments(
+        entries, s_three, ENV["BUCKET_NAME"], get_client(ENV["OPENAI_KEY"]), load_pool,
+        int(ENV.get("REPROCESS_TOKEN_BUDGET", "2000000")),
+        int(ENV.get("REPROCESS_CONCURRENCY", "4")))
+    log_load_stats(load_pool)
+    if judgment_outputs:
+        refresh_views(load_pool)
+    load_pool["pool"].closeall()
+    save_extraction_outputs(judgment_outputs,
+                            ENV.get("EXTRACTION_ARCHIVE",
+                                    f"s3://{ENV['BUCKET_NAME']}/extractions"),
+                            s_three)
+    logging.info("Reprocessing finished: %s done, %s failed, %s skipped over budget.",
+                 progress["done"], progress["failed"], progress["skipped"])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,11 @@
+import asyncio
 from aioresponses import aioresponses
 import aiofiles
+import gzip
+import json
 import pytest
+import boto3
+from moto import mock_aws
 from unittest.mock import AsyncMock, call
 from datetime import datetime, timedelta
 from daily_extract import (
@@ -8,6 +13,10 @@ from daily_extract import (
     create_daily_atom_feed_url,
     download_url,
     download_days_judgments,
+    fetch_days_judgments,
+    stage_judgments_from_folder,
+    download_archived_xml,
+    fetch_archived_judgments,
 )
 BASE_URL = "https://caselaw.nationalarchives.gov.uk/atom.xml?per_page=9999"
 
@@ -107,3 +116,71 @@ async def test_download_days_judgments(mocker):
         any_order=False
     )
 
+
+@pytest.mark.asyncio
+async def test_fetch_days_judgments_drops_failed_downloads(mocker):
+    """Test that judgments are staged in memory and failed downloads are skipped."""
+    mocker.patch(
+        "daily_extract.get_judgments_from_atom_feed",
+        new_callable=AsyncMock,
+        return_value=[
+            {"title": "judgment1.xml", "link": "https://mock-link.com/judgment1/data.xml"},
+            {"title": "judgment2.xml", "link": "https://mock-link.com/judgment2/data.xml"},
+        ],
+    )
+    staged = {"title": "judgment1.xml", "xml": b"<judgment/>"}
+    mocker.patch("daily_extract.download_url_to_buffer", new_callable=AsyncMock,
+                 side_effect=[staged, None])
+
+    assert await fetch_days_judgments() == [staged]
+
+
+def test_stage_judgments_from_folder(tmp_path):
+    """Test that downloaded judgments are opened in name order."""
+    (tmp_path / "b.xml").write_bytes(b"<b/>")
+    (tmp_path / "a.xml").write_bytes(b"<a/>")
+
+    staged = stage_judgments_from_folder(str(tmp_path))
+
+    assert [judgment["title"] for judgment in staged] == ["a.xml", "b.xml"]
+    assert staged[0]["xml"].read() == b"<a/>"
+    for judgment in staged:
+        judgment["xml"].close()
+
+
+@pytest.fixture
+def archive_s3():
+    """S3 client backed by moto holding one archived judgment."""
+    with mock_aws():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="test-bucket")
+        body = gzip.compress(b"<judgment>" + b"text " * 100 + b"</judgment>")
+        key = "raw-xml/date=2025-02-15/court=high-court/judgment.xml.gz"
+        s3_client.put_object(Bucket="test-bucket", Key=key, Body=body)
+        s3_client.put_object(Bucket="test-bucket",
+                             Key="raw-xml/date=2025-02-15/manifest.json",
+                             Body=json.dumps([{"title": "judgment.xml", "key": key,
+                                               "size": len(body)}]))
+        yield s3_client
+
+
+@pytest.mark.asyncio
+async def test_download_archived_xml_joins_ranges(archive_s3):
+    """Test that an archived judgment read in several ranges is reassembled."""
+    entry = json.loads(archive_s3.get_object(
+        Bucket="test-bucket", Key="raw-xml/date=2025-02-15/manifest.json")["Body"].read())[0]
+
+    staged = await download_archived_xml(archive_s3, "test-bucket", entry,
+                                         asyncio.Semaphore(2), range_size=7)
+
+    assert staged["title"] == "judgment.xml"
+    assert staged["xml"].read() == b"<judgment>" + b"text " * 100 + b"</judgment>"
+
+
+@pytest.mark.asyncio
+async def test_fetch_archived_judgments_skips_days_without_manifest(archive_s3):
+    """Test that a date range is read from the archive, ignoring empty days."""
+    staged = await fetch_archived_judgments(archive_s3, "test-bucket",
+                                            datetime(2025, 2, 14), datetime(2025, 2, 16))
+
+    assert [judgment["title"] for judgment in staged] == ["judgment.xml"]
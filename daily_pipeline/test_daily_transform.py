@@ -0,0 +1,31 @@
+from io import BytesIO
+from unittest.mock import patch, Mock
+from daily_transform import process_staged_judgment
+
+
+XML = b"""<akomaNtoso><judgment>
+    <neutralCitation>[2025] EWCA Civ 123</neutralCitation>
+    <FRBRdate date="2025-02-15"/>
+    <TLCOrganization showAs="Court of Appeal"/>
+    <judgmentBody><p>Reasons</p></judgmentBody>
+</judgment></akomaNtoso>"""
+
+
+@patch("daily_transform.get_case_summary")
+def test_process_staged_judgment(mock_get_case_summary):
+    """Test that a buffered judgment yields combined data and html without any files."""
+    mock_get_case_summary.return_value = {"judge": "Lord Justice Smith"}
+    buffer = BytesIO(XML)
+    buffer.read()
+
+    judgment_data, html = process_staged_judgment({"title": "judgment.xml", "xml": buffer},
+                                                  Mock())
+
+    assert judgment_data == {"neutral_citation": "[2025] EWCA Civ 123",
+                             "judgment_date": "2025-02-15",
+                             "court_name": "Court of Appeal",
+                             "judge": "Lord Justice Smith",
+                             "extraction_model": "gpt-4o-mini",
+                             "prompt_version": "1"}
+    assert "Reasons" in html
+    assert "Reasons" in mock_get_case_summary.call_args[0][2]
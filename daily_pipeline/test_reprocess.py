@@ -0,0 +1,108 @@
+from io import BytesIO
+from datetime import date
+from unittest.mock import MagicMock, AsyncMock, patch
+import pytest
+from reprocess import (select_stale_judgments, find_archive_entries,
+                       estimate_tokens, reprocess_judgments, main)
+
+
+def test_select_stale_judgments_compares_current_versions():
+    """Test that judgments are selected by the current model and prompt version."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = [{"neutral_citation": "[2025] EWCA Civ 1"}]
+
+    assert select_stale_judgments(mock_conn, 10) == [{"neutral_citation": "[2025] EWCA Civ 1"}]
+    assert mock_cursor.execute.call_args[0][1] == ("gpt-4o-mini", "1", 10)
+
+
+@patch("reprocess.get_archive_manifest")
+def test_find_archive_entries_skips_unarchived(mock_get_manifest):
+    """Test that only judgments found in their date's manifest are returned, in order."""
+    mock_get_manifest.return_value = [{"neutral_citation": "a", "key": "ka"},
+                                      {"neutral_citation": "b", "key": "kb"}]
+    stale = [{"neutral_citation": "b", "judgment_date": date(2025, 2, 15)},
+             {"neutral_citation": "c", "judgment_date": date(2025, 2, 15)},
+             {"neutral_citation": "a", "judgment_date": date(2025, 2, 15)}]
+
+    entries = find_archive_entries(MagicMock(), "bucket", stale)
+
+    assert [entry["key"] for entry in entries] == ["kb", "ka"]
+    mock_get_manifest.assert_called_once()
+
+
+def test_estimate_tokens():
+    """Test that the token estimate covers the transcript and the prompt."""
+    assert estimate_tokens(b"x" * 4000) == 1500
+
+
+@pytest.mark.asyncio
+@patch("reprocess.load_judgments_async", new_callable=AsyncMock)
+@patch("reprocess.process_staged_judgment")
+@patch("reprocess.download_archived_xml", new_callable=AsyncMock)
+async def test_reprocess_judgments_respects_token_budget(mock_download, mock_process,
+                                                         mock_load):
+    """Test that judgments over the token budget are skipped and the rest upserted."""
+    mock_download.side_effect = lambda s3, bucket, entry, sem: {
+        "title": entry["title"], "xml": BytesIO(b"x" * 4000)}
+    mock_process.side_effect = lambda staged, client: (
+        {"neutral_citation": staged["title"]}, "<html/>")
+    s3_client = MagicMock()
+    s3_client.meta.config.max_pool_connections = 10
+    entries = [{"neutral_citation": name, "title": name} for name in ["a", "b", "c"]]
+
+    outputs, progress = await reprocess_judgments(entries, s3_client, "bucket", MagicMock(),
+                                                  MagicMock(), token_budget=3000,
+                                                  concurrency=1)
+
+    assert outputs == [{"neutral_citation": "a"}, {"neutral_citation": "b"}]
+    assert progress == {"total": 3, "done": 2, "failed": 0, "skipped": 1, "tokens": 3000}
+    assert mock_load.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch("reprocess.load_judgments_async", new_callable=AsyncMock)
+@patch("reprocess.process_staged_judgment", side_effect=TypeError("bad summary"))
+@patch("reprocess.download_archived_xml", new_callable=AsyncMock)
+async def test_reprocess_judgments_counts_failures(mock_download, mock_process, mock_load):
+    """Test that failed downloads and extractions are counted without stopping the run."""
+    mock_download.side_effect = [None, {"title": "b", "xml": BytesIO(b"<judgment/>")}]
+    s3_client = MagicMock()
+    s3_client.meta.config.max_pool_connections = 10
+    entries = [{"neutral_citation": name, "title": name} for name in ["a", "b"]]
+
+    outputs, progress = await reprocess_judgments(entries, s3_client, "bucket", MagicMock(),
+                                                  MagicMock(), token_budget=10000,
+                                                  concurrency=2)
+
+    assert outputs == []
+    assert progress["failed"] == 2
+    mock_load.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch.dict("os.environ", {"DB_NAME": "db", "DB_USER": "user", "DB_PASSWORD": "pw",
+                           "DB_HOST": "host", "DB_PORT": "5432", "ACCESS_KEY": "key",
+                           "SECRET_KEY": "secret", "BUCKET_NAME": "bucket",
+                           "OPENAI_KEY": "openai"})
+@patch("reprocess.save_extraction_outputs")
+@patch("reprocess.refresh_views")
+@patch("reprocess.reprocess_judgments", new_callable=AsyncMock)
+@patch("reprocess.create_load_pool")
+@patch("reprocess.find_archive_entries")
+@patch("reprocess.create_client", new_callable=AsyncMock)
+@patch("reprocess.get_client")
+@patch("reprocess.select_stale_judgments")
+@patch("reprocess.get_db_connection")
+async def test_main_refreshes_views_after_reprocessing(mock_conn, mock_select, mock_client,
+                                                       mock_s3, mock_entries, mock_pool,
+                                                       mock_reprocess, mock_refresh,
+                                                       mock_save):
+    """Test that reprocessed summaries are published to the dashboard views and cache."""
+    mock_select.return_value = [{"neutral_citation": "a", "judgment_date": date(2024, 1, 1)}]
+    mock_reprocess.return_value = ([{"neutral_citation": "a"}],
+                                   {"done": 1, "failed": 0, "skipped": 0})
+
+    await main()
+
+    mock_refresh.assert_called_once_with(mock_pool.return_value)
@@ -0,0 +1,163 @@
+"""Checks that every dashboard query is planned with indexes rather than sequential
+scans of the fact tables."""
+from os import environ as ENV
+import os
+import re
+import ast
+import sys
+import json
+import logging
+from datetime import date
+
+from dotenv import load_dotenv
+from psycopg2.extensions import connection
+
+from migrate import get_db_connection
+
+
+DASHBOARD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "streamlit")
+DASHBOARD_FILES = ["data_source.py", "dashboard_functions.py", "extra_functions.py"]
+sys.path.insert(0, DASHBOARD_FOLDER)
+# pylint: disable=wrong-import-position,wrong-import-order,import-error
+from judgment_queries import build_judgments_query, build_count_query
+
+# Dimension tables are small enough that scanning them is always fine.
+FACT_TABLES = {"judgment", "party", "counsel_assignment", "counsel"}
+QUERY_PATTERN = re.compile(r"select\b.*\bfrom\b", re.IGNORECASE | re.DOTALL)
+SEARCH_FILTERS = {"search_query": "negligence", "court": "Supreme Court", "case_type": "Civil",
+                  "start_date": date(2024, 1, 1), "end_date": date(2024, 12, 31)}
+PAGE_SIZE = 25
+
+
+def build_search_queries() -> list[tuple[str, str, list]]:
+    """Builds the judgment search statements the dashboard runs, with the same builders:
+    browsing and searching with every filter applied, on the first and a later page.
+    Returns a list of (builder, query, parameters) tuples."""
+    queries = []
+    for filters, after in [({}, None), ({}, (date(2024, 6, 1), "[2024] UKSC 1")),
+                           (SEARCH_FILTERS, None), (SEARCH_FILTERS, (0.5, "[2024] UKSC 1"))]:
+        query, params, _ = build_judgments_query(PAGE_SIZE, **filters, after=after)
+        queries.append(("judgment_queries.py:build_judgments_query", query, params))
+    for filters in [{}, SEARCH_FILTERS]:
+        queries.append(("judgment_queries.py:build_count_query", *build_count_query(**filters)))
+    return queries
+
+
+def get_template(node: ast.JoinedStr) -> str:
+    """Returns an f-string's source text, with each variable written as {name}."""
+    return "".join(value.value if isinstance(value, ast.Constant)
+                   else f"{{{ast.unparse(value.value)}}}" for value in node.values)
+
+
+def find_dashboard_queries(file_paths: list[str]) -> list[tuple[str, str | None]]:
+    """Collects the SELECT statements written inside each dashboard function.
+    Returns a list of (file:function, query) tuples, where the query is None if it is
+    an f-string, which only the judgment_queries builders may assemble."""
+    queries = []
+    for file_path in file_paths:
+        with open(file_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for function in ast.walk(tree):
+            if not isinstance(function, ast.FunctionDef):
+                continue
+            label = f"{os.path.basename(file_path)}:{function.name}"
+            f_string_parts = {id(value) for node in ast.walk(function)
+                              if isinstance(node, ast.JoinedStr) for value in node.values}
+            for node in ast.walk(function):
+                if isinstance(node, ast.JoinedStr):
+                    if QUERY_PATTERN.match(get_template(node).strip()):
+                        queries.append((label, None))
+                elif (isinstance(node, ast.Constant) and isinstance(node.value, str)
+                        and id(node) not in f_string_parts
+                        and QUERY_PATTERN.match(node.value.strip())):
+                    queries.append((label, node.value.strip().rstrip(";")))
+    return queries
+
+
+def to_prepared_statement(query: str) -> tuple[str, int]:
+    """Replaces psycopg2 placeholders with numbered parameters and unescapes literal %.
+    Returns the statement and its number of parameters."""
+    count = 0
+
+    def number(_: re.Match) -> str:
+        nonlocal count
+        count += 1
+        return f"${count}"
+    return re.sub(r"%(\(\w+\))?s", number, query).replace("%%", "%"), count
+
+
+def get_plan_nodes(plan: dict) -> list[dict]:
+    """Returns every node of an EXPLAIN (FORMAT JSON) plan tree."""
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(get_plan_nodes(child))
+    return nodes
+
+
+def explain_query(conn: connection, query: str, params: list | None = None,
+                  prefer_indexes: bool = False) -> dict:
+    """Plans a query with the planner's default settings, so the plan reflects the
+    database's current statistics. Queries given parameters are planned for those
+    values; the others are planned generically. With prefer_indexes, sequential scans
+    are discouraged, which only shows that the indexes can be used, not that they will be.
+    Returns the indexes used and the fact tables still scanned sequentially."""
+    with conn.cursor() as cursor:
+        if prefer_indexes:
+            cursor.execute("set local enable_seqscan = off")
+        if params is None:
+            statement, parameters = to_prepared_statement(query)
+            cursor.execute("set local plan_cache_mode = force_generic_plan")
+            cursor.execute(f"prepare dashboard_query as {statement}")
+            arguments = f"({', '.join(['null'] * parameters)})" if parameters else ""
+            cursor.execute(f"explain (format json) execute dashboard_query{arguments}")
+        else:
+            cursor.execute(f"explain (format json) {query}", tuple(params))
+        plan = cursor.fetchone()[0]
+    conn.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes = get_plan_nodes(plan[0]["Plan"])
+    return {
+        "indexes": sorted({node["Index Name"] for node in nodes if "Index Name" in node}),
+        "sequential_scans": sorted({node["Relation Name"] for node in nodes
+                                    if node["Node Type"] == "Seq Scan"
+                                    and node["Relation Name"] in FACT_TABLES})
+        }
+
+
+def main() -> None:
+    """Analyzes the fact tables, then explains every dashboard query and exits non-zero
+    if any still scans a fact table. Pass --prefer-indexes to discourage sequential scans
+    on a database too small for the planner to choose indexes by itself."""
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    prefer_indexes = "--prefer-indexes" in sys.argv[1:]
+    conn = get_db_connection(dbname=ENV['DB_NAME'], user=ENV['DB_USER'],
+                             password=ENV['DB_PASSWORD'], host=ENV['DB_HOST'],
+                             port=ENV['DB_PORT'])
+    with conn.cursor() as cursor:
+        cursor.execute(f"analyze {', '.join(sorted(FACT_TABLES))}")
+    conn.commit()
+    failures = 0
+    queries = [(label, query, None) for label, query in find_dashboard_queries(
+        [os.path.join(DASHBOARD_FOLDER, file_name) for file_name in DASHBOARD_FILES])]
+    queries.extend(build_search_queries())
+    for label, query, params in queries:
+        if query is None:
+            failures += 1
+            logging.info("FAIL %s: f-string query, build it in judgment_queries.py", label)
+            continue
+        result = explain_query(conn, query, params, prefer_indexes)
+        if result["sequential_scans"]:
+            failures += 1
+            logging.info("FAIL %s: sequential scan of %s", label,
+                         ", ".join(result["sequential_scans"]))
+        else:
+            logging.info("ok   %s: %s", label, ", ".join(result["indexes"]) or "no fact tables")
+    conn.close()
+    logging.info("%s of %s dashboard queries use indexes.", len(queries) - failures, len(queries))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
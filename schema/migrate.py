@@ -0,0 +1,108 @@
+"""Applies versioned schema migrations that have not yet been run against the database."""
+from os import environ as ENV
+import os
+import re
+import sys
+import logging
+
+import psycopg2
+from dotenv import load_dotenv
+from psycopg2.extensions import connection, cursor as tuple_cursor
+
+
+MIGRATIONS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+# Arbitrary key so concurrent runners apply migrations one at a time.
+MIGRATION_LOCK_ID = 15_2025
+
+# data_version survives a reset so its counter keeps rising past versions a running
+# dashboard has already cached; migration 0008 leaves an existing row alone.
+RESET_QUERY = """DROP TABLE IF EXISTS schema_migrations, home_snapshot, judgment_of_the_day,
+    counsel_assignment, party, counsel, chamber, judgment, court, judgment_type, role CASCADE"""
+
+
+def get_db_connection(dbname: str, user: str, password: str, host: str, port: str) -> connection:
+    """Establishes a connection to PostgreSQL.
+    Returns a PostgreSQL connection object."""
+    try:
+        return psycopg2.connect(dbname=dbname, user=user, password=password,
+                                host=host, port=port)
+    except psycopg2.DatabaseError as e:
+        raise psycopg2.DatabaseError("Error connecting to database.") from e
+
+
+def list_migrations(folder_path: str = MIGRATIONS_FOLDER) -> list[tuple[int, str, str]]:
+    """Finds migration files named like 0001_description.sql.
+    Returns a list of (version, name, path) tuples in version order."""
+    migrations = []
+    for file_name in os.listdir(folder_path):
+        match = re.fullmatch(r"(\d+)_(\w+)\.sql", file_name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2),
+                               os.path.join(folder_path, file_name)))
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {folder_path}.")
+    return sorted(migrations)
+
+
+def reset_database(conn: connection) -> None:
+    """Drops every table, including the migration history."""
+    with conn.cursor() as cursor:
+        cursor.execute(RESET_QUERY)
+    conn.commit()
+
+
+def apply_migrations(conn: connection, folder_path: str = MIGRATIONS_FOLDER) -> list[int]:
+    """Applies every migration not yet recorded in schema_migrations, each in its
+    own transaction, while holding a lock so only one runner migrates at a time.
+    Returns the versions applied."""
+    applied = []
+    with conn.cursor(cursor_factory=tuple_cursor) as cursor:
+        cursor.execute("select pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        try:
+            cursor.execute("""create table if not exists schema_migrations (
+                version INT PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now())""")
+            cursor.execute("select version from schema_migrations")
+            done = {row[0] for row in cursor.fetchall()}
+            conn.commit()
+            for version, name, path in list_migrations(folder_path):
+                if version in done:
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    sql = f.read()
+                try:
+                    cursor.execute(sql)
+                    cursor.execute("insert into schema_migrations (version, name) values (%s, %s)",
+                                   (version, name))
+                    conn.commit()
+                except psycopg2.Error as e:
+                    conn.rollback()
+                    logging.error("Migration %04d_%s failed and was rolled back: %s",
+                                  version, name, str(e))
+                    raise
+                logging.info("Applied migration %04d_%s", version, name)
+                applied.append(version)
+        finally:
+            cursor.execute("select pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+            conn.commit()
+    return applied
+
+
+def main() -> None:
+    """Applies pending migrations, dropping every table first when run with --reset."""
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    conn = get_db_connection(dbname=ENV['DB_NAME'], user=ENV['DB_USER'],
+                             password=ENV['DB_PASSWORD'], host=ENV['DB_HOST'],
+                             port=ENV['DB_PORT'])
+    if "--reset" in sys.argv[1:]:
+        reset_database(conn)
+    applied = apply_migrations(conn)
+    logging.info("%s migrations applied.", len(applied))
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
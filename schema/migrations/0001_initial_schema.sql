@@ -0,0 +1,122 @@
+CREATE TABLE IF NOT EXISTS role (
+    role_id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    role_name VARCHAR(100) NOT NULL
+);
+
+
+CREATE TABLE IF NOT EXISTS court (
+    court_id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    court_name VARCHAR(100) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS chamber (
+    chamber_id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    chamber_name VARCHAR(100) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS judgment_type (
+    judgment_type_id SMALLINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    judgment_type VARCHAR(100)
+);
+
+CREATE TABLE IF NOT EXISTS counsel (
+    counsel_id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    counsel_name VARCHAR(100) NOT NULL,
+    chamber_id SMALLINT,
+    CONSTRAINT fk_chamber FOREIGN KEY (chamber_id) REFERENCES chamber (chamber_id)
+);
+
+CREATE TABLE IF NOT EXISTS judgment (
+    neutral_citation VARCHAR(30) PRIMARY KEY,
+    court_id INT NOT NULL,
+    judgment_date DATE,
+    judgment_summary TEXT NOT NULL,
+    in_favour_of INT NOT NULL,
+    judgment_type_id SMALLINT,
+    judge_name VARCHAR(100) NOT NULL,
+    CONSTRAINT fk_in_favour_of FOREIGN KEY (in_favour_of) REFERENCES role (role_id),
+    CONSTRAINT fk_court FOREIGN KEY (court_id) REFERENCES court (court_id),
+    CONSTRAINT fk_judgment_type FOREIGN KEY (judgment_type_id) REFERENCES judgment_type(judgment_type_id)
+);
+
+
+
+CREATE TABLE IF NOT EXISTS party (
+    party_id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    party_name VARCHAR(100) NOT NULL,
+    role_id INT NOT NULL,
+    neutral_citation VARCHAR(30) NOT NULL,
+    CONSTRAINT neutral_citation FOREIGN KEY (neutral_citation) REFERENCES judgment(neutral_citation),
+    CONSTRAINT fk_role FOREIGN KEY (role_id) REFERENCES role (role_id)
+);
+
+CREATE TABLE IF NOT EXISTS counsel_assignment (
+    counsel_assignment_id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    party_id INT NOT NULL,
+    counsel_id INT NOT NULL,
+    CONSTRAINT fk_party FOREIGN KEY (party_id) REFERENCES party (party_id),
+    CONSTRAINT fk_counsel FOREIGN KEY (counsel_id) REFERENCES counsel (counsel_id)
+);
+
+-- Databases loaded before names were upserted can hold the same role, court, chamber,
+-- judgment type or counsel more than once under different casing. Each is merged into
+-- its lowest id, repointing references, before the case-insensitive keys are created.
+UPDATE judgment j SET in_favour_of = k.kept_id
+FROM (SELECT role_id, MIN(role_id) OVER (PARTITION BY LOWER(role_name)) AS kept_id
+      FROM role) k
+WHERE j.in_favour_of = k.role_id AND k.role_id <> k.kept_id;
+UPDATE party p SET role_id = k.kept_id
+FROM (SELECT role_id, MIN(role_id) OVER (PARTITION BY LOWER(role_name)) AS kept_id
+      FROM role) k
+WHERE p.role_id = k.role_id AND k.role_id <> k.kept_id;
+DELETE FROM role r USING role k
+WHERE LOWER(k.role_name) = LOWER(r.role_name) AND k.role_id < r.role_id;
+
+UPDATE judgment j SET court_id = k.kept_id
+FROM (SELECT court_id, MIN(court_id) OVER (PARTITION BY LOWER(court_name)) AS kept_id
+      FROM court) k
+WHERE j.court_id = k.court_id AND k.court_id <> k.kept_id;
+DELETE FROM court c USING court k
+WHERE LOWER(k.court_name) = LOWER(c.court_name) AND k.court_id < c.court_id;
+
+UPDATE judgment j SET judgment_type_id = k.kept_id
+FROM (SELECT judgment_type_id,
+             MIN(judgment_type_id) OVER (PARTITION BY LOWER(judgment_type)) AS kept_id
+      FROM judgment_type WHERE judgment_type IS NOT NULL) k
+WHERE j.judgment_type_id = k.judgment_type_id AND k.judgment_type_id <> k.kept_id;
+DELETE FROM judgment_type t USING judgment_type k
+WHERE LOWER(k.judgment_type) = LOWER(t.judgment_type) AND k.judgment_type_id < t.judgment_type_id;
+
+UPDATE counsel c SET chamber_id = k.kept_id
+FROM (SELECT chamber_id, MIN(chamber_id) OVER (PARTITION BY LOWER(chamber_name)) AS kept_id
+      FROM chamber) k
+WHERE c.chamber_id = k.chamber_id AND k.chamber_id <> k.kept_id;
+DELETE FROM chamber c USING chamber k
+WHERE LOWER(k.chamber_name) = LOWER(c.chamber_name) AND k.chamber_id < c.chamber_id;
+
+-- A kept counsel without a chamber takes one from the duplicates merged into it.
+UPDATE counsel c SET chamber_id = d.chamber_id
+FROM (SELECT DISTINCT ON (LOWER(counsel_name)) LOWER(counsel_name) AS counsel_key, chamber_id
+      FROM counsel WHERE chamber_id IS NOT NULL
+      ORDER BY LOWER(counsel_name), counsel_id) d
+WHERE LOWER(c.counsel_name) = d.counsel_key AND c.chamber_id IS NULL;
+UPDATE counsel_assignment a SET counsel_id = k.kept_id
+FROM (SELECT counsel_id, MIN(counsel_id) OVER (PARTITION BY LOWER(counsel_name)) AS kept_id
+      FROM counsel) k
+WHERE a.counsel_id = k.counsel_id AND k.counsel_id <> k.kept_id;
+DELETE FROM counsel c USING counsel k
+WHERE LOWER(k.counsel_name) = LOWER(c.counsel_name) AND k.counsel_id < c.counsel_id;
+DELETE FROM counsel_assignment a USING counsel_assignment k
+WHERE k.party_id = a.party_id AND k.counsel_id = a.counsel_id
+    AND k.counsel_assignment_id < a.counsel_assignment_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS role_name_lower_key ON role (LOWER(role_name));
+CREATE UNIQUE INDEX IF NOT EXISTS court_name_lower_key ON court (LOWER(court_name));
+CREATE UNIQUE INDEX IF NOT EXISTS chamber_name_lower_key ON chamber (LOWER(chamber_name));
+CREATE UNIQUE INDEX IF NOT EXISTS judgment_type_lower_key ON judgment_type (LOWER(judgment_type));
+CREATE UNIQUE INDEX IF NOT EXISTS counsel_name_lower_key ON counsel (LOWER(counsel_name));
+
+INSERT INTO judgment_type(judgment_type)
+VALUES ('criminal'),
+       ('civil')
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,8 @@
+CREATE INDEX IF NOT EXISTS judgment_judgment_date_idx ON judgment (judgment_date);
+CREATE INDEX IF NOT EXISTS judgment_court_id_idx ON judgment (court_id);
+CREATE INDEX IF NOT EXISTS judgment_judgment_type_id_idx ON judgment (judgment_type_id);
+CREATE INDEX IF NOT EXISTS judgment_judge_name_idx ON judgment (judge_name);
+CREATE INDEX IF NOT EXISTS party_neutral_citation_idx ON party (neutral_citation);
+CREATE INDEX IF NOT EXISTS counsel_assignment_party_id_idx ON counsel_assignment (party_id);
+CREATE INDEX IF NOT EXISTS counsel_assignment_counsel_id_idx ON counsel_assignment (counsel_id);
+CREATE INDEX IF NOT EXISTS counsel_chamber_id_idx ON counsel (chamber_id);
@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS judgment_date_citation_idx
+    ON judgment (judgment_date DESC, neutral_citation DESC);
+DROP INDEX IF EXISTS judgment_judgment_date_idx;
@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS judgment_court_id_judgment_date_idx
+    ON judgment (court_id, judgment_date);
+DROP INDEX IF EXISTS judgment_court_id_idx;
@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS home_snapshot (
+    home_snapshot_id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (home_snapshot_id = 1),
+    snapshot JSONB NOT NULL,
+    built_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS judgment_of_the_day (
+    featured_date DATE PRIMARY KEY,
+    neutral_citation VARCHAR(30) NOT NULL,
+    selected_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT fk_neutral_citation FOREIGN KEY (neutral_citation)
+        REFERENCES judgment (neutral_citation) ON DELETE CASCADE
+);
@@ -1,3 +1,3 @@
 source .env
 
-PGPASSWORD=$DB_PASSWORD psql -h $DB_HOST -p $DB_PORT -U $DB_USERNAME -d $DB_NAME -f schema.sql
+python migrate.py --reset
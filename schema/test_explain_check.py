@@ -0,0 +1,43 @@
+import os
+from explain_check import (find_dashboard_queries, build_search_queries,
+                           DASHBOARD_FOLDER, DASHBOARD_FILES)
+
+
+def write_dashboard(tmp_path, source: str) -> str:
+    """Writes a dashboard module and returns its path."""
+    path = tmp_path / "dashboard.py"
+    path.write_text(source)
+    return str(path)
+
+
+def test_find_dashboard_queries_covers_every_dashboard_query():
+    """Test that every dashboard query is a plain statement the check can explain."""
+    queries = find_dashboard_queries([os.path.join(DASHBOARD_FOLDER, file_name)
+                                      for file_name in DASHBOARD_FILES])
+    labels = {label for label, _ in queries}
+
+    assert [label for label, query in queries if query is None] == []
+    assert "data_source.py:fetch_case_overview" in labels
+
+
+def test_build_search_queries_match_their_parameters():
+    """Test that the search is explained browsing and searching, on first and later pages,
+    each statement with one parameter per placeholder."""
+    queries = build_search_queries()
+
+    assert len(queries) == 6
+    assert sum("search_rank" in query for _, query, _ in queries) == 2
+    assert sum("< (%s, %s)" in query for _, query, _ in queries) == 2
+    for _, query, params in queries:
+        assert query.replace("%%", "").count("%s") == len(params)
+
+
+def test_find_dashboard_queries_flags_f_string_queries(tmp_path):
+    """Test that an f-string query outside the query builders is reported, not skipped."""
+    path = write_dashboard(tmp_path, '''
+def search(conn):
+    query = f"""SELECT * FROM judgment WHERE {conditions}"""
+    html = f"""<p>{conn}</p>"""
+''')
+
+    assert find_dashboard_queries([path]) == [("dashboard.py:search", None)]
@@ -0,0 +1,96 @@
+"""Benchmarks the insert and COPY based loaders against a scratch database."""
+from os import environ as ENV
+from time import perf_counter
+import logging
+import random
+
+from dotenv import load_dotenv
+from psycopg2.extensions import connection
+
+from migrate import reset_database, apply_migrations
+from load import (get_db_connection, resolve_base_maps,
+                  seed_judgment_data, bulk_load_judgment_data)
+
+
+def generate_judgments(number_of_judgments: int, seed: int = 0) -> list[dict]:
+    """Returns synthetic combined judgment data shaped like the transform output."""
+    rng = random.Random(seed)
+    roles = ["appellant", "respondent", "claimant", "defendant"]
+    judgments = []
+    for i in range(number_of_judgments):
+        parties = []
+        for role in rng.sample(roles, 2):
+            parties.append({
+                "party_name": f"party {i}-{role}",
+                "party_role": role,
+                "counsels": [{"counsel_name": f"counsel {rng.randrange(2000)}",
+                              "chamber_name": f"chamber {rng.randrange(200)}"}
+                             for _ in range(rng.randint(1, 3))]
+            })
+        judgments.append({
+            "neutral_citation": f"[2024] EWHC {i + 1} (KB)",
+            "court_name": f"court {rng.randrange(20)}",
+            "judgment_date": f"2024-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}",
+            "type_of_crime": rng.choice(["civil", "criminal"]),
+            "judgment_description": "Synthetic summary. " * 40,
+            "judge": f"Mr Justice {rng.randrange(300)}",
+            "ruling": parties[0]["party_role"],
+            "parties": parties
+        })
+    return judgments
+
+
+def reset_schema(conn: connection) -> None:
+    """Drops every table and recreates them by applying all migrations."""
+    reset_database(conn)
+    apply_migrations(conn)
+
+
+def time_insert_path(conn: connection, judgment_data: list[dict], days: int) -> float:
+    """Loads judgments day by day through the execute_values path.
+    Returns elapsed seconds."""
+    start = perf_counter()
+    for day in range(days):
+        day_data = judgment_data[day::days]
+        mappings = resolve_base_maps(conn, day_data)
+        seed_judgment_data(conn, day_data, mappings)
+    return perf_counter() - start
+
+
+def time_bulk_path(conn: connection, judgment_data: list[dict], days: int) -> float:
+    """Loads judgments day by day through the COPY and staging table path.
+    Returns elapsed seconds."""
+    start = perf_counter()
+    for day in range(days):
+        bulk_load_judgment_data(conn, judgment_data[day::days])
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Runs both loaders over the same synthetic data and logs their timings.
+    Uses BENCHMARK_DB_NAME so the real database is never reset."""
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    conn = get_db_connection(dbname=ENV["BENCHMARK_DB_NAME"], user=ENV['DB_USER'],
+                             password=ENV['DB_PASSWORD'], host=ENV['DB_HOST'],
+                             port=ENV['DB_PORT'])
+    number_of_judgments = int(ENV.get("BENCHMARK_JUDGMENTS", "5000"))
+    days = int(ENV.get("BENCHMARK_DAYS", "30"))
+    judgment_data = generate_judgments(number_of_judgments)
+
+    reset_schema(conn)
+    insert_seconds = time_insert_path(conn, judgment_data, days)
+    reset_schema(conn)
+    bulk_seconds = time_bulk_path(conn, judgment_data, days)
+    conn.close()
+
+    logging.info("Loaded %s judgments over %s days.", number_of_judgments, days)
+    logging.info("execute_values path: %.2fs (%.0f judgments/s)",
+                 insert_seconds, number_of_judgments / insert_seconds)
+    logging.info("COPY staging path: %.2fs (%.0f judgments/s)",
+                 bulk_seconds, number_of_judgments / bulk_seconds)
+    logging.info("Speed-up: %.1fx", insert_seconds / bulk_seconds)
+
+
+if __name__ == "__main__":
+    main()
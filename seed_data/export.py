@@ -0,0 +1,118 @@
+"""Exports the judgment star schema as month-partitioned Parquet snapshots.
+daily_pipeline/daily_export.py and seed_data/export.py are kept identical, as each
+folder is built into its own image, so change them together."""
+import logging
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import fs
+from psycopg2.extensions import connection
+from psycopg2.extras import RealDictCursor
+
+
+EXPORT_BATCH_SIZE = 10000
+
+EXPORT_SCHEMA = pa.schema([
+    ("neutral_citation", pa.string()),
+    ("judgment_date", pa.date32()),
+    ("judgment_month", pa.string()),
+    ("court_name", pa.string()),
+    ("judgment_type", pa.string()),
+    ("in_favour_of", pa.string()),
+    ("judge_name", pa.string()),
+    ("judgment_summary", pa.string()),
+    ("extraction_model", pa.string()),
+    ("prompt_version", pa.string()),
+    ("party_name", pa.string()),
+    ("party_role", pa.string()),
+    ("counsel_name", pa.string()),
+    ("chamber_name", pa.string())
+])
+
+# The month is encoded in each partition's folder name rather than stored in its files.
+PARTITION_SCHEMA = EXPORT_SCHEMA.remove(EXPORT_SCHEMA.get_field_index("judgment_month"))
+
+EXPORT_QUERY = """select j.neutral_citation, j.judgment_date,
+       to_char(j.judgment_date, 'YYYY-MM') as judgment_month,
+       c.court_name, jt.judgment_type, r.role_name as in_favour_of,
+       j.judge_name, j.judgment_summary, j.extraction_model, j.prompt_version,
+       p.party_name, pr.role_name as party_role, co.counsel_name, ch.chamber_name
+from judgment j
+join court c on c.court_id = j.court_id
+left join judgment_type jt on jt.judgment_type_id = j.judgment_type_id
+left join role r on r.role_id = j.in_favour_of
+left join party p on p.neutral_citation = j.neutral_citation
+left join role pr on pr.role_id = p.role_id
+left join counsel_assignment ca on ca.party_id = p.party_id
+left join counsel co on co.counsel_id = ca.counsel_id
+left join chamber ch on ch.chamber_id = co.chamber_id
+where %(months)s::text[] is null
+   or to_char(j.judgment_date, 'YYYY-MM') = any(%(months)s::text[])
+order by j.judgment_date, j.neutral_citation"""
+
+
+def get_export_filesystem(destination: str, access_key: str = None,
+                          secret_key: str = None) -> tuple[fs.FileSystem, str]:
+    """Picks the filesystem for a local folder or an s3://bucket/prefix destination.
+    Returns the filesystem and the root path within it."""
+    if destination.startswith("s3://"):
+        return (fs.S3FileSystem(access_key=access_key, secret_key=secret_key),
+                destination.removeprefix("s3://").rstrip("/"))
+    return fs.LocalFileSystem(), destination.rstrip("/")
+
+
+def fetch_export_batches(conn: connection, months: list[str] = None) -> Iterator[pa.RecordBatch]:
+    """Streams the joined star schema, one row per judgment, party and counsel,
+    for the given judgment months or for every judgment, in judgment date order.
+    Yields Arrow record batches of up to EXPORT_BATCH_SIZE rows."""
+    with conn.cursor(name="judgment_export", cursor_factory=RealDictCursor) as cursor:
+        cursor.itersize = EXPORT_BATCH_SIZE
+        cursor.execute(EXPORT_QUERY, {"months": sorted(months) if months else None})
+        while rows := cursor.fetchmany(EXPORT_BATCH_SIZE):
+            yield pa.RecordBatch.from_pylist(rows, schema=EXPORT_SCHEMA)
+    conn.commit()
+
+
+def open_partition_writer(filesystem: fs.FileSystem, root_path: str,
+                          month: str) -> pq.ParquetWriter:
+    """Empties a judgment month's partition so it is replaced rather than added to.
+    Returns a Parquet writer for the partition's new file."""
+    partition_path = f"{root_path}/judgment_month={month}"
+    filesystem.create_dir(partition_path)
+    filesystem.delete_dir_contents(partition_path)
+    return pq.ParquetWriter(f"{partition_path}/part-0.parquet", PARTITION_SCHEMA,
+                            filesystem=filesystem)
+
+
+def export_judgment_snapshot(conn: connection, destination: str, months: list[str] = None,
+                             access_key: str = None, secret_key: str = None) -> int:
+    """Writes Parquet snapshots partitioned by judgment month, replacing only the
+    partitions being exported so a daily run rewrites the months it loaded.
+    Rows arrive in date order, so each batch is appended to its month's file as it is
+    read and only one month's file is open at a time.
+    Returns the number of rows written."""
+    filesystem, root_path = get_export_filesystem(destination, access_key, secret_key)
+    writer, writer_month, written = None, None, 0
+    try:
+        for batch in fetch_export_batches(conn, months):
+            for month in batch.column("judgment_month").unique().to_pylist():
+                if month != writer_month:
+                    if writer:
+                        writer.close()
+                    writer = open_partition_writer(filesystem, root_path, month)
+                    writer_month = month
+                # pyarrow generates its compute functions at import time.
+                rows = batch.filter(pc.equal(  # pylint: disable=no-member
+                    batch.column("judgment_month"), month))
+                writer.write_batch(rows.drop_columns(["judgment_month"]))
+                written += rows.num_rows
+    except (pa.ArrowException, OSError) as e:
+        logging.error("Error exporting Parquet snapshot to %s: %s", destination, str(e))
+        return 0
+    finally:
+        if writer:
+            writer.close()
+    logging.info("Exported %s rows to %s.", written, destination)
+    return written
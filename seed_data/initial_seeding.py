@@ -3,18 +3,26 @@
 
 import os
 from os import environ as ENV
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
 import asyncio
 
 from dotenv import load_dotenv
 
 from extract import download_days_judgments
+from export import export_judgment_snapshot
+from parse_xml import get_metadata
 from prompt_engineering import get_client
 from transform import process_all_judgments
-from load import (get_db_connection, get_base_maps,
-                  seed_db_base_tables, seed_judgment_data,
-                  create_client, upload_multiple_files_to_s3)
+from migrate import reset_database, apply_migrations
+from load import (get_db_connection, resolve_base_maps, refresh_dashboard_views,
+                  refresh_home_snapshot, bump_data_version,
+                  select_judgment_of_the_day,
+                  seed_judgment_data, bulk_load_judgment_data,
+                  create_client, upload_multiple_files_to_s3,
+                  load_upload_manifest, save_upload_manifest,
+                  create_upload_semaphore, archive_xml_to_s3, save_archive_manifests,
+                  save_extraction_outputs)
 
 
 def list_days_between(start_date: datetime, end_date: datetime):
@@ -23,6 +31,22 @@ def list_days_between(start_date: datetime, end_date: datetime):
             for i in range((end_date - start_date).days + 1)]
 
 
+async def archive_days_judgments(s3_client, folder_path: str, bucket_name: str) -> None:
+    """Archives every downloaded judgment's raw xml to S3 and records it in the
+    manifest of its judgment date."""
+    semaphore = create_upload_semaphore(s3_client)
+    archive_tasks = []
+    for file_name in os.listdir(folder_path):
+        file_path = os.path.join(folder_path, file_name)
+        with open(file_path, "rb") as f:
+            xml_content = f.read()
+        archive_tasks.append(archive_xml_to_s3(s3_client, xml_content, bucket_name,
+                                               get_metadata(file_path), file_name, semaphore))
+    manifest_entries = await asyncio.gather(*archive_tasks)
+    save_archive_manifests(s3_client, bucket_name,
+                           [entry for entry in manifest_entries if entry])
+
+
 async def main() -> None:
     """Main seeding function."""
     load_dotenv()
@@ -36,26 +60,30 @@ async def main() -> None:
     my_aws_secret_access_key = ENV["SECRET_KEY"]
     s_three = await create_client(my_aws_access_key_id,
                                   my_aws_secret_access_key)
+    upload_manifest = load_upload_manifest(s_three, ENV["BUCKET_NAME"])
+    extraction_archive = ENV.get("EXTRACTION_ARCHIVE", f"s3://{ENV['BUCKET_NAME']}/extractions")
     end_date = datetime.today() - timedelta(days=1)
     start_date = end_date - (timedelta(days=int(ENV["DAYS_TO_SEED"]) - 1))
-    with conn.cursor() as cursor:
-        with open("schema.sql", "r", encoding="utf-8") as f:
-            sql_commands = f.read()
-            cursor.execute(sql_commands)
-            conn.commit()
+    reset_database(conn)
+    apply_migrations(conn)
     for day in list_days_between(start_date, end_date):
         logging.info("Judgments for Day %s", day.strftime("%B %d %Y"))
         logging.info("------------------")
         await download_days_judgments(day, "judgments")
         if os.listdir("judgments"):
             judgment_data = process_all_judgments("judgments", "judgments_html", api_client)
-            mappings = get_base_maps(conn)
-            seed_db_base_tables(judgment_data, conn, mappings)
-            updated_mappings = get_base_maps(conn)
-            seed_judgment_data(conn, judgment_data, updated_mappings)
+            save_extraction_outputs(judgment_data, extraction_archive, s_three)
+            if ENV.get("LOAD_MODE") == "bulk":
+                bulk_load_judgment_data(conn, judgment_data)
+            else:
+                mappings = resolve_base_maps(conn, judgment_data)
+                seed_judgment_data(conn, judgment_data, mappings)
             await upload_multiple_files_to_s3(s_three,
                                               "judgments_html",
-                                              ENV["BUCKET_NAME"])
+                                              ENV["BUCKET_NAME"],
+                                              upload_manifest)
+            save_upload_manifest(s_three, ENV["BUCKET_NAME"], upload_manifest)
+            await archive_days_judgments(s_three, "judgments", ENV["BUCKET_NAME"])
             judgment_filepaths = [os.path.join("judgments", file) for
                                   file in os.listdir("judgments")]
             judgment_html_filepaths = [os.path.join("judgments_html", file) for
@@ -66,6 +94,16 @@ async def main() -> None:
                 os.remove(judgment_html)
             await asyncio.sleep(5)
 
+    refresh_dashboard_views(conn)
+    select_judgment_of_the_day(conn, date.today(),
+                               int(ENV.get("FEATURED_MIN_SUMMARY_LENGTH", "0")),
+                               ENV.get("FEATURED_COURT"))
+    refresh_home_snapshot(conn)
+    bump_data_version(conn)
+    export_judgment_snapshot(conn, ENV.get("PARQUET_EXPORT",
+                                           f"s3://{ENV['BUCKET_NAME']}/parquet/judgments"),
+                             access_key=my_aws_access_key_id,
+                             secret_key=my_aws_secret_access_key)
     conn.close()
 
 
@@ -0,0 +1,2 @@
+ALTER TABLE judgment ADD COLUMN IF NOT EXISTS extraction_model VARCHAR(50);
+ALTER TABLE judgment ADD COLUMN IF NOT EXISTS prompt_version VARCHAR(20);
@@ -0,0 +1,4 @@
+ALTER TABLE judgment ADD COLUMN IF NOT EXISTS judgment_search TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(judgment_summary, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS judgment_search_idx ON judgment USING GIN (judgment_search);
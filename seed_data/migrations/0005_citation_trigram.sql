@@ -0,0 +1,4 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS judgment_neutral_citation_trgm_idx
+    ON judgment USING GIN (neutral_citation gin_trgm_ops);
@@ -0,0 +1,44 @@
+CREATE MATERIALIZED VIEW IF NOT EXISTS judgments_by_court AS
+SELECT c.court_id, c.court_name, COUNT(*) AS case_count
+FROM judgment j
+JOIN court c ON j.court_id = c.court_id
+GROUP BY c.court_id, c.court_name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS judgments_by_court_key ON judgments_by_court (court_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS judgments_by_type AS
+SELECT jt.judgment_type_id, jt.judgment_type, COUNT(*) AS case_count
+FROM judgment j
+JOIN judgment_type jt ON j.judgment_type_id = jt.judgment_type_id
+GROUP BY jt.judgment_type_id, jt.judgment_type;
+
+CREATE UNIQUE INDEX IF NOT EXISTS judgments_by_type_key ON judgments_by_type (judgment_type_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS judgments_by_date_and_type AS
+SELECT j.judgment_date, jt.judgment_type_id, jt.judgment_type, COUNT(*) AS judgment_count
+FROM judgment j
+JOIN judgment_type jt ON j.judgment_type_id = jt.judgment_type_id
+GROUP BY j.judgment_date, jt.judgment_type_id, jt.judgment_type;
+
+CREATE UNIQUE INDEX IF NOT EXISTS judgments_by_date_and_type_key
+    ON judgments_by_date_and_type (judgment_date, judgment_type_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS judgments_by_judge AS
+SELECT judge_name, COUNT(*) AS total_judgments
+FROM judgment
+GROUP BY judge_name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS judgments_by_judge_key ON judgments_by_judge (judge_name);
+CREATE INDEX IF NOT EXISTS judgments_by_judge_total_idx ON judgments_by_judge (total_judgments DESC);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS judgments_by_chamber AS
+SELECT ch.chamber_id, ch.chamber_name, COUNT(*) AS total_judgments
+FROM chamber ch
+JOIN counsel co ON ch.chamber_id = co.chamber_id
+JOIN counsel_assignment ca ON co.counsel_id = ca.counsel_id
+JOIN party p ON ca.party_id = p.party_id
+JOIN judgment j ON p.neutral_citation = j.neutral_citation
+GROUP BY ch.chamber_id, ch.chamber_name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS judgments_by_chamber_key ON judgments_by_chamber (chamber_id);
+CREATE INDEX IF NOT EXISTS judgments_by_chamber_total_idx ON judgments_by_chamber (total_judgments DESC);
@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS data_version (
+    data_version_id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (data_version_id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO data_version (data_version_id) VALUES (1) ON CONFLICT DO NOTHING;
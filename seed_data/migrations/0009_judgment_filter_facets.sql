@@ -0,0 +1,20 @@
+CREATE MATERIALIZED VIEW IF NOT EXISTS judgment_filter_facets AS
+SELECT 'court' AS facet, c.court_name AS facet_value,
+       COUNT(j.neutral_citation) AS judgment_count,
+       MIN(j.judgment_date) AS min_date, MAX(j.judgment_date) AS max_date
+FROM court c
+LEFT JOIN judgment j ON j.court_id = c.court_id
+GROUP BY c.court_name
+UNION ALL
+SELECT 'judgment_type', jt.judgment_type, COUNT(j.neutral_citation),
+       MIN(j.judgment_date), MAX(j.judgment_date)
+FROM judgment_type jt
+LEFT JOIN judgment j ON j.judgment_type_id = jt.judgment_type_id
+WHERE jt.judgment_type IS NOT NULL
+GROUP BY jt.judgment_type
+UNION ALL
+SELECT 'all', 'all', COUNT(*), MIN(judgment_date), MAX(judgment_date)
+FROM judgment;
+
+CREATE UNIQUE INDEX IF NOT EXISTS judgment_filter_facets_key
+    ON judgment_filter_facets (facet, facet_value);
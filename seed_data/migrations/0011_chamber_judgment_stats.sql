@@ -0,0 +1,14 @@
+CREATE MATERIALIZED VIEW IF NOT EXISTS chamber_judgment_stats AS
+SELECT ch.chamber_id, ch.chamber_name,
+       COUNT(j.neutral_citation) AS total_judgments,
+       COUNT(j.neutral_citation) FILTER (WHERE jt.judgment_type = 'criminal') AS criminal_judgments,
+       COUNT(j.neutral_citation) FILTER (WHERE jt.judgment_type = 'civil') AS civil_judgments
+FROM chamber ch
+LEFT JOIN counsel co ON ch.chamber_id = co.chamber_id
+LEFT JOIN counsel_assignment ca ON co.counsel_id = ca.counsel_id
+LEFT JOIN party p ON ca.party_id = p.party_id
+LEFT JOIN judgment j ON p.neutral_citation = j.neutral_citation
+LEFT JOIN judgment_type jt ON j.judgment_type_id = jt.judgment_type_id
+GROUP BY ch.chamber_id, ch.chamber_name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS chamber_judgment_stats_key ON chamber_judgment_stats (chamber_id);
@@ -9,6 +9,8 @@ from pydantic import BaseModel
 load_dotenv()
 
 GPT_MODEL = "gpt-4o-mini"
+# Bump whenever the prompt or the output schema changes.
+PROMPT_VERSION = "1"
 
 
 class Counsel(BaseModel):
@@ -0,0 +1,63 @@
+"""Rebuilds every table from archived extraction outputs, without calling GPT."""
+from os import environ as ENV
+from datetime import date
+import logging
+import asyncio
+
+from dotenv import load_dotenv
+from botocore.client import BaseClient
+from psycopg2.extensions import connection
+
+from migrate import reset_database, apply_migrations
+from load import (get_db_connection, bulk_load_judgment_data, create_client,
+                  refresh_dashboard_views, refresh_home_snapshot, bump_data_version,
+                  select_judgment_of_the_day,
+                  list_extraction_partitions, read_extraction_partition)
+
+
+def reset_schema(conn: connection) -> None:
+    """Drops every table and recreates them by applying all migrations."""
+    reset_database(conn)
+    apply_migrations(conn)
+
+
+def rebuild_database(conn: connection, source: str, s3_client: BaseClient = None) -> dict:
+    """Resets the schema and bulk loads the latest extraction output of every judgment,
+    one judgment date at a time.
+    Returns the total counts of loaded judgments."""
+    reset_schema(conn)
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+    partitions = list_extraction_partitions(source, s3_client)
+    for judgment_date, paths in partitions.items():
+        counts = bulk_load_judgment_data(conn, read_extraction_partition(paths, s3_client))
+        for key in totals:
+            totals[key] += counts[key]
+        logging.info("Rebuilt %s: %s judgments", judgment_date, sum(counts.values()))
+    refresh_dashboard_views(conn)
+    select_judgment_of_the_day(conn, date.today(),
+                               int(ENV.get("FEATURED_MIN_SUMMARY_LENGTH", "0")),
+                               ENV.get("FEATURED_COURT"))
+    refresh_home_snapshot(conn)
+    bump_data_version(conn)
+    logging.info("Rebuilt %s judgment dates: %s judgments loaded.",
+                 len(partitions), sum(totals.values()))
+    return totals
+
+
+def main() -> None:
+    """Main rebuild function."""
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    source = ENV.get("EXTRACTION_ARCHIVE", f"s3://{ENV['BUCKET_NAME']}/extractions")
+    s3_client = None
+    if source.startswith("s3://"):
+        s3_client = asyncio.run(create_client(ENV["ACCESS_KEY"], ENV["SECRET_KEY"]))
+    conn = get_db_connection(dbname=ENV['DB_NAME'], user=ENV['DB_USER'],
+                             password=ENV['DB_PASSWORD'], host=ENV['DB_HOST'],
+                             port=ENV['DB_PORT'])
+    rebuild_database(conn, source, s3_client)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
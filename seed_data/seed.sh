@@ -1 +1 @@
-psql -h localhost -U bill_veliz -d judgments -f ../schema/schema.sql
\ No newline at end of file
+python migrate.py
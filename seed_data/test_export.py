@@ -0,0 +1,78 @@
+from datetime import date
+from unittest.mock import MagicMock
+import pyarrow.parquet as pq
+from export import export_judgment_snapshot, get_export_filesystem
+
+
+def make_row(neutral_citation: str, judgment_date: date) -> dict:
+    """Returns one joined export row."""
+    return {"neutral_citation": neutral_citation, "judgment_date": judgment_date,
+            "judgment_month": judgment_date.strftime("%Y-%m"), "court_name": "High Court",
+            "judgment_type": "civil", "in_favour_of": "appellant", "judge_name": "Smith J",
+            "judgment_summary": "A summary.", "extraction_model": "gpt-4o-mini",
+            "prompt_version": "1", "party_name": "smith", "party_role": "appellant",
+            "counsel_name": None, "chamber_name": None}
+
+
+def make_conn(rows: list[dict]) -> MagicMock:
+    """Returns a mock connection whose named cursor yields the rows in one batch."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchmany.side_effect = [rows, []]
+    return mock_conn
+
+
+def test_export_judgment_snapshot_partitions_by_month(tmp_path):
+    """Test that rows are written to one Parquet partition per judgment month."""
+    rows = [make_row("[2025] EWHC 1", date(2025, 1, 31)),
+            make_row("[2025] EWHC 2", date(2025, 2, 1))]
+
+    written = export_judgment_snapshot(make_conn(rows), str(tmp_path))
+
+    assert written == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["judgment_month=2025-01",
+                                                           "judgment_month=2025-02"]
+    table = pq.read_table(tmp_path, filters=[("judgment_month", "=", "2025-02")])
+    assert table.column("neutral_citation").to_pylist() == ["[2025] EWHC 2"]
+
+
+def test_export_judgment_snapshot_replaces_only_exported_months(tmp_path):
+    """Test that re-exporting a month replaces it and leaves other months alone."""
+    export_judgment_snapshot(make_conn([make_row("[2025] EWHC 1", date(2025, 1, 31)),
+                                        make_row("[2025] EWHC 2", date(2025, 2, 1))]),
+                             str(tmp_path))
+    mock_conn = make_conn([make_row("[2025] EWHC 3", date(2025, 2, 2))])
+
+    export_judgment_snapshot(mock_conn, str(tmp_path), months=["2025-02"])
+
+    table = pq.read_table(tmp_path)
+    assert sorted(table.column("neutral_citation").to_pylist()) == ["[2025] EWHC 1",
+                                                                    "[2025] EWHC 3"]
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    assert mock_cursor.execute.call_args[0][1] == {"months": ["2025-02"]}
+
+
+def test_get_export_filesystem_for_local_folder(tmp_path):
+    """Test that a plain path is written through the local filesystem."""
+    filesystem, root_path = get_export_filesystem(f"{tmp_path}/")
+
+    assert filesystem.type_name == "local"
+    assert root_path == str(tmp_path)
+
+
+def test_export_judgment_snapshot_streams_batches_into_month_files(tmp_path):
+    """Test that a month spread over several fetched batches ends up in one file."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchmany.side_effect = [
+        [make_row("[2025] EWHC 1", date(2025, 1, 30)), make_row("[2025] EWHC 2", date(2025, 1, 31))],
+        [make_row("[2025] EWHC 3", date(2025, 1, 31)), make_row("[2025] EWHC 4", date(2025, 2, 1))],
+        []]
+
+    written = export_judgment_snapshot(mock_conn, str(tmp_path))
+
+    assert written == 4
+    assert [p.name for p in (tmp_path / "judgment_month=2025-01").iterdir()] == ["part-0.parquet"]
+    table = pq.read_table(tmp_path, filters=[("judgment_month", "=", "2025-01")])
+    assert table.column("neutral_citation").to_pylist() == ["[2025] EWHC 1", "[2025] EWHC 2",
+                                                            "[2025] EWHC 3"]
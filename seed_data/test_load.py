@@ -6,10 +6,23 @@ import psycopg2.extras
 import pytest
 from unittest import mock
 from unittest.mock import MagicMock, AsyncMock, ANY
+import csv
+import gzip
+import json
+import threading
+import time
+from datetime import date
+import boto3
+from moto import mock_aws
 import psycopg2
-from load import (get_judgment_type_mapping, get_db_connection,
-                  get_court_mapping, get_role_mapping, 
-                  upload_file_to_s3, upload_multiple_files_to_s3)
+from load import (get_db_connection, select_dimension_ids, upsert_dimension_names,
+                  resolve_base_maps, upload_file_to_s3, upload_bytes_to_s3,
+                  archive_xml_to_s3, save_archive_manifests, save_extraction_outputs,
+                  refresh_dashboard_views, bump_data_version,
+                  refresh_home_snapshot, select_judgment_of_the_day,
+                  list_extraction_partitions, read_extraction_partition, upload_multiple_files_to_s3,
+                  build_judgment_rows, seed_judgment_data,
+                  build_staging_rows, copy_rows_to_staging, bulk_load_judgment_data)
 
 def test_get_db_connection_successfully():
     mock_conn = mock.MagicMock(spec=psycopg2.extensions.connection)
@@ -33,65 +46,44 @@ def test_get_db_connection_unsuccessful():
 
 
 
-def test_get_judgment_type_mapping_valid_case():
-    """    mock_conn = MagicMock()
+def test_upsert_dimension_names_returns_ids_for_batch():
+    """Test that upsert_dimension_names upserts sorted names in one statement and maps the ids."""
     mock_cursor = MagicMock()
-    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor"""
+    returned_rows = [{'role_id': 1, 'role_name': 'appellant'},
+                     {'role_id': 2, 'role_name': 'respondent'}]
 
+    with mock.patch("load.execute_values", return_value=returned_rows) as mock_execute_values:
+        result = upsert_dimension_names(mock_cursor, "role", {"respondent", "appellant"})
 
-    mock_conn = mock.MagicMock()
-    mock_cursor = mock.MagicMock()
-    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-    mock_cursor.fetchall.return_value = [
-        { 'judgment_type':'civil', 'judgment_type_id':1},
-        { 'judgment_type':'criminal', 'judgment_type_id':2}
-    ]
+    query, rows = mock_execute_values.call_args.args[1:3]
+    assert "on conflict (lower(role_name))" in query
+    assert "returning role_id, role_name" in query
+    assert rows == [("appellant",), ("respondent",)]
+    assert result == {'appellant': 1, 'respondent': 2}
 
-    result = get_judgment_type_mapping(mock_conn)
-    
-    expected_result = {
-        'civil': 1,
-        'criminal': 2
-    }
-    assert result == expected_result
-    
-def test_get_court_mapping_valid_case():
-    mock_conn = mock.MagicMock()
-    mock_cursor = mock.MagicMock()
-    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-    mock_cursor.fetchall.return_value = [
-        { 'court_name':'high court of justice', 'court_id':1},
-        { 'court_name':'crown court', 'court_id':2},
-        { 'court_name':'supreme court', 'court_id':3}
-    ]
 
-    result = get_court_mapping(mock_conn)
-    
-    expected_result = {
-        'high court of justice': 1,
-        'crown court': 2,
-        'supreme court': 3
-    }
-    assert result == expected_result
+def test_upsert_dimension_names_no_names():
+    """Test that upsert_dimension_names does not query the database for an empty batch."""
+    mock_cursor = MagicMock()
+
+    with mock.patch("load.execute_values") as mock_execute_values:
+        assert upsert_dimension_names(mock_cursor, "court", set()) == {}
+
+    mock_execute_values.assert_not_called()
 
-def test_get_role_mapping_valid_case():
-    mock_conn = mock.MagicMock()
-    mock_cursor = mock.MagicMock()
-    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+
+def test_select_dimension_ids_valid_case():
+    """Test that select_dimension_ids only looks up the given judgment types."""
+    mock_cursor = MagicMock()
     mock_cursor.fetchall.return_value = [
-        { 'role_name':'respondent', 'role_id':1},
-        { 'role_name':'appellant', 'role_id':2},
-        { 'role_name':'defendant', 'role_id':3}
+        { 'judgment_type':'civil', 'judgment_type_id':1},
+        { 'judgment_type':'criminal', 'judgment_type_id':2}
     ]
 
-    result = get_role_mapping(mock_conn)
-    
-    expected_result = {
-        'respondent': 1,
-        'appellant': 2,
-        'defendant': 3
-    }
-    assert result == expected_result
+    result = select_dimension_ids(mock_cursor, "judgment_type", {"criminal", "civil"})
+
+    assert mock_cursor.execute.call_args.args[1] == (["civil", "criminal"],)
+    assert result == {'civil': 1, 'criminal': 2}
 
 
 test_files = [f"test_file_{i}.txt" for i in range(1, 21)]
@@ -100,6 +92,7 @@ test_files = [f"test_file_{i}.txt" for i in range(1, 21)]
 @pytest.mark.parametrize("file_name", test_files)
 async def test_upload_file_to_s3(file_name):
     s3_client = MagicMock()
+    s3_client.meta.config.max_pool_connections = 10
     bucket_name = "test-bucket"
     s3_key = file_name
 
@@ -117,6 +110,7 @@ async def test_upload_file_to_s3(file_name):
 @pytest.mark.parametrize("num_files", [n for n in range(1, 50, 5)])
 async def test_upload_multiple_files_to_s3(num_files):
     s3_client = MagicMock()
+    s3_client.meta.config.max_pool_connections = 10
     folder_path = "test_folder"
     bucket_name = "test-bucket"
     os.makedirs(folder_path, exist_ok=True)
@@ -148,4 +142,451 @@ async def test_upload_file_to_s3_file_not_found(caplog):
 
     s3_client.put_object.assert_not_called()
     
-    assert f"Error: File not found: {local_file_path}" in caplog.text
\ No newline at end of file
+    assert f"Error: File not found: {local_file_path}" in caplog.text
+
+
+@pytest.fixture
+def base_maps():
+    """Base maps as returned from the database."""
+    return {
+        "role_map": {"appellant": 1, "respondent": 2},
+        "chamber_map": {"brick court": 1},
+        "court_map": {"court of appeal": 1},
+        "judgment_type_map": {"civil": 1, "criminal": 2}
+    }
+
+
+def make_case(neutral_citation: str) -> dict:
+    """Returns a combined judgment dictionary for tests."""
+    return {
+        "neutral_citation": neutral_citation,
+        "court_name": "Court of Appeal",
+        "judgment_date": "2025-02-15",
+        "type_of_crime": "Civil",
+        "judgment_description": "A summary.",
+        "judge": "Lord Justice Smith",
+        "ruling": "Appellant",
+        "parties": [
+            {"party_name": "Smith", "party_role": "Appellant",
+             "counsels": [{"counsel_name": "Jane Doe KC", "chamber_name": "Brick Court"},
+                          {"counsel_name": "John Roe", "chamber_name": "Brick Court"}]},
+            {"party_name": "Jones", "party_role": "Respondent",
+             "counsels": [{"counsel_name": "John Roe", "chamber_name": "Brick Court"}]}
+        ]
+    }
+
+
+def test_build_judgment_rows_batches_all_judgments(base_maps):
+    """Test that build_judgment_rows builds rows for every judgment in the batch."""
+    rows = build_judgment_rows([make_case("[2025] EWCA Civ 1"),
+                                make_case("[2025] EWCA Civ 2")], base_maps)
+
+    assert len(rows["judgment"]) == 2
+    assert len(rows["party"]) == 4
+    assert rows["counsel"] == [("jane doe kc", 1), ("john roe", 1)]
+    assert ("[2025] EWCA Civ 2", "jones", "john roe") in rows["counsel_assignment"]
+    assert len(rows["counsel_assignment"]) == 6
+
+
+def test_build_judgment_rows_skips_invalid_and_duplicate_judgments(base_maps):
+    """Test that build_judgment_rows skips unknown courts and repeated citations."""
+    unknown_court = make_case("[2025] EWCA Civ 3")
+    unknown_court["court_name"] = "Unknown Court"
+    rows = build_judgment_rows([make_case("[2025] EWCA Civ 1"),
+                                make_case("[2025] EWCA Civ 1"),
+                                unknown_court], base_maps)
+
+    assert [row[0] for row in rows["judgment"]] == ["[2025] EWCA Civ 1"]
+
+
+def test_seed_judgment_data_single_commit(base_maps):
+    """Test that seed_judgment_data inserts each table once and commits once."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    party_rows = [{"party_name": "smith", "neutral_citation": "[2025] EWCA Civ 1", "party_id": 1},
+                  {"party_name": "jones", "neutral_citation": "[2025] EWCA Civ 1", "party_id": 2}]
+    counsel_rows = [{"counsel_name": "jane doe kc", "counsel_id": 7},
+                    {"counsel_name": "john roe", "counsel_id": 8}]
+
+    judgment_rows = [{"neutral_citation": "[2025] EWCA Civ 1", "inserted": True}]
+
+    with mock.patch("load.execute_values",
+               side_effect=[judgment_rows, party_rows, counsel_rows, None]) as mock_execute_values:
+        counts = seed_judgment_data(mock_conn, [make_case("[2025] EWCA Civ 1")], base_maps)
+
+    assert mock_execute_values.call_count == 4
+    assert mock_execute_values.call_args_list[3].args[2] == [(1, 7), (1, 8), (2, 8)]
+    assert counts == {"inserted": 1, "updated": 0, "unchanged": 0}
+    mock_conn.commit.assert_called_once()
+
+
+def test_seed_judgment_data_rerun_replaces_children(base_maps):
+    """Test that rerunning a batch upserts judgments and replaces their parties."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    judgment_rows = [{"neutral_citation": "[2025] EWCA Civ 2", "inserted": False}]
+    party_rows = [{"party_name": "smith", "neutral_citation": "[2025] EWCA Civ 1", "party_id": 3},
+                  {"party_name": "jones", "neutral_citation": "[2025] EWCA Civ 1", "party_id": 4},
+                  {"party_name": "smith", "neutral_citation": "[2025] EWCA Civ 2", "party_id": 5},
+                  {"party_name": "jones", "neutral_citation": "[2025] EWCA Civ 2", "party_id": 6}]
+    counsel_rows = [{"counsel_name": "jane doe kc", "counsel_id": 7},
+                    {"counsel_name": "john roe", "counsel_id": 8}]
+
+    with mock.patch("load.execute_values",
+               side_effect=[judgment_rows, party_rows, counsel_rows, None]) as mock_execute_values:
+        counts = seed_judgment_data(mock_conn, [make_case("[2025] EWCA Civ 1"),
+                                                make_case("[2025] EWCA Civ 2")], base_maps)
+
+    assert "on conflict (neutral_citation) do update" in \
+        mock_execute_values.call_args_list[0].args[1]
+    assert counts == {"inserted": 0, "updated": 1, "unchanged": 1}
+    deleted_citations = [c.args[1] for c in mock_cursor.execute.call_args_list]
+    assert deleted_citations == [(["[2025] EWCA Civ 1", "[2025] EWCA Civ 2"],)] * 2
+    mock_conn.commit.assert_called_once()
+
+
+def test_seed_judgment_data_rolls_back_on_error(base_maps):
+    """Test that seed_judgment_data rolls back the whole batch when an insert fails."""
+    mock_conn = MagicMock()
+
+    with mock.patch("load.execute_values",
+               side_effect=psycopg2.IntegrityError("duplicate key")):
+        with pytest.raises(psycopg2.IntegrityError):
+            seed_judgment_data(mock_conn, [make_case("[2025] EWCA Civ 1")], base_maps)
+
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_not_called()
+
+
+def test_resolve_base_maps_only_resolves_batch_names():
+    """Test that resolve_base_maps upserts the batch's names and commits once."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = [{"judgment_type": "civil", "judgment_type_id": 1}]
+    upserted = [[{"role_id": 1, "role_name": "appellant"},
+                 {"role_id": 2, "role_name": "respondent"}],
+                [{"court_id": 1, "court_name": "court of appeal"}],
+                [{"chamber_id": 1, "chamber_name": "brick court"}]]
+
+    with mock.patch("load.execute_values", side_effect=upserted) as mock_execute_values:
+        result = resolve_base_maps(mock_conn, [make_case("[2025] EWCA Civ 1")])
+
+    assert [c.args[2] for c in mock_execute_values.call_args_list] == [
+        [("appellant",), ("respondent",)], [("court of appeal",)], [("brick court",)]]
+    assert result == {
+        "role_map": {"appellant": 1, "respondent": 2},
+        "chamber_map": {"brick court": 1},
+        "court_map": {"court of appeal": 1},
+        "judgment_type_map": {"civil": 1}
+    }
+    mock_cursor.execute.assert_called_once()
+    mock_conn.commit.assert_called_once()
+
+def test_build_staging_rows_flattens_names():
+    """Test that build_staging_rows produces lower-cased name rows for each staging table."""
+    rows = build_staging_rows([make_case("[2025] EWCA Civ 1")])
+
+    assert rows["staging_judgment"] == [("[2025] EWCA Civ 1", "court of appeal", "2025-02-15",
+                                         "A summary.", "appellant", "civil",
+                                         "Lord Justice Smith", None, None)]
+    assert ("[2025] EWCA Civ 1", "jones", "respondent") in rows["staging_party"]
+    assert ("[2025] EWCA Civ 1", "smith", "jane doe kc", "brick court") \
+        in rows["staging_counsel"]
+    assert len(rows["staging_counsel"]) == 3
+
+
+def test_copy_rows_to_staging_streams_csv():
+    """Test that copy_rows_to_staging sends the rows as CSV through COPY FROM STDIN."""
+    mock_cursor = MagicMock()
+
+    copy_rows_to_staging(mock_cursor, "staging_party",
+                         [("[2025] EWCA Civ 1", "smith, john", "appellant")])
+
+    query, buffer = mock_cursor.copy_expert.call_args.args
+    assert query == "copy staging_party from stdin with (format csv, null '\\N')"
+    assert buffer.read() == '[2025] EWCA Civ 1,"smith, john",appellant\r\n'
+
+
+def test_copy_rows_to_staging_keeps_empty_judge_distinct_from_null():
+    """Test that an empty judge name reaches COPY as an empty string, not as NULL."""
+    case = make_case("[2025] EWCA Civ 1") | {"judge": ""}
+    mock_cursor = MagicMock()
+    rows = build_staging_rows([case])["staging_judgment"]
+
+    copy_rows_to_staging(mock_cursor, "staging_judgment", rows)
+
+    query, buffer = mock_cursor.copy_expert.call_args.args
+    assert "null '\\N'" in query
+    fields = next(csv.reader(buffer))
+    assert fields[6] == ""
+    assert fields[7:] == ["\\N", "\\N"]
+
+
+def test_bulk_load_judgment_data_single_commit():
+    """Test that bulk_load_judgment_data copies each staging table and commits once."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = {"total": 3, "inserted": 1, "updated": 1}
+
+    counts = bulk_load_judgment_data(mock_conn, [make_case("[2025] EWCA Civ 1")])
+
+    assert mock_cursor.copy_expert.call_count == 3
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 1}
+    mock_conn.commit.assert_called_once()
+
+
+def test_bulk_load_judgment_data_stages_in_transaction_temp_tables():
+    """Test that staging tables are private to the load and dropped on commit, and that
+    only resolved judgments have their parties replaced."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = {"total": 1, "inserted": 1, "updated": 0}
+
+    bulk_load_judgment_data(mock_conn, [make_case("[2025] EWCA Civ 1")])
+
+    queries = [call.args[0] for call in mock_cursor.execute.call_args_list]
+    creates = [query for query in queries if query.startswith("create")]
+    assert creates and all(query.startswith("create temp table")
+                           and "on commit drop" in query for query in creates)
+    deletes = [query for query in queries if query.startswith("delete")]
+    assert deletes and all("resolved_judgment" in query and "staging_judgment" not in query
+                           for query in deletes)
+
+
+def test_bulk_load_judgment_data_rolls_back_on_error():
+    """Test that bulk_load_judgment_data rolls back when the merge fails."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.copy_expert.side_effect = psycopg2.DataError("invalid input")
+
+    with pytest.raises(psycopg2.DataError):
+        bulk_load_judgment_data(mock_conn, [make_case("[2025] EWCA Civ 1")])
+
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_not_called()
+
+
+@pytest.fixture
+def moto_s3():
+    """S3 client backed by moto with an empty test bucket."""
+    with mock_aws():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="test-bucket")
+        yield s3_client
+
+
+@pytest.mark.asyncio
+async def test_upload_file_to_s3_stores_html_gzipped(moto_s3, tmp_path):
+    """Test that html is stored gzip-compressed with its Content-Encoding set."""
+    html_path = tmp_path / "judgment.html"
+    html_path.write_text("<judgmentBody>text</judgmentBody>", encoding="utf-8")
+
+    uploaded = await upload_file_to_s3(moto_s3, str(html_path), "test-bucket", "judgment.html")
+
+    obj = moto_s3.get_object(Bucket="test-bucket", Key="judgment.html")
+    assert uploaded
+    assert obj["ContentEncoding"] == "gzip"
+    assert gzip.decompress(obj["Body"].read()) == b"<judgmentBody>text</judgmentBody>"
+
+
+@pytest.mark.asyncio
+async def test_upload_file_to_s3_skips_unchanged(moto_s3, tmp_path):
+    """Test that a file whose MD5 matches the stored ETag is not uploaded again."""
+    html_path = tmp_path / "judgment.html"
+    html_path.write_text("<judgmentBody>text</judgmentBody>", encoding="utf-8")
+    await upload_file_to_s3(moto_s3, str(html_path), "test-bucket", "judgment.html")
+
+    with mock.patch.object(moto_s3, "put_object", wraps=moto_s3.put_object) as spy_put:
+        unchanged = await upload_file_to_s3(moto_s3, str(html_path),
+                                            "test-bucket", "judgment.html")
+        html_path.write_text("<judgmentBody>new text</judgmentBody>", encoding="utf-8")
+        changed = await upload_file_to_s3(moto_s3, str(html_path),
+                                          "test-bucket", "judgment.html")
+
+    assert not unchanged
+    assert changed
+    spy_put.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_upload_file_to_s3_skips_from_manifest(moto_s3, tmp_path):
+    """Test that a key recorded in the manifest with the same MD5 needs no HEAD request."""
+    html_path = tmp_path / "judgment.html"
+    html_path.write_text("<judgmentBody>text</judgmentBody>", encoding="utf-8")
+    manifest = {}
+    await upload_file_to_s3(moto_s3, str(html_path), "test-bucket", "judgment.html",
+                            manifest=manifest)
+
+    with mock.patch.object(moto_s3, "head_object") as mock_head:
+        uploaded = await upload_file_to_s3(moto_s3, str(html_path), "test-bucket",
+                                           "judgment.html", manifest=manifest)
+
+    assert not uploaded
+    assert "judgment.html" in manifest
+    mock_head.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_multiple_files_to_s3_bounded_concurrency(tmp_path):
+    """Test that no more uploads run at once than the client has pool connections."""
+    s3_client = MagicMock()
+    s3_client.meta.config.max_pool_connections = 3
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def slow_put_object(**kwargs):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.01)
+        with lock:
+            running["now"] -= 1
+
+    s3_client.put_object.side_effect = slow_put_object
+    for i in range(12):
+        (tmp_path / f"judgment_{i}.html").write_text("text", encoding="utf-8")
+
+    await upload_multiple_files_to_s3(s3_client, str(tmp_path), "test-bucket")
+
+    assert s3_client.put_object.call_count == 12
+    assert running["max"] <= 3
+
+
+@pytest.mark.asyncio
+async def test_upload_bytes_to_s3_stores_html_gzipped(moto_s3):
+    """Test that html held in memory is uploaded gzip-compressed."""
+    uploaded = await upload_bytes_to_s3(moto_s3, b"<judgmentBody>text</judgmentBody>",
+                                        "test-bucket", "judgment.html")
+
+    obj = moto_s3.get_object(Bucket="test-bucket", Key="judgment.html")
+    assert uploaded
+    assert gzip.decompress(obj["Body"].read()) == b"<judgmentBody>text</judgmentBody>"
+
+@pytest.mark.asyncio
+async def test_archive_xml_to_s3_partitions_by_date_and_court(moto_s3):
+    """Test that raw xml is stored gzip-compressed under a date and court partition."""
+    judgment = {"neutral_citation": "[2025] EWCA Civ 1", "judgment_date": "2025-02-15",
+                "court_name": "Court of Appeal (Civil Division)"}
+
+    entry = await archive_xml_to_s3(moto_s3, b"<judgment/>", "test-bucket",
+                                    judgment, "judgment.xml")
+
+    assert entry["key"] == ("raw-xml/date=2025-02-15/court=court-of-appeal-civil-division"
+                            "/judgment.xml.gz")
+    obj = moto_s3.get_object(Bucket="test-bucket", Key=entry["key"])
+    body = obj["Body"].read()
+    assert entry["size"] == len(body)
+    assert gzip.decompress(body) == b"<judgment/>"
+
+
+@pytest.mark.asyncio
+async def test_archive_xml_to_s3_returns_none_when_upload_fails(moto_s3):
+    """Test that no manifest entry is returned for xml that was not stored."""
+    judgment = {"neutral_citation": "[2025] EWCA Civ 1", "judgment_date": "2025-02-15",
+                "court_name": "Court of Appeal (Civil Division)"}
+
+    entry = await archive_xml_to_s3(moto_s3, b"<judgment/>", "missing-bucket",
+                                    judgment, "judgment.xml")
+
+    assert entry is None
+
+
+def test_save_archive_manifests_merges_existing_entries(moto_s3):
+    """Test that a day's manifest keeps earlier entries and replaces rerun ones."""
+    first = {"judgment_date": "2025-02-15", "key": "a", "size": 1}
+    second = {"judgment_date": "2025-02-15", "key": "b", "size": 2}
+    save_archive_manifests(moto_s3, "test-bucket", [first])
+    save_archive_manifests(moto_s3, "test-bucket", [second, first | {"size": 3}])
+
+    obj = moto_s3.get_object(Bucket="test-bucket",
+                             Key="raw-xml/date=2025-02-15/manifest.json")
+    assert json.loads(obj["Body"].read()) == [first | {"size": 3}, second]
+
+def test_extraction_outputs_round_trip_locally(tmp_path):
+    """Test that extraction outputs are partitioned by date and the latest run wins."""
+    first = {"neutral_citation": "[2025] EWCA Civ 1", "judgment_date": "2025-02-15",
+             "judge": "Old", "prompt_version": "1"}
+    other = {"neutral_citation": "[2025] EWCA Civ 2", "judgment_date": "2025-02-16"}
+    save_extraction_outputs([first, other], str(tmp_path), run_id="20250101T000000")
+    save_extraction_outputs([first | {"judge": "New"}], str(tmp_path), run_id="20250102T000000")
+
+    partitions = list_extraction_partitions(str(tmp_path))
+
+    assert list(partitions) == ["2025-02-15", "2025-02-16"]
+    assert read_extraction_partition(partitions["2025-02-15"]) == [first | {"judge": "New"}]
+
+
+def test_extraction_outputs_round_trip_in_s3(moto_s3):
+    """Test that extraction outputs can be written to and read back from S3."""
+    record = {"neutral_citation": "[2025] EWCA Civ 1", "judgment_date": "2025-02-15"}
+
+    paths = save_extraction_outputs([record], "s3://test-bucket/extractions", moto_s3,
+                                    run_id="20250101T000000")
+    partitions = list_extraction_partitions("s3://test-bucket/extractions", moto_s3)
+
+    assert paths == ["s3://test-bucket/extractions/date=2025-02-15/part-20250101T000000.jsonl"]
+    assert read_extraction_partition(partitions["2025-02-15"], moto_s3) == [record]
+
+def test_refresh_dashboard_views_refreshes_concurrently():
+    """Test that every dashboard view is refreshed concurrently and committed."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+    refresh_dashboard_views(mock_conn)
+
+    queries = [call.args[0] for call in mock_cursor.execute.call_args_list]
+    assert queries[0] == "refresh materialized view concurrently judgments_by_court"
+    assert len(queries) == 7
+    assert mock_conn.commit.call_count == 7
+
+
+def test_refresh_dashboard_views_continues_after_failure():
+    """Test that a failed refresh is rolled back and the remaining views still refresh."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.execute.side_effect = [psycopg2.Error("locked")] + [None] * 6
+
+    refresh_dashboard_views(mock_conn)
+
+    mock_conn.rollback.assert_called_once()
+    assert mock_conn.commit.call_count == 6
+
+
+def test_bump_data_version_commits_new_version():
+    """Test that the data version is incremented and committed."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = {"version": 7}
+
+    assert bump_data_version(mock_conn) == 7
+    assert "version = version + 1" in mock_cursor.execute.call_args[0][0]
+    mock_conn.commit.assert_called_once()
+
+
+def test_refresh_home_snapshot_upserts_one_document():
+    """Test that the home page snapshot is rebuilt in one statement and committed."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+    refresh_home_snapshot(mock_conn)
+
+    query = mock_cursor.execute.call_args[0][0]
+    assert mock_cursor.execute.call_count == 1
+    assert "INSERT INTO home_snapshot" in query and "ON CONFLICT" in query
+    mock_conn.commit.assert_called_once()
+
+
+def test_select_judgment_of_the_day_is_seeded_by_date():
+    """Test that the featured judgment is picked by hashing citations with the date."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+    select_judgment_of_the_day(mock_conn, date(2025, 2, 15), 500, "Supreme Court")
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "RANDOM()" not in query
+    assert "md5(j.neutral_citation || %(day)s::text)" in query
+    assert "ON CONFLICT (featured_date) DO NOTHING" in query
+    assert params == {"day": date(2025, 2, 15), "min_summary_length": 500,
+                      "court_name": "supreme court"}
+    mock_conn.commit.assert_called_once()
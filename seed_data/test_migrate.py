@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+import psycopg2
+import pytest
+from migrate import list_migrations, apply_migrations, RESET_QUERY
+
+
+def make_migrations(tmp_path, names: list[str]) -> str:
+    """Writes empty migration files and returns their folder."""
+    for name in names:
+        (tmp_path / name).write_text(f"-- {name}")
+    return str(tmp_path)
+
+
+def test_list_migrations_in_version_order(tmp_path):
+    """Test that migrations are ordered by version and other files are ignored."""
+    folder = make_migrations(tmp_path, ["0010_later.sql", "0002_second.sql", "notes.txt"])
+
+    assert [(v, n) for v, n, _ in list_migrations(folder)] == [(2, "second"), (10, "later")]
+
+
+def test_list_migrations_rejects_duplicate_versions(tmp_path):
+    """Test that two migrations with the same version are refused."""
+    folder = make_migrations(tmp_path, ["0001_a.sql", "0001_b.sql"])
+
+    with pytest.raises(ValueError):
+        list_migrations(folder)
+
+
+def test_apply_migrations_skips_applied_versions(tmp_path):
+    """Test that only pending migrations are run and recorded, each with its own commit."""
+    folder = make_migrations(tmp_path, ["0001_initial.sql", "0002_indexes.sql"])
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = [(1,)]
+
+    applied = apply_migrations(mock_conn, folder)
+
+    assert applied == [2]
+    executed = [call.args for call in mock_cursor.execute.call_args_list]
+    assert ("-- 0002_indexes.sql",) in executed
+    assert ("-- 0001_initial.sql",) not in executed
+    assert executed[-1] == ("select pg_advisory_unlock(%s)", (152025,))
+
+
+def test_apply_migrations_rolls_back_failed_migration(tmp_path):
+    """Test that a failing migration is rolled back, not recorded, and the lock released."""
+    folder = make_migrations(tmp_path, ["0001_broken.sql"])
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = []
+
+    def execute(query, *args):
+        if query == "-- 0001_broken.sql":
+            raise psycopg2.Error("syntax error")
+    mock_cursor.execute.side_effect = execute
+
+    with pytest.raises(psycopg2.Error):
+        apply_migrations(mock_conn, folder)
+
+    mock_conn.rollback.assert_called_once()
+    assert mock_cursor.execute.call_args.args == ("select pg_advisory_unlock(%s)", (152025,))
+
+
+def test_reset_keeps_data_version():
+    """Test that a reset leaves the data version counter to keep rising."""
+    assert "data_version" not in RESET_QUERY
@@ -0,0 +1,31 @@
+from unittest import mock
+from rebuild import rebuild_database
+
+
+@mock.patch("rebuild.bump_data_version")
+@mock.patch("rebuild.refresh_home_snapshot")
+@mock.patch("rebuild.refresh_dashboard_views")
+@mock.patch("rebuild.reset_schema")
+@mock.patch("rebuild.bulk_load_judgment_data")
+def test_rebuild_database_loads_each_partition(mock_bulk_load, mock_reset_schema,
+                                               mock_refresh, mock_snapshot, mock_bump,
+                                               tmp_path):
+    """Test that the schema is reset once and every judgment date is bulk loaded."""
+    for judgment_date in ["2025-02-15", "2025-02-16"]:
+        partition = tmp_path / f"date={judgment_date}"
+        partition.mkdir()
+        (partition / "part-1.jsonl").write_text(
+            f'{{"neutral_citation": "{judgment_date}", "judgment_date": "{judgment_date}"}}\n')
+    mock_bulk_load.return_value = {"inserted": 1, "updated": 0, "unchanged": 0}
+    conn = mock.MagicMock()
+
+    totals = rebuild_database(conn, str(tmp_path))
+
+    mock_reset_schema.assert_called_once_with(conn)
+    assert mock_bulk_load.call_count == 2
+    assert mock_bulk_load.call_args[0][1] == [{"neutral_citation": "2025-02-16",
+                                               "judgment_date": "2025-02-16"}]
+    assert totals == {"inserted": 2, "updated": 0, "unchanged": 0}
+    mock_refresh.assert_called_once_with(conn)
+    mock_snapshot.assert_called_once_with(conn)
+    mock_bump.assert_called_once_with(conn)
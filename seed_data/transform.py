@@ -5,7 +5,10 @@ import logging
 from openai import OpenAI
 
 from parse_xml import get_metadata, convert_judgment
-from prompt_engineering import get_xml_data, get_case_summary
+from prompt_engineering import get_xml_data, get_case_summary, GPT_MODEL, PROMPT_VERSION
+
+EXTRACTION_VERSION = {"extraction_model": GPT_MODEL, "prompt_version": PROMPT_VERSION}
+
 
 def process_all_judgments(folder_path: str, html_folder_path: str, api_client: OpenAI) -> list[dict]:
     """Process judgment data, extracting relevant information and returning a list of dicts."""
@@ -17,8 +20,8 @@ def process_all_judgments(folder_path: str, html_folder_path: str, api_client: O
         convert_judgment(html_folder_path, file_path, judgment)
         judgment_xml = get_xml_data(file_path)
         metadata = get_metadata(file_path)
-        api_data = get_case_summary("gpt-4o-mini", api_client, judgment_xml)
-        combined_judgment_data = metadata | api_data
+        api_data = get_case_summary(GPT_MODEL, api_client, judgment_xml)
+        combined_judgment_data = metadata | api_data | EXTRACTION_VERSION
         judgment_data.append(combined_judgment_data)
     logging.info("Successfully processed judgments.")
     return judgment_data
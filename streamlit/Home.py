@@ -1,15 +1,15 @@
 """The main page of the dashboard."""
 
+from os import environ as ENV
 from dotenv import load_dotenv
 import streamlit as st
 from components import dashboard_title, homepage_text
-from data_source import (get_most_recent_judgments,
-                         get_db_connection,
-                         display_as_table, get_most_recent_judgment, display_judgment,
-                         get_random_judgment_with_summary_and_date,
-                         cases_over_time)
+from data_source import (get_db_connection, fetch_home_snapshot,
+                         display_as_table, display_judgment, display_cases_over_time)
 
-from dashboard_functions import cases_by_court, cases_by_judgment_type, adjust_sidebar_width
+from dashboard_functions import (display_cases_by_court, display_cases_by_judgment_type,
+                                 adjust_sidebar_width)
+from query_cache import display_cache_stats
 
 
 def main():
@@ -21,28 +21,28 @@ def main():
     load_dotenv()
     dashboard_title()
     homepage_text()
-    conn = get_db_connection()
+    with get_db_connection() as conn:
+        snapshot = fetch_home_snapshot(conn)
     col1, col2 = st.columns(2)
     with col1:
         st.html("<h2>Most Recent Judgment")
-        most_recent_judgement = get_most_recent_judgment(conn)
-        display_judgment(most_recent_judgement)
+        display_judgment(snapshot["most_recent_judgment"])
 
     with col2:
         st.html("<h2>🌟Judgment of the Day")
-        random_judgment = get_random_judgment_with_summary_and_date(conn)
-        display_judgment(random_judgment)
+        display_judgment(snapshot["judgment_of_the_day"])
 
 
     col3,col4 = st.columns(2)
     with col3:
-        cases_over_time(conn)
+        display_cases_over_time(snapshot["cases_over_time"])
     with col4:
-        cases_by_judgment_type(conn)
-    cases_by_court(conn)
+        display_cases_by_judgment_type(snapshot["cases_by_type"])
+    display_cases_by_court(snapshot["cases_by_court"])
 
-    results = get_most_recent_judgments(conn)
-    display_as_table(results)
+    display_as_table(snapshot["recent_judgments"])
+    if ENV.get("SHOW_CACHE_STATS") == "true":
+        display_cache_stats()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,16 @@
+"""Shared fixtures for the dashboard tests."""
+from unittest.mock import patch
+import pytest
+import streamlit as st
+from html_cache import get_html_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_query_cache():
+    """Starts every test with empty query and html caches at a fixed data version."""
+    st.cache_data.clear()
+    get_html_cache.clear()
+    with patch("query_cache.get_data_version", return_value=1):
+        yield
+    st.cache_data.clear()
+    get_html_cache.clear()
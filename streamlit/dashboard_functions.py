@@ -3,22 +3,11 @@ import pandas as pd
 import altair as alt
 from psycopg2 import connect as connection
 import streamlit as st
+from query_cache import versioned_cache
 
 
-def cases_by_court(conn: connection) -> None:
-    """Returns cases by court chart diagram."""
-    query = """SELECT court_name as "Court", COUNT(*) AS "Case Count"
-    FROM judgment
-    JOIN court ON judgment.court_id = court.court_id
-    GROUP BY "Court"
-    ORDER BY "Case Count" DESC
-    LIMIT 10;
-    """
-
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
-
+def display_cases_by_court(result: list) -> None:
+    """Displays the number of judgments of each court in a bar chart."""
     df_court_cases = pd.DataFrame(result, columns=["Court", "Case Count"])
     df_court_cases["Court"] = df_court_cases["Court"].str.title()
 
@@ -35,18 +24,8 @@ def cases_by_court(conn: connection) -> None:
     st.altair_chart(chart_court_cases, use_container_width=True)
 
 
-def cases_by_judgment_type(conn: connection) -> None:
-    """Displays cases by judgment type in a pie chart on streamlit."""
-    query = """SELECT judgment_type as "Judgment Type", COUNT(*) AS "Case Count"
-    FROM judgment
-    JOIN judgment_type
-    ON judgment.judgment_type_id = judgment_type.judgment_type_id
-    GROUP BY judgment_type"""
-
-
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
+def display_cases_by_judgment_type(result: list) -> None:
+    """Displays the number of judgments of each type in a pie chart."""
 
 
     df_judgment_type = pd.DataFrame(
@@ -64,30 +43,45 @@ def cases_by_judgment_type(conn: connection) -> None:
 
 
 
-def display_judgments_for_court(conn: connection) -> None:
-    """Displays the judgments for a given court"""
-    query = """select judgment_date,judgment_summary,neutral_citation,
-                    judge_name,court_name,judgment_type,
-                    role_name as in_favour_of from judgment 
-                    join court using (court_id)
-                    join judgment_type
-                    using (judgment_type_id)
-                    join role r on judgment.in_favour_of = r.role_id """
-
-    with conn.cursor() as cursor:
+@versioned_cache
+def fetch_courts(_conn: connection) -> list:
+    """Returns every court with judgments and the dates of its first and last judgment,
+    read from the facet snapshot the pipeline refreshes."""
+    query = """SELECT facet_value AS court_name, min_date, max_date
+               FROM judgment_filter_facets
+               WHERE facet = 'court' AND judgment_count > 0
+               ORDER BY facet_value"""
+    with _conn.cursor() as cursor:
         cursor.execute(query)
-        result = cursor.fetchall()
-    df = pd.DataFrame(result)
+        return cursor.fetchall()
 
 
+@versioned_cache
+def fetch_court_rulings(_conn: connection, court_name: str, start_date, end_date) -> list:
+    """Returns the number of judgments in favour of each role for one court between two dates."""
+    query = """SELECT r.role_name AS "Ruling", COUNT(*) AS "Count"
+               FROM judgment j
+               JOIN court c ON j.court_id = c.court_id
+               JOIN role r ON j.in_favour_of = r.role_id
+               WHERE c.court_name = %s AND j.judgment_date BETWEEN %s AND %s
+               GROUP BY r.role_name"""
+    with _conn.cursor() as cursor:
+        cursor.execute(query, (court_name, start_date, end_date))
+        return cursor.fetchall()
 
-    if not df.empty:
-        df['court_name'] = df['court_name'].str.title()
-        df['judgment_date'] = pd.to_datetime(df['judgment_date'])
-        min_date = df['judgment_date'].min().date()
-        max_date = df['judgment_date'].max().date()
+
+def display_judgments_for_court(conn: connection) -> None:
+    """Displays the rulings of a given court"""
+    courts = fetch_courts(conn)
+
+
+
+    if courts:
+        court_names = {court["court_name"].title(): court["court_name"] for court in courts}
+        min_date = min(court["min_date"] for court in courts)
+        max_date = max(court["max_date"] for court in courts)
         selected_court = st.selectbox(
-            "Select a Court", df["court_name"].unique())
+            "Select a Court", list(court_names))
         date_range = st.date_input("Select Date Range",
                         value=[min_date, max_date],
                         min_value=min_date,
@@ -97,43 +91,43 @@ def display_judgments_for_court(conn: connection) -> None:
 
         if len(date_range) == 2:
             start_date, end_date = date_range
-            start_date = pd.to_datetime(start_date)  # Convert to datetime if it's a date or string
-            end_date = pd.to_datetime(end_date)
-            df = df[(df['judgment_date'] >= start_date) & (df['judgment_date'] <= end_date)]
         else:
-            start_date, end_date = None, None
-        df = df[df["court_name"] == selected_court.title()]
+            start_date, end_date = min_date, max_date
+        result = fetch_court_rulings(conn, court_names[selected_court], start_date, end_date)
 
 
-        df['in_favour_of'] = df['in_favour_of'].str.title()
-        ruling_df = df.groupby('in_favour_of').size().reset_index()
-        ruling_df.columns = ['Ruling','Count']
+        ruling_df = pd.DataFrame(result, columns=['Ruling', 'Count'])
+        ruling_df['Ruling'] = ruling_df['Ruling'].str.title()
 
 
         chart_ruling_type = alt.Chart(ruling_df).mark_arc().encode(
             theta=alt.Theta('Count', type='quantitative'),
             color=alt.Color('Ruling',type='nominal')
         ).properties(title="Number of Rulings by Court")
-        st.html(f'<p>Cases found: {df.shape[0]}')
+        st.html(f'<p>Cases found: {ruling_df["Count"].sum()}')
         st.altair_chart(chart_ruling_type, use_container_width=True)
 
 
     else:
         st.html("<p>No results found for your search.")
 
+@versioned_cache
+def fetch_judgments_by_judge(_conn: connection) -> list:
+    """Returns the number of judgments by each judge, most first."""
+    query = """SELECT judge_name AS "Judge", total_judgments AS "Total Judgments"
+               FROM judgments_by_judge
+               ORDER BY total_judgments DESC;
+            """
+    with _conn.cursor() as cursor:
+        cursor.execute(query)
+        return cursor.fetchall()
+
+
 def display_judgments_by_judge(conn):
     """Displays a dynamic bar chart of judgments by judge with user-selected limit."""
 
-    # Query to get the count of judgments per judge
-    query = """SELECT judge_name AS "Judge", COUNT(*) AS "Total Judgments"
-               FROM judgment
-               GROUP BY judge_name
-               ORDER BY COUNT(*) DESC;
-            """
-
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
+    # Get the count of judgments per judge
+    result = fetch_judgments_by_judge(conn)
 
     # Convert query result to DataFrame
     df = pd.DataFrame(result, columns=["Judge", "Total Judgments"])
@@ -171,21 +165,21 @@ def display_judgments_by_judge(conn):
     st.altair_chart(chart, use_container_width=True)
 
 
-def display_number_of_judgments_by_chamber(conn):
-    """Displays the a graph showing number of judgments by the chamber"""
-    query = """SELECT chamber.chamber_name AS "Chamber", COUNT(*) AS "Total Judgments"
-               FROM chamber
-               JOIN counsel ON chamber.chamber_id = counsel.chamber_id
-               JOIN counsel_assignment ON counsel.counsel_id = counsel_assignment.counsel_id
-               JOIN party ON counsel_assignment.party_id = party.party_id
-               JOIN judgment ON party.neutral_citation = judgment.neutral_citation
-               GROUP BY chamber.chamber_name
-               ORDER BY "Total Judgments" DESC;
+@versioned_cache
+def fetch_judgments_by_chamber(_conn: connection) -> list:
+    """Returns the number of judgments by each chamber, most first."""
+    query = """SELECT chamber_name AS "Chamber", total_judgments AS "Total Judgments"
+               FROM judgments_by_chamber
+               ORDER BY total_judgments DESC;
             """
-
-    with conn.cursor() as cursor:
+    with _conn.cursor() as cursor:
         cursor.execute(query)
-        result = cursor.fetchall()
+        return cursor.fetchall()
+
+
+def display_number_of_judgments_by_chamber(conn):
+    """Displays the a graph showing number of judgments by the chamber"""
+    result = fetch_judgments_by_chamber(conn)
 
     # Convert result into DataFrame
     df_chamber_judgments = pd.DataFrame(
@@ -253,24 +247,3 @@ def adjust_sidebar_width(width=200):
         </div>
         """
     )
-
-def get_judgment_data(chamber_id, conn):
-    query = """
-        SELECT 
-            COUNT(j.neutral_citation) AS total_judgments,
-            SUM(CASE WHEN jt.judgment_type = 'criminal' THEN 1 ELSE 0 END) AS criminal_judgments,
-            SUM(CASE WHEN jt.judgment_type = 'civil' THEN 1 ELSE 0 END) AS civil_judgments
-        FROM chamber c
-        LEFT JOIN counsel co ON c.chamber_id = co.chamber_id
-        LEFT JOIN counsel_assignment ca ON co.counsel_id = ca.counsel_id
-        LEFT JOIN party p ON ca.party_id = p.party_id
-        LEFT JOIN judgment j ON p.neutral_citation = j.neutral_citation
-        LEFT JOIN judgment_type jt ON j.judgment_type_id = jt.judgment_type_id
-        WHERE c.chamber_id = %s
-    """
-    with conn.cursor() as cursor:
-        cursor.execute(query, (chamber_id,))
-        result = cursor.fetchone()
-
-    return pd.DataFrame([result]) if result else pd.DataFrame(columns=["total_judgments", "criminal_judgments", "civil_judgments"]) 
-
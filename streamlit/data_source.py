@@ -1,7 +1,11 @@
 """This script gathers the data sourcing functions."""
+import html
+import threading
+from contextlib import contextmanager
+from typing import Iterator
 from os import environ as ENV
-from rapidfuzz import fuzz
-from psycopg2 import connect
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import RealDictCursor
 from psycopg2.extensions import connection
 import pandas as pd
@@ -9,10 +13,22 @@ import altair as alt
 import streamlit as st
 from boto3 import client
 from botocore.client import BaseClient
+from query_cache import versioned_cache
+from html_cache import get_html_cache, get_html, prefetch_html
+from judgment_queries import build_judgments_query, build_count_query
+
+PAGE_SIZE = 25
+EMPTY_HOME_SNAPSHOT = {"most_recent_judgment": {}, "judgment_of_the_day": {},
+                       "cases_over_time": [], "cases_by_type": [], "cases_by_court": [],
+                       "recent_judgments": []}
 
 @st.cache_resource
-def get_db_connection() -> connection:
-    """Returns a live connection to PostgreSQL database with RealDictCursor as default."""
+def get_db_pool() -> dict:
+    """Creates a thread-safe PostgreSQL connection pool shared by every session, sized
+    by DB_POOL_MIN and DB_POOL_MAX, whose connections cancel statements running longer
+    than DB_STATEMENT_TIMEOUT milliseconds, with a semaphore so sessions wait for a
+    free connection instead of erroring.
+    Returns a dictionary holding the pool and semaphore."""
     config = {
         "dbname": ENV.get("DB_NAME"),
         "user": ENV.get("DB_USER"),
@@ -20,8 +36,59 @@ def get_db_connection() -> connection:
         "host": ENV.get("DB_HOST"),
         "port": ENV.get("DB_PORT"),
     }
+    max_connections = int(ENV.get("DB_POOL_MAX", "10"))
+    pool = ThreadedConnectionPool(
+        int(ENV.get("DB_POOL_MIN", "1")), max_connections, cursor_factory=RealDictCursor,
+        options=f"-c statement_timeout={ENV.get('DB_STATEMENT_TIMEOUT', '10000')}", **config)
+    return {"pool": pool, "semaphore": threading.BoundedSemaphore(max_connections)}
+
 
-    return connect(cursor_factory=RealDictCursor, **config)
+def is_connection_healthy(conn: connection) -> bool:
+    """Returns whether a pooled connection is still open and answering queries."""
+    if conn.closed:
+        return False
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def prepare_connection(conn: connection) -> bool:
+    """Switches a pooled connection to autocommit before checking it, so the health check
+    never leaves a transaction open, and returns whether the connection is usable."""
+    if conn.closed:
+        return False
+    try:
+        conn.autocommit = True
+    except psycopg2.Error:
+        return False
+    return is_connection_healthy(conn)
+
+
+@contextmanager
+def get_db_connection() -> Iterator[connection]:
+    """Lends a live connection from the pool for the duration of a with block, replacing
+    it first if it has dropped. A connection that fails inside the block is closed
+    rather than returned, so the pool reconnects on the next checkout."""
+    db_pool = get_db_pool()
+    with db_pool["semaphore"]:
+        conn = db_pool["pool"].getconn()
+        discard = False
+        try:
+            if not prepare_connection(conn):
+                db_pool["pool"].putconn(conn, close=True)
+                conn = None
+                conn = db_pool["pool"].getconn()
+                conn.autocommit = True
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            if conn is not None:
+                db_pool["pool"].putconn(conn, close=discard or bool(conn.closed))
 
 @st.cache_resource
 def create_client() -> BaseClient:
@@ -30,23 +97,16 @@ def create_client() -> BaseClient:
                            aws_secret_access_key=ENV['SECRET_KEY'])
 
 
-@st.cache_resource
-def get_most_recent_judgments(_conn: connection) -> list[tuple]:
-    """Returns the most recent cases from the database, returning them as a list of tuples."""
-
-    query = """
-    SELECT 
-    j.neutral_citation AS judgment, 
-    c.court_name AS court
-    FROM judgment j
-    JOIN court c ON j.court_id = c.court_id
-    WHERE j.judgment_date = (SELECT MAX(judgment_date) FROM judgment)
-    ORDER BY j.judgment_date DESC;
-    """
-
+@versioned_cache
+def fetch_home_snapshot(_conn: connection) -> dict:
+    """Returns the home page document the pipeline rebuilds after each load, holding
+    every home page section, or empty sections if it has not been built yet."""
     with _conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchall()
+        cur.execute("SELECT snapshot FROM home_snapshot")
+        result = cur.fetchone()
+    snapshot = result["snapshot"] if result else {}
+    return {section: snapshot.get(section) or default
+            for section, default in EMPTY_HOME_SNAPSHOT.items()}
 
 
 def display_as_table(results: list) -> None:
@@ -86,26 +146,6 @@ def display_as_table_search(results: list) -> None:
                         
     st.dataframe(df, hide_index=True, use_container_width=True, height=200)
 
-@st.cache_resource
-def get_most_recent_judgment(_conn: connection) -> dict:
-    """Returns the latest judgment with details."""    
-    query = """
-    SELECT
-        j.neutral_citation, 
-        j.court_id, 
-        j.judgment_date, 
-        j.judgment_summary
-    FROM 
-        judgment j
-    ORDER BY 
-        j.judgment_date DESC
-    LIMIT 1;
-    """
-    with _conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchone()  # Returns the latest judgment record
-
-
 
 def display_judgment(judgment_data:dict) -> None:
     """Displays data onto streamlit from passed dictionary."""
@@ -123,17 +163,10 @@ def display_judgment(judgment_data:dict) -> None:
     else:
         st.html("<p>No judgment found.")
 
-def cases_over_time(conn: connection):
-    query = """SELECT judgment_date, judgment_type, COUNT(*) AS judgment_count
-                FROM judgment
-                JOIN judgment_type USING (judgment_type_id)
-                GROUP BY judgment_date, judgment_type
-                ORDER BY judgment_date
-                """
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        df = pd.DataFrame(cursor.fetchall())
-        df["judgment_type"] = df["judgment_type"].str.title()
+def display_cases_over_time(rows: list) -> None:
+    """Displays the number of judgments of each type over time as a line chart."""
+    df = pd.DataFrame(rows, columns=["judgment_date", "judgment_type", "judgment_count"])
+    df["judgment_type"] = df["judgment_type"].str.title()
 
     chart = alt.Chart(df).mark_line().encode(
         x=alt.X('judgment_date:T', title="Date"),  # Use timestamp for x-axis
@@ -144,101 +177,64 @@ def cases_over_time(conn: connection):
     )
     st.altair_chart(chart)
 
-@st.cache_resource(ttl=86400)
-def get_random_judgment_with_summary_and_date(_conn: connection) -> dict:
-    """Returns a random judgment from the database each day."""
-    try:
-        with _conn.cursor() as cur:
-            query = """
-            SELECT 
-                j.neutral_citation, 
-                j.judgment_summary, 
-                j.judgment_date
-            FROM 
-                judgment j
-            ORDER BY 
-                RANDOM()
-            LIMIT 1;
-            """
-            cur.execute(query)
-            result = cur.fetchone()
-
-            if result:
-                return result
-
-    except Exception as e:
-        print(f"Error: {e}")
-        return None
-
 
+@versioned_cache
 def fetch_judgments(_conn: connection, search_query="", court=None,
-case_type=None, start_date=None, end_date=None) -> pd.DataFrame:
-    """Returns filtered judgments from the database."""
-    query = """
-        SELECT j.neutral_citation, j.judgment_date, 
-               j.judgment_summary AS judgment_summary,  -- Truncated summary with "..."
-               c.court_name, jt.judgment_type, j.judgment_summary AS full_judgment_summary
-        FROM judgment j
-        LEFT JOIN court c ON j.court_id = c.court_id
-        LEFT JOIN judgment_type jt ON j.judgment_type_id = jt.judgment_type_id
-        WHERE 1=1
-    """
-    filters = []
-    params = []
-
-    # Full-text search query, including the judgment summary
-    """if search_query:
-        filters.append(
-            f"(j.neutral_citation LIKE %s OR j.judgment_summary LIKE %s)"
-        )
-        params.extend([f"%{search_query}%", f"%{search_query}%"])"""
-
-    if court and court != "All":
-        filters.append("c.court_name = %s")
-        params.append(court)
-
-    if case_type and case_type != "All":
-        filters.append("jt.judgment_type LIKE %s")
-        params.append(f"%{case_type}%")
+case_type=None, start_date=None, end_date=None, after=None,
+page_size=PAGE_SIZE) -> pd.DataFrame:
+    """Returns one page of filtered judgments with a short preview of each summary.
+    Browsing lists judgments newest first. Searching lists them most relevant first,
+    with a search_rank column and a highlighted snippet in place of the preview.
+    Pages are keyset paginated: pass the (judgment_date, neutral_citation), or the
+    (search_rank, neutral_citation) when searching, of the last row shown as `after`
+    to fetch the next page."""
+    query, params, columns = build_judgments_query(page_size, search_query, court,
+                                                   case_type, start_date, end_date, after)
+    with _conn.cursor() as cursor:
+        cursor.execute(query, tuple(params))
+        result = cursor.fetchall()
 
-    if start_date and end_date:
-        filters.append("j.judgment_date BETWEEN %s AND %s")
-        params.extend([start_date, end_date])
+    return pd.DataFrame(result, columns=columns)
 
-    if filters:
-        query += " AND " + " AND ".join(filters)
 
+@versioned_cache
+def count_judgments(_conn: connection, search_query="", court=None,
+                    case_type=None, start_date=None, end_date=None) -> int:
+    """Returns the total number of judgments matching the filters."""
+    query, params = build_count_query(search_query, court, case_type, start_date, end_date)
     with _conn.cursor() as cursor:
         cursor.execute(query, tuple(params))
-        result = cursor.fetchall()
+        return cursor.fetchone()["total"]
 
-    columns = ["neutral_citation", "judgment_date",
-               "judgment_summary", "court_name", "judgment_type"]
 
-    df = pd.DataFrame(result, columns=columns)
-    if search_query:
-        df = df[(df['neutral_citation'].apply(match_judgments_by_citation_search, args=(search_query,)))|
-                (df['judgment_summary'].apply(match_judgments_by_judgment_search, args=(search_query,)))]
-    return df
+def get_page_cursor(filters: tuple) -> tuple | None:
+    """Remembers the keyset of every page visited in the session, starting again
+    from the first page whenever the filters change.
+    Returns the keyset of the last row before the current page, or None on the first page."""
+    if st.session_state.get("page_filters") != filters:
+        st.session_state.page_filters = filters
+        st.session_state.page_cursors = [None]
+    return st.session_state.page_cursors[-1]
 
-def match_judgments_by_citation_search(df_value: str,search_query: str) -> bool:
-    """Uses fuzzy matching to check if the judgment search input matches the contents of the judgments"""
-    neutral_citation_score = fuzz.partial_ratio(search_query.lower(), df_value.lower())
-    if neutral_citation_score > 80:
-        return True
-    return False
 
-def match_judgments_by_judgment_search(df_value: str,search_query: str) -> bool:
-    """Uses matching to check if the judgment search input matches the contents of the judgments"""
-    search_tokens = search_query.split(' ')
-    df_value = df_value.lower().split(' ')
-    if all(word.lower() in df_value for word in search_tokens):
-        return True
-    return False
+def display_page_buttons(df: pd.DataFrame, page_size: int = PAGE_SIZE) -> None:
+    """Shows previous and next page buttons below the judgment table."""
+    cursors = st.session_state.page_cursors
+    col1, col2 = st.columns(2)
+    with col1:
+        if len(cursors) > 1 and st.button("Previous page"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if len(df) == page_size and st.button("Next page"):
+            last_row = df.iloc[-1]
+            sort_column = "search_rank" if "search_rank" in df.columns else "judgment_date"
+            cursors.append((last_row[sort_column], last_row["neutral_citation"]))
+            st.rerun()
 
 
-def fetch_judgment_html(neutral_citation: str, s_three_client: BaseClient) -> str:
-    """Fetches judgment html from bucket, returns a string."""
+def get_judgment_html_key(neutral_citation: str) -> str:
+    """Returns the S3 key of a judgment's html from its neutral citation."""
     file_key = ''.join(char for char in neutral_citation if char.isalnum() or char == " ")
     file_key = file_key.lower().split()
     if len(file_key) == 4:
@@ -248,33 +244,141 @@ def fetch_judgment_html(neutral_citation: str, s_three_client: BaseClient) -> st
             file_key = '-'.join([file_key[1], file_key[2], file_key[0], file_key[3].lstrip('0')])
     else:
         file_key = '-'.join([file_key[1], file_key[0], file_key[2].lstrip('0')])
-    file_key += '.html'
+    return file_key + '.html'
+
+
+def fetch_judgment_html(neutral_citation: str, s_three_client: BaseClient) -> str:
+    """Fetches judgment html from the html cache, or the bucket on a miss, returns a string."""
     try:
-        obj = s_three_client.get_object(Bucket=ENV['BUCKET_NAME'], Key=file_key)
-        html_content = obj['Body'].read().decode('utf-8')
-        return html_content
+        return get_html(get_html_cache(), s_three_client, ENV['BUCKET_NAME'],
+                        get_judgment_html_key(neutral_citation))
     except Exception:
         st.error('File not available.')
-    
+
+
+def prefetch_judgment_html(neutral_citation: str, s_three_client: BaseClient) -> None:
+    """Starts loading a judgment's html into the html cache in the background."""
+    prefetch_html(get_html_cache(), s_three_client, ENV['BUCKET_NAME'],
+                  get_judgment_html_key(neutral_citation))
+
+
+@versioned_cache
+def fetch_filter_facets(_conn: connection) -> dict:
+    """Returns the search filter options from the facet snapshot the pipeline refreshes:
+    the number of judgments in each court and of each type, and the judgment date range."""
+    with _conn.cursor() as cursor:
+        cursor.execute("""SELECT facet, facet_value, judgment_count, min_date, max_date
+                          FROM judgment_filter_facets""")
+        rows = cursor.fetchall()
+    facets = {"courts": {}, "types": {}, "total": 0, "min_date": None, "max_date": None}
+    for row in rows:
+        if row["facet"] == "court":
+            facets["courts"][row["facet_value"]] = row["judgment_count"]
+        elif row["facet"] == "judgment_type":
+            facets["types"][row["facet_value"]] = row["judgment_count"]
+        else:
+            facets["total"] = row["judgment_count"]
+            facets["min_date"] = row["min_date"]
+            facets["max_date"] = row["max_date"]
+    return facets
+
+
+def format_facet(option: str, counts: dict, total: int) -> str:
+    """Returns a filter option labelled with its number of judgments."""
+    count = total if option == "All" else counts.get(option.lower(), 0)
+    return f"{option} ({count:,})"
+
+
+def display_selected_judgment(conn: connection, s_three_client: BaseClient,
+                              selected_citation: str) -> None:
+    """Displays the overview, parties and full summary of one judgment, or its full html
+    when toggled, fetching each by primary key."""
+    prefetch_judgment_html(selected_citation, s_three_client)
+    if 'toggle' not in st.session_state:
+        st.session_state.toggle = False
+    if st.button("Click to alternate between overview and full judgment"):
+        st.session_state.toggle = not st.session_state.toggle
+    if st.session_state.toggle:
+        html_content = fetch_judgment_html(selected_citation, s_three_client)
+        if html_content:
+            st.markdown(html_content, unsafe_allow_html=True)
+    else:
+        col1, col2 = st.columns(2)  # Create two side-by-side columns
+
+        with col1:
+            case_overview = fetch_case_overview(conn, selected_citation)
+
+            if case_overview:
+                st.html(
+                    f"""
+                    <h1>Case Overview</h1>
+                    <h2>Neutral Citation:<p>{case_overview.get('Neutral Citation')}</p1></h2>
+                    <h2>Judgment Date:<p>{case_overview.get('Judgment Date')}</p1></h2>
+                    <h2>Court:<p>{case_overview.get('Court')}</p></h2>
+                    <h2>Case Type:<p>{case_overview.get('Judgment Type')}</p1></h2>
+                    <h2>Judge(s):<p>{case_overview.get('Judge')}</p1></h2>
+                    <h2>In Favour of:<p>{case_overview.get('In Favour Of').title()}</p1></h2>
+                    """)
+            else:
+                st.html("<p>No detailed overview available.")
+
+        with col2:
+            # Fetch and display parties involved
+            parties_involved = fetch_parties_involved(
+                conn, selected_citation)
+
+            if parties_involved:
+                party_str_whole = "<h1>Parties Involved"
+                
+                for role in parties_involved:
+                    if len(parties_involved[role]) <= 1:
+                        parties_str = f"""<h2>{role.title()}:<ul>"""
+                        for party in parties_involved[role]:
+                            parties_str+=f"<li><p>{party.title()}"
+                        party_str_whole += parties_str
+
+                    elif len(parties_involved[role]) > 1:
+                        parties_str = f"""<h2>{role.title()}s:<ul>"""
+                        for party in parties_involved[role]:
+                            parties_str += f"<li><p>{party.title()}"
+                        party_str_whole += parties_str
+                st.html(party_str_whole)
+            else:
+                st.html("<p>No party information available.")
+
+    # Display the full judgment summary
+
+            judgment_summary = case_overview["Summary"]
+            st.html(f"""<h1>Full Judgment Summary<p id="summary">{judgment_summary}""")
+
 
 def display_judgment_search(conn: connection, s_three_client: BaseClient) -> None:
-    """Displays the interface for Judgment Search Page on Streamlit."""
+    """Displays the interface for Judgment Search Page on Streamlit. A judgment linked
+    to with the selected_citation query parameter is shown on its own, without
+    running the search until the user asks for it."""
+    linked_citation = st.query_params.get("selected_citation")
+    if linked_citation:
+        if fetch_case_overview(conn, linked_citation):
+            display_selected_judgment(conn, s_three_client, linked_citation)
+            if st.button("Search all judgments"):
+                del st.query_params["selected_citation"]
+                st.rerun()
+            return
+        st.html(f"<p>Judgment {html.escape(linked_citation)} was not found.")
 
     search_query = st.text_input("🔍 Search a Judgment", "")
 
 
-    # Fetch courts dynamically from the database
-    query = "SELECT DISTINCT court_name FROM court"
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        court_names = [row["court_name"].title() for row in cursor.fetchall()]
-    
-    court_names.sort()
+    # Filter options and their counts come from the cached facet snapshot
+    facets = fetch_filter_facets(conn)
+    court_names = sorted(court_name.title() for court_name in facets["courts"])
 
     # "All" as a default option
     court_names.insert(0, "All")
 
-    court_filter = (st.selectbox("Filter by Court", court_names))
+    court_filter = st.selectbox(
+        "Filter by Court", court_names,
+        format_func=lambda option: format_facet(option, facets["courts"], facets["total"]))
 
     if court_filter != "All":
         court_filter = court_filter.lower()
@@ -283,21 +387,13 @@ def display_judgment_search(conn: connection, s_three_client: BaseClient) -> Non
 
     with col1:
         type_filter = st.selectbox(
-            "Filter by Type", ["All", "Civil", "Criminal"])
+            "Filter by Type", ["All", "Civil", "Criminal"],
+            format_func=lambda option: format_facet(option, facets["types"], facets["total"]))
         if type_filter != "All":
             type_filter = type_filter.lower()
 
     with col2:
-        with conn.cursor() as cursor:
-            cursor.execute("""SELECT
-                            MIN(judgment_date) AS min_value, 
-                            MAX(judgment_date) AS max_value 
-                        FROM 
-                            judgment;
-                        """)
-            dates = cursor.fetchall()
-        min_date = dates[0]['min_value']
-        max_date = dates[0]['max_value']
+        min_date, max_date = facets["min_date"], facets["max_date"]
         date_range = st.date_input("Select Date Range", value=[min_date,max_date],
                                    min_value=min_date,max_value=max_date, key="date_range")
 
@@ -307,86 +403,29 @@ def display_judgment_search(conn: connection, s_three_client: BaseClient) -> Non
         else:
             start_date, end_date = None, None
 
-    # Fetch the judgments based on the selected filters
-    df = fetch_judgments(conn, search_query, court_filter,
-                         type_filter, start_date, end_date)
+    # Fetch one page of judgments based on the selected filters
+    filters = (search_query, court_filter, type_filter, start_date, end_date)
+    df = fetch_judgments(conn, *filters, after=get_page_cursor(filters))
     df["court_name"] = df["court_name"].str.title()
 
     if not df.empty:
-        display_as_table_search(df)
-
-        query_params = st.query_params
-        selected_citation_from_url = query_params.get("selected_citation", [None])
+        total = count_judgments(conn, *filters)
+        first_row = (len(st.session_state.page_cursors) - 1) * PAGE_SIZE + 1
+        display_as_table_search(df.drop(columns=["search_rank"], errors="ignore"))
+        st.html(f"<p>Showing {first_row}-{first_row + len(df) - 1} of {total} judgments")
+        display_page_buttons(df)
 
         st.markdown('<a id="case-overview"></a>', unsafe_allow_html=True)
-        selected_citation = st.selectbox(
-            "Select a Judgment",
-            df["neutral_citation"],
-            index=df["neutral_citation"].tolist().index(selected_citation_from_url) if selected_citation_from_url in df["neutral_citation"].values else 0
-        )
+        selected_citation = st.selectbox("Select a Judgment", df["neutral_citation"])
 
         if selected_citation:
-            if 'toggle' not in st.session_state:
-                st.session_state.toggle = False
-            if st.button("Click to alternate between overview and full judgment"):
-                st.session_state.toggle = not st.session_state.toggle
-            if st.session_state.toggle:
-                html_content = fetch_judgment_html(selected_citation, s_three_client)
-                if html_content:
-                    st.markdown(html_content, unsafe_allow_html=True)
-            else:
-                col1, col2 = st.columns(2)  # Create two side-by-side columns
-
-                with col1:
-                    case_overview = fetch_case_overview(conn, selected_citation)
-
-                    if case_overview:
-                        st.html(
-                            f"""
-                            <h1>Case Overview</h1>
-                            <h2>Neutral Citation:<p>{case_overview.get('Neutral Citation')}</p1></h2>
-                            <h2>Judgment Date:<p>{case_overview.get('Judgment Date')}</p1></h2>
-                            <h2>Court:<p>{case_overview.get('Court')}</p></h2>
-                            <h2>Case Type:<p>{case_overview.get('Judgment Type')}</p1></h2>
-                            <h2>Judge(s):<p>{case_overview.get('Judge')}</p1></h2>
-                            <h2>In Favour of:<p>{case_overview.get('In Favour Of').title()}</p1></h2>
-                            """)
-                    else:
-                        st.html("<p>No detailed overview available.")
-
-                with col2:
-                    # Fetch and display parties involved
-                    parties_involved = fetch_parties_involved(
-                        conn, selected_citation)
-
-                    if parties_involved:
-                        party_str_whole = "<h1>Parties Involved"
-                        
-                        for role in parties_involved:
-                            if len(parties_involved[role]) <= 1:
-                                parties_str = f"""<h2>{role.title()}:<ul>"""
-                                for party in parties_involved[role]:
-                                    parties_str+=f"<li><p>{party.title()}"
-                                party_str_whole += parties_str
-
-                            elif len(parties_involved[role]) > 1:
-                                parties_str = f"""<h2>{role.title()}s:<ul>"""
-                                for party in parties_involved[role]:
-                                    parties_str += f"<li><p>{party.title()}"
-                                party_str_whole += parties_str
-                        st.html(party_str_whole)
-                    else:
-                        st.html("<p>No party information available.")
-
-            # Display the full judgment summary
-
-                    judgment_summary = case_overview["Summary"]
-                    st.html(f"""<h1>Full Judgment Summary<p id="summary">{judgment_summary}""")
+            display_selected_judgment(conn, s_three_client, selected_citation)
 
     else:
         st.html("<p>No results found for your search.")
 
 
+@versioned_cache
 def fetch_case_overview(conn: connection, neutral_citation: str) -> dict:
     """Returns the overview of a selected judgment."""
     query = """
@@ -435,6 +474,7 @@ def fetch_case_overview(conn: connection, neutral_citation: str) -> dict:
 
     return case_overview
 
+@versioned_cache
 def fetch_parties_involved(_conn: connection, neutral_citation: str) -> dict:
     """
     Returns a dictionary mapping role types to lists of party names.
@@ -2,32 +2,36 @@ import pandas as pd
 import streamlit as st
 import altair as alt
 from psycopg2 import connect as connection
-def get_judgment_data(chamber_id, conn):
-    query = """
-        SELECT 
-            COUNT(j.neutral_citation) AS total_judgments,
-            SUM(CASE WHEN jt.judgment_type = 'criminal' THEN 1 ELSE 0 END) AS criminal_judgments,
-            SUM(CASE WHEN jt.judgment_type = 'civil' THEN 1 ELSE 0 END) AS civil_judgments
-        FROM chamber c
-        LEFT JOIN counsel co ON c.chamber_id = co.chamber_id
-        LEFT JOIN counsel_assignment ca ON co.counsel_id = ca.counsel_id
-        LEFT JOIN party p ON ca.party_id = p.party_id
-        LEFT JOIN judgment j ON p.neutral_citation = j.neutral_citation
-        LEFT JOIN judgment_type jt ON j.judgment_type_id = jt.judgment_type_id
-        WHERE c.chamber_id = %s
-    """
-    with conn.cursor() as cursor:
-        cursor.execute(query, (chamber_id,))
-        result = cursor.fetchone()
-
-    return pd.DataFrame([result]) if result else pd.DataFrame(columns=["total_judgments", "criminal_judgments", "civil_judgments"])
+from query_cache import versioned_cache
+from dashboard_functions import (fetch_courts, fetch_court_rulings, fetch_judgments_by_judge,
+                                 fetch_judgments_by_chamber)
+
+
+@versioned_cache
+def fetch_chamber_stats(_conn: connection, chamber_ids: list) -> list:
+    """Returns the total, criminal and civil judgment counts of the given chambers
+    from the rollup the pipeline refreshes, in one query however many are compared."""
+    query = """SELECT chamber_name AS "Chamber", total_judgments,
+                      criminal_judgments, civil_judgments
+               FROM chamber_judgment_stats
+               WHERE chamber_id = ANY(%s)
+               ORDER BY total_judgments DESC"""
+    with _conn.cursor() as cursor:
+        cursor.execute(query, (list(chamber_ids),))
+        return cursor.fetchall()
+
+
+@versioned_cache
+def fetch_chambers(_conn: connection) -> list:
+    """Returns the id and name of every chamber."""
+    with _conn.cursor() as cursor:
+        cursor.execute("SELECT chamber_id, chamber_name FROM chamber")
+        return cursor.fetchall()
 
 
 def compare_chambers(conn):
     # Fetch available chambers
-    with conn.cursor() as cursor:
-        cursor.execute("SELECT chamber_id, chamber_name FROM chamber")
-        result = cursor.fetchall()
+    result = fetch_chambers(conn)
 
     df = pd.DataFrame(result)
     df["chamber_name"] = df["chamber_name"].astype(str).str.strip()
@@ -41,34 +45,19 @@ def compare_chambers(conn):
     chamber_options = dict(
         zip(df_cleaned["chamber_name"], df_cleaned["chamber_id"]))
 
-    # Select the first chamber
+    # Select any number of chambers, starting with the first two
     chamber_names = list(chamber_options.keys())
-    chamber_1_name = st.selectbox(
-        "Select first chamber", chamber_names, index=0)  # Default to the first chamber
-
-    # Remove the selected first chamber from the list for the second selectbox
-    remaining_chamber_names = [
-        name for name in chamber_names if name != chamber_1_name]
-
-    # Select the second chamber (from remaining options)
-    chamber_2_name = st.selectbox(
-        # Default to the first remaining option
-        "Select second chamber", remaining_chamber_names, index=0)
-
-    # Get the chamber IDs based on selected chamber names
-    chamber_1_id = chamber_options[chamber_1_name]
-    chamber_2_id = chamber_options[chamber_2_name]
-
-    # Get the metrics for both chambers
-    chamber_1_data = get_judgment_data(chamber_1_id, conn)
-    chamber_2_data = get_judgment_data(chamber_2_id, conn)
-
-    # Add Chamber names for clarity in visualizations
-    chamber_1_data["Chamber"] = chamber_1_name
-    chamber_2_data["Chamber"] = chamber_2_name
+    selected_names = st.multiselect(
+        "Select chambers to compare", chamber_names, default=chamber_names[:2])
+    if not selected_names:
+        st.html("<p>Select at least one chamber to compare.")
+        return
 
-    # Combine the data
-    comparison_df = pd.concat([chamber_1_data, chamber_2_data])
+    # Get the metrics for every selected chamber at once
+    comparison_df = pd.DataFrame(
+        fetch_chamber_stats(conn, [chamber_options[name] for name in selected_names]),
+        columns=["Chamber", "total_judgments", "criminal_judgments", "civil_judgments"])
+    comparison_df["Chamber"] = comparison_df["Chamber"].str.title()
 
     st.html("<h2>Chambers Comparison")
 
@@ -107,27 +96,15 @@ def compare_chambers(conn):
 
 
 def display_judgments_for_court(conn: connection) -> None:
-    """Displays the judgments for a given court"""
-    query = """select judgment_date,judgment_summary,neutral_citation,
-                    judge_name,court_name,judgment_type,
-                    role_name as in_favour_of from judgment 
-                    join court using (court_id)
-                    join judgment_type
-                    using (judgment_type_id)
-                    join role r on judgment.in_favour_of = r.role_id """
-
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
-    df = pd.DataFrame(result)
+    """Displays the rulings of a given court"""
+    courts = fetch_courts(conn)
 
-    if not df.empty:
-        df['court_name'] = df['court_name'].str.title()
-        df['judgment_date'] = pd.to_datetime(df['judgment_date'])
-        min_date = df['judgment_date'].min().date()
-        max_date = df['judgment_date'].max().date()
+    if courts:
+        court_names = {court["court_name"].title(): court["court_name"] for court in courts}
+        min_date = min(court["min_date"] for court in courts)
+        max_date = max(court["max_date"] for court in courts)
         selected_court = st.selectbox(
-            "Select a Court", df["court_name"].unique())
+            "Select a Court", list(court_names))
         date_range = st.date_input("Select Date Range",
                                    value=[min_date, max_date],
                                    min_value=min_date,
@@ -136,23 +113,18 @@ def display_judgments_for_court(conn: connection) -> None:
 
         if len(date_range) == 2:
             start_date, end_date = date_range
-            start_date = pd.to_datetime(start_date)
-            end_date = pd.to_datetime(end_date)
-            df = df[(df['judgment_date'] >= start_date)
-                    & (df['judgment_date'] <= end_date)]
         else:
-            start_date, end_date = None, None
-        df = df[df["court_name"] == selected_court.title()]
+            start_date, end_date = min_date, max_date
+        result = fetch_court_rulings(conn, court_names[selected_court], start_date, end_date)
 
-        df['in_favour_of'] = df['in_favour_of'].str.title()
-        ruling_df = df.groupby('in_favour_of').size().reset_index()
-        ruling_df.columns = ['Ruling', 'Count']
+        ruling_df = pd.DataFrame(result, columns=['Ruling', 'Count'])
+        ruling_df['Ruling'] = ruling_df['Ruling'].str.title()
 
         chart_ruling_type = alt.Chart(ruling_df).mark_arc().encode(
             theta=alt.Theta('Count', type='quantitative'),
             color=alt.Color('Ruling', type='nominal')
         ).properties(title="Number of Rulings by Court")
-        st.html(f'<p>Cases found: {df.shape[0]}')
+        st.html(f'<p>Cases found: {ruling_df["Count"].sum()}')
         st.altair_chart(chart_ruling_type, use_container_width=True)
 
     else:
@@ -161,16 +133,7 @@ def display_judgments_for_court(conn: connection) -> None:
 
 def display_judgments_by_judge(conn):
     """Displays a dynamic bar chart of judgments by judge with user-selected limit."""
-
-    query = """SELECT judge_name AS "Judge", COUNT(*) AS "Total Judgments"
-               FROM judgment
-               GROUP BY judge_name
-               ORDER BY COUNT(*) DESC;
-            """
-
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
+    result = fetch_judgments_by_judge(conn)
 
     df = pd.DataFrame(result, columns=["Judge", "Total Judgments"])
 
@@ -205,19 +168,7 @@ def display_judgments_by_judge(conn):
 
 def display_number_of_judgments_by_chamber(conn):
     """Displays the a graph showing number of judgments by the chamber"""
-    query = """SELECT chamber.chamber_name AS "Chamber", COUNT(*) AS "Total Judgments"
-               FROM chamber
-               JOIN counsel ON chamber.chamber_id = counsel.chamber_id
-               JOIN counsel_assignment ON counsel.counsel_id = counsel_assignment.counsel_id
-               JOIN party ON counsel_assignment.party_id = party.party_id
-               JOIN judgment ON party.neutral_citation = judgment.neutral_citation
-               GROUP BY chamber.chamber_name
-               ORDER BY "Total Judgments" DESC;
-            """
-
-    with conn.cursor() as cursor:
-        cursor.execute(query)
-        result = cursor.fetchall()
+    result = fetch_judgments_by_chamber(conn)
 
     df_chamber_judgments = pd.DataFrame(
         result, columns=["Chamber", "Total Judgments"])
@@ -0,0 +1,168 @@
+"""Keeps recently viewed judgment html in memory, and optionally on disk."""
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from os import environ as ENV
+from time import monotonic
+import streamlit as st
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+
+# How long cached html is trusted before S3 is asked whether its ETag has changed.
+REVALIDATE_SECONDS = 600
+PREFETCH_WORKERS = 4
+
+
+def create_html_cache(max_bytes: int, disk_folder: str = None) -> dict:
+    """Creates an empty judgment html cache holding at most max_bytes of html in memory,
+    also keeping every download in disk_folder when one is given.
+    Returns a dictionary holding the entries, their total size and a prefetch executor."""
+    if disk_folder:
+        os.makedirs(disk_folder, exist_ok=True)
+    return {
+        "entries": OrderedDict(),
+        "size": 0,
+        "max_bytes": max_bytes,
+        "disk_folder": disk_folder,
+        "lock": threading.Lock(),
+        "in_flight": {},
+        "executor": ThreadPoolExecutor(PREFETCH_WORKERS, thread_name_prefix="html-prefetch")
+    }
+
+
+@st.cache_resource
+def get_html_cache() -> dict:
+    """Returns the html cache shared by every session, sized by HTML_CACHE_MAX_BYTES
+    with a disk tier in HTML_CACHE_DIR when it is set."""
+    return create_html_cache(int(ENV.get("HTML_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+                             ENV.get("HTML_CACHE_DIR"))
+
+
+def get_disk_path(cache: dict, key: str) -> str:
+    """Returns the disk tier path of an S3 key."""
+    return os.path.join(cache["disk_folder"], f"{key}.gz")
+
+
+def read_disk_entry(cache: dict, key: str) -> dict | None:
+    """Returns the entry kept in the disk tier for an S3 key, or None if there is none.
+    Disk entries are revalidated against S3 before their first use."""
+    if not cache["disk_folder"]:
+        return None
+    try:
+        with gzip.open(get_disk_path(cache, key), "rt", encoding="utf-8") as file:
+            etag = file.readline().rstrip("\n")
+            html = file.read()
+    except OSError:
+        return None
+    return {"etag": etag, "html": html, "size": len(html.encode("utf-8")), "checked": 0.0}
+
+
+def write_disk_entry(cache: dict, key: str, entry: dict) -> None:
+    """Writes an entry to the disk tier, replacing any older copy in one step."""
+    if not cache["disk_folder"]:
+        return
+    path = get_disk_path(cache, key)
+    temporary_path = f"{path}.{threading.get_ident()}.tmp"
+    with gzip.open(temporary_path, "wt", encoding="utf-8") as file:
+        file.write(f"{entry['etag']}\n{entry['html']}")
+    os.replace(temporary_path, path)
+
+
+def put_entry(cache: dict, key: str, entry: dict) -> None:
+    """Stores an entry as the most recently used, evicting the least recently used
+    html until the cache fits in its byte budget. Html larger than the whole budget
+    is not kept in memory."""
+    with cache["lock"]:
+        previous = cache["entries"].pop(key, None)
+        if previous:
+            cache["size"] -= previous["size"]
+        if entry["size"] > cache["max_bytes"]:
+            return
+        cache["entries"][key] = entry
+        cache["size"] += entry["size"]
+        while cache["size"] > cache["max_bytes"]:
+            _, evicted = cache["entries"].popitem(last=False)
+            cache["size"] -= evicted["size"]
+
+
+def get_entry(cache: dict, key: str) -> dict | None:
+    """Returns the cached entry for an S3 key from memory, then disk, or None."""
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry:
+            cache["entries"].move_to_end(key)
+    if entry is None:
+        entry = read_disk_entry(cache, key)
+        if entry:
+            put_entry(cache, key, entry)
+    return entry
+
+
+def download_html(s_three_client: BaseClient, bucket: str, key: str,
+                  etag: str = None) -> dict | None:
+    """Downloads and decodes judgment html, skipping the download when etag is given
+    and still matches the object in S3.
+    Returns a cache entry, or None when the cached copy is current."""
+    request = {"Bucket": bucket, "Key": key}
+    if etag:
+        request["IfNoneMatch"] = etag
+    try:
+        obj = s_three_client.get_object(**request)
+    except ClientError as e:
+        if etag and e.response["Error"]["Code"] in ("304", "NotModified"):
+            return None
+        raise
+    content = obj["Body"].read()
+    if obj.get("ContentEncoding") == "gzip":
+        content = gzip.decompress(content)
+    return {"etag": obj.get("ETag", ""), "html": content.decode("utf-8"),
+            "size": len(content), "checked": monotonic()}
+
+
+def load_html(cache: dict, s_three_client: BaseClient, bucket: str, key: str) -> str:
+    """Returns judgment html from the cache, downloading it on a miss. Cached html older
+    than REVALIDATE_SECONDS is checked with a conditional request on its ETag, so it is
+    only downloaded again if it has been replaced."""
+    entry = get_entry(cache, key)
+    if entry and monotonic() - entry["checked"] < REVALIDATE_SECONDS:
+        return entry["html"]
+    downloaded = download_html(s_three_client, bucket, key, entry["etag"] if entry else None)
+    if downloaded is None:
+        with cache["lock"]:
+            entry["checked"] = monotonic()
+        return entry["html"]
+    put_entry(cache, key, downloaded)
+    write_disk_entry(cache, key, downloaded)
+    return downloaded["html"]
+
+
+def get_html(cache: dict, s_three_client: BaseClient, bucket: str, key: str) -> str:
+    """Returns judgment html, waiting for a prefetch of the same key that is already
+    running rather than downloading it twice."""
+    with cache["lock"]:
+        future = cache["in_flight"].get(key)
+    if future:
+        try:
+            return future.result()
+        except Exception:  # pylint: disable=broad-except
+            pass
+    return load_html(cache, s_three_client, bucket, key)
+
+
+def prefetch_html(cache: dict, s_three_client: BaseClient, bucket: str, key: str) -> None:
+    """Starts loading judgment html into the cache in a background thread, unless it is
+    already cached or being loaded."""
+    with cache["lock"]:
+        if key in cache["in_flight"] or key in cache["entries"]:
+            return
+        future = cache["executor"].submit(load_html, cache, s_three_client, bucket, key)
+        cache["in_flight"][key] = future
+
+    def forget(done_future):
+        with cache["lock"]:
+            if cache["in_flight"].get(key) is done_future:
+                del cache["in_flight"][key]
+
+    future.add_done_callback(forget)
@@ -0,0 +1,117 @@
+"""Builds the judgment search SQL, kept free of streamlit so the index check can
+explain exactly the statements the dashboard runs."""
+
+PREVIEW_LENGTH = 200
+CITATION_MATCH_LIMIT = 10
+# Snippets are shown in a plain-text table, so matches are marked without html.
+HEADLINE_OPTIONS = ("StartSel=**, StopSel=**, MaxFragments=2, MinWords=5, MaxWords=20, "
+                    "FragmentDelimiter=' ... '")
+JUDGMENT_COLUMNS = ["neutral_citation", "judgment_date",
+                    "judgment_summary", "court_name", "judgment_type"]
+
+
+def build_judgment_filters(search_query="", court=None, case_type=None,
+                           start_date=None, end_date=None) -> tuple[str, list]:
+    """Builds the WHERE conditions shared by the judgment page and count queries.
+    A search query matches the full-text index of summaries or one of the closest
+    citations by trigram similarity.
+    Returns the conditions and their parameters."""
+    filters = ["1=1"]
+    params = []
+
+    if search_query:
+        filters.append("""(j.judgment_search @@ websearch_to_tsquery('english', %s)
+               OR j.neutral_citation IN (
+                   SELECT neutral_citation FROM judgment
+                   WHERE %s <%% neutral_citation
+                   ORDER BY word_similarity(%s, neutral_citation) DESC
+                   LIMIT %s))""")
+        params.extend([search_query, search_query, search_query, CITATION_MATCH_LIMIT])
+
+    if court and court != "All":
+        filters.append("c.court_name = %s")
+        params.append(court)
+
+    if case_type and case_type != "All":
+        filters.append("jt.judgment_type LIKE %s")
+        params.append(f"%{case_type}%")
+
+    if start_date and end_date:
+        filters.append("j.judgment_date BETWEEN %s AND %s")
+        params.extend([start_date, end_date])
+
+    return " AND ".join(filters), params
+
+
+def build_search_rank(search_query: str) -> tuple[str, list]:
+    """Builds the relevance of a judgment to a search query: citations similar to the
+    query rank above every summary match, by trigram similarity, and summary matches
+    follow by full-text rank, normalised below 1.
+    Returns the rank expression and its parameters."""
+    rank = """(CASE WHEN %s <%% j.neutral_citation
+                     THEN 1 + word_similarity(%s, j.neutral_citation)
+                     ELSE ts_rank(j.judgment_search, websearch_to_tsquery('english', %s), 32)
+                END)::float8"""
+    return rank, [search_query, search_query, search_query]
+
+
+def build_judgments_query(page_size: int, search_query="", court=None, case_type=None,
+                          start_date=None, end_date=None,
+                          after=None) -> tuple[str, list, list[str]]:
+    """Builds the query for one page of filtered judgments with a short preview of each
+    summary. Browsing lists judgments newest first. Searching lists them most relevant
+    first, with a search_rank column and a highlighted snippet in place of the preview.
+    Pages are keyset paginated on `after`, the (judgment_date, neutral_citation), or the
+    (search_rank, neutral_citation) when searching, of the last row shown.
+    Returns the query, its parameters and the names of its columns."""
+    columns = list(JUDGMENT_COLUMNS)
+    if search_query:
+        preview = "ts_headline('english', j.judgment_summary, websearch_to_tsquery('english', %s), %s)"
+        sort_key, sort_params = build_search_rank(search_query)
+        params = [search_query, HEADLINE_OPTIONS, *sort_params]
+        ranked = f", {sort_key} AS search_rank"
+        order = "search_rank DESC"
+        columns.append("search_rank")
+    else:
+        preview = """left(j.judgment_summary, %s)
+               || CASE WHEN length(j.judgment_summary) > %s THEN '...' ELSE '' END"""
+        sort_key, sort_params = "j.judgment_date", []
+        params = [PREVIEW_LENGTH, PREVIEW_LENGTH]
+        ranked = ""
+        order = "j.judgment_date DESC"
+    conditions, filter_params = build_judgment_filters(search_query, court, case_type,
+                                                       start_date, end_date)
+    params.extend(filter_params)
+    if after:
+        conditions += f" AND ({sort_key}, j.neutral_citation) < (%s, %s)"
+        params.extend([*sort_params, *after])
+    params.append(page_size)
+
+    query = f"""
+        SELECT j.neutral_citation, j.judgment_date,
+               {preview} AS judgment_summary,
+               c.court_name, jt.judgment_type{ranked}
+        FROM judgment j
+        LEFT JOIN court c ON j.court_id = c.court_id
+        LEFT JOIN judgment_type jt ON j.judgment_type_id = jt.judgment_type_id
+        WHERE {conditions}
+        ORDER BY {order}, j.neutral_citation DESC
+        LIMIT %s
+    """
+    return query, params, columns
+
+
+def build_count_query(search_query="", court=None, case_type=None,
+                      start_date=None, end_date=None) -> tuple[str, list]:
+    """Builds the query counting every judgment matching the filters.
+    Returns the query and its parameters."""
+    conditions, params = build_judgment_filters(search_query, court, case_type,
+                                                start_date, end_date)
+    query = f"""
+        SELECT COUNT(*) AS total
+        FROM judgment j
+        LEFT JOIN court c ON j.court_id = c.court_id
+        LEFT JOIN judgment_type jt ON j.judgment_type_id = jt.judgment_type_id
+        WHERE {conditions}
+    """
+    return query, params
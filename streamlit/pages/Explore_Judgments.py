@@ -16,9 +16,9 @@ def main():
     with open("style.css") as css:
             st.html(f'<style>{css.read()}</style>')
     dashboard_title()
-    conn = get_db_connection()
     s_three_client = create_client()
-    display_judgment_search(conn, s_three_client)
+    with get_db_connection() as conn:
+        display_judgment_search(conn, s_three_client)
 
 if __name__ == "__main__":
     main()
@@ -15,9 +15,9 @@ def main():
     with open("style.css") as css:
             st.html(f'<style>{css.read()}</style>')
     load_dotenv()
-    conn = get_db_connection()
     dashboard_title()
-    display_judgments_for_court(conn)
+    with get_db_connection() as conn:
+        display_judgments_for_court(conn)
 
 
 
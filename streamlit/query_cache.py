@@ -0,0 +1,73 @@
+"""Caches dashboard query results until the pipeline loads new data."""
+import functools
+import threading
+import pandas as pd
+import streamlit as st
+from psycopg2.extensions import connection
+
+# How long a session trusts the last data version it read before checking again.
+DATA_VERSION_TTL = 60
+QUERY_CACHE_ENTRIES = 1000
+
+CACHE_STATS = {}
+_stats_lock = threading.Lock()
+_query_state = threading.local()
+
+
+@st.cache_data(ttl=DATA_VERSION_TTL, show_spinner=False)
+def get_data_version(_conn: connection) -> int:
+    """Returns the version the pipeline last stamped on the loaded data,
+    reading it from the database at most once every DATA_VERSION_TTL seconds."""
+    with _conn.cursor() as cursor:
+        cursor.execute("SELECT version FROM data_version")
+        result = cursor.fetchone()
+    return int(result["version"]) if result else 0
+
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES, show_spinner=False)
+def run_cached_query(query_name: str, data_version: int, _query, _conn: connection,
+                     *args, **kwargs):
+    """Runs a query function on a cache miss. The query name and data version are
+    part of the cache key, so results are reused until the data version changes."""
+    # pylint: disable=unused-argument
+    _query_state.missed = True
+    return _query(_conn, *args, **kwargs)
+
+
+def record_cache_lookup(query_name: str, hit: bool) -> None:
+    """Counts a cache hit or miss for a query."""
+    with _stats_lock:
+        stats = CACHE_STATS.setdefault(query_name, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+
+
+def versioned_cache(query):
+    """Decorates a query function taking a connection as its first argument so its
+    results are cached against the current data version."""
+    query_name = f"{query.__module__}.{query.__qualname__}"
+
+    @functools.wraps(query)
+    def wrapper(conn: connection, *args, **kwargs):
+        _query_state.missed = False
+        result = run_cached_query(query_name, get_data_version(conn), query,
+                                  conn, *args, **kwargs)
+        record_cache_lookup(query_name, not _query_state.missed)
+        return result
+
+    return wrapper
+
+
+def get_cache_stats() -> pd.DataFrame:
+    """Returns the hits, misses and hit rate of every cached query."""
+    with _stats_lock:
+        rows = [{"query": name.split(".")[-1], **stats}
+                for name, stats in sorted(CACHE_STATS.items())]
+    df = pd.DataFrame(rows, columns=["query", "hits", "misses"])
+    df["hit_rate"] = (df["hits"] / (df["hits"] + df["misses"])).round(2)
+    return df
+
+
+def display_cache_stats() -> None:
+    """Shows the query cache statistics in the sidebar."""
+    with st.sidebar.expander("Query cache"):
+        st.dataframe(get_cache_stats(), hide_index=True, use_container_width=True)
@@ -3,7 +3,9 @@ import pandas as pd
 import altair as alt
 import streamlit as st
 from unittest.mock import MagicMock, patch
-from dashboard_functions import cases_by_court, cases_by_judgment_type
+from datetime import date
+from dashboard_functions import (display_cases_by_court, display_cases_by_judgment_type,
+                                 fetch_court_rulings, display_judgments_for_court)
 
 
 
@@ -24,39 +26,53 @@ def mock_streamlit():
         yield mock_chart
 
 
-def test_cases_by_court(mock_conn, mock_streamlit):
-    """Tests cases by court."""
-    conn, cursor = mock_conn
+def test_display_cases_by_court(mock_streamlit):
+    """Tests that court counts from the home snapshot are drawn as a bar chart."""
+    display_cases_by_court([{"Court": "supreme court", "Case Count": 120},
+                            {"Court": "high court", "Case Count": 85}])
 
-    cursor.fetchall.return_value = [
-        ("Supreme Court", 120),
-        ("High Court", 85),
-    ]
-    df_court_cases = pd.DataFrame(
-        cursor.fetchall(), columns=["Court", "Case Count"])
+    chart = mock_streamlit.call_args[0][0]
+    assert chart.data["Court"].tolist() == ["Supreme Court", "High Court"]
 
-    df_court_cases["Court"] = df_court_cases["Court"].str.title()
 
-    cases_by_court(conn)
+def test_display_cases_by_judgment_type(mock_streamlit):
+    """Tests that judgment type counts from the home snapshot are drawn as a pie chart."""
+    display_cases_by_judgment_type([{"Judgment Type": "civil", "Case Count": 200},
+                                    {"Judgment Type": "criminal", "Case Count": 150}])
 
+    chart = mock_streamlit.call_args[0][0]
+    assert chart.data["Judgment Type"].tolist() == ["Civil", "Criminal"]
 
 
-def test_cases_by_judgment_type(mock_conn, mock_streamlit):
-    """Tests cases by judgment type."""
+def test_fetch_court_rulings_aggregates_in_sql(mock_conn):
+    """Tests that ruling counts are grouped in SQL for one court and date range."""
     conn, cursor = mock_conn
+    cursor.fetchall.return_value = [("appellant", 3), ("respondent", 2)]
 
-    cursor.fetchall.return_value = [
-        ("Civil", 200),
-        ("Criminal", 150),
-    ]
+    result = fetch_court_rulings(conn, "supreme court", date(2024, 1, 1), date(2024, 12, 31))
 
-    cases_by_judgment_type(conn)
-    cursor.execute.assert_called_once_with(
-        """SELECT judgment_type as "Judgment Type", COUNT(*) AS "Case Count"
-    FROM judgment
-    JOIN judgment_type
-    ON judgment.judgment_type_id = judgment_type.judgment_type_id
-    GROUP BY judgment_type"""
-    )
+    query, params = cursor.execute.call_args[0]
+    assert "GROUP BY r.role_name" in query
+    assert "judgment_summary" not in query
+    assert params == ("supreme court", date(2024, 1, 1), date(2024, 12, 31))
+    assert result == [("appellant", 3), ("respondent", 2)]
 
 
+@patch("dashboard_functions.fetch_court_rulings", return_value=[("appellant", 3)])
+@patch("dashboard_functions.fetch_courts")
+def test_display_judgments_for_court_queries_selected_court(mock_fetch_courts, mock_fetch_rulings,
+                                                            mock_streamlit):
+    """Tests that only the selected court's rulings are fetched."""
+    mock_fetch_courts.return_value = [
+        {"court_name": "supreme court", "min_date": date(2023, 1, 1), "max_date": date(2024, 6, 1)},
+        {"court_name": "high court", "min_date": date(2022, 1, 1), "max_date": date(2024, 1, 1)}
+    ]
+    conn = MagicMock()
+    with patch.object(st, "selectbox", return_value="Supreme Court"), \
+         patch.object(st, "date_input", return_value=(date(2024, 1, 1), date(2024, 3, 1))):
+        display_judgments_for_court(conn)
+
+    mock_fetch_rulings.assert_called_once_with(conn, "supreme court",
+                                               date(2024, 1, 1), date(2024, 3, 1))
+    mock_streamlit.assert_called_once()
+
@@ -3,11 +3,15 @@ import psycopg2
 import pytest
 from unittest.mock import MagicMock, patch
 from data_source import (display_judgment_search, fetch_judgments,
-                        fetch_case_overview, fetch_parties_involved, connect,
-                        get_db_connection, get_most_recent_judgments,
-                        get_most_recent_judgment, display_as_table, display_judgment,
-                        get_random_judgment_with_summary_and_date
+                        fetch_case_overview, fetch_parties_involved, get_db_pool,
+                        get_db_connection, display_as_table, display_judgment,
+                        fetch_judgment_html,
+                        count_judgments, display_page_buttons,
+                        fetch_filter_facets, format_facet, fetch_home_snapshot
 )
+import gzip
+import io
+import threading
 import pandas as pd
 from datetime import datetime
 
@@ -24,34 +28,88 @@ def mock_db_conn():
     return mock_conn
 
 
-def test_get_db_connection():
-    """Test that get_db_connection calls connect and returns a connection."""
-    with patch("data_source.connect") as mock_connect:
-        conn = get_db_connection()
-        mock_connect.assert_called_once()
-        assert conn is not None
-
-
-
-def test_get_most_recent_judgments(mock_db_conn):
-    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
-    mock_cursor.fetchall.return_value = [
-        {"judgment": "Case123", "judge": "John Doe", "court": "Supreme Court"}]
-    results = get_most_recent_judgments(mock_db_conn)
-    assert results[0]["judgment"] == "Case123"
-    assert results[0]["judge"] == "John Doe"
-    assert results[0]["court"] == "Supreme Court"
-
-
-def test_get_most_recent_judgment(mock_db_conn):
-    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
-    mock_cursor.fetchone.return_value = {"neutral_citation": "Case123",
-                                         "argument_summary": "This is a summary", "judgement_date": "2025-01-01"}
-    result = get_most_recent_judgment(mock_db_conn)
-    assert result["neutral_citation"] == "Case123"
-    assert result["argument_summary"] == "This is a summary"
-    assert result["judgement_date"] == "2025-01-01"
-
+def test_get_db_connection_lends_pooled_connection():
+    """Test that a pooled connection is lent for the block and returned afterwards."""
+    mock_pool = MagicMock()
+    mock_conn = mock_pool.getconn.return_value
+    mock_conn.closed = 0
+    with patch("data_source.get_db_pool",
+               return_value={"pool": mock_pool, "semaphore": threading.Semaphore(1)}):
+        with get_db_connection() as conn:
+            assert conn is mock_conn
+    mock_pool.putconn.assert_called_once_with(mock_conn, close=False)
+
+
+def test_get_db_connection_replaces_dropped_connection():
+    """Test that a connection that fails its health check is closed and replaced."""
+    mock_pool = MagicMock()
+    dropped, fresh = MagicMock(closed=1), MagicMock(closed=0)
+    mock_pool.getconn.side_effect = [dropped, fresh]
+    with patch("data_source.get_db_pool",
+               return_value={"pool": mock_pool, "semaphore": threading.Semaphore(1)}):
+        with get_db_connection() as conn:
+            assert conn is fresh
+    mock_pool.putconn.assert_any_call(dropped, close=True)
+    mock_pool.putconn.assert_called_with(fresh, close=False)
+
+
+def test_get_db_connection_discards_connection_after_operational_error():
+    """Test that a connection that fails during the block is not reused."""
+    mock_pool = MagicMock()
+    mock_conn = mock_pool.getconn.return_value
+    mock_conn.closed = 0
+    with patch("data_source.get_db_pool",
+               return_value={"pool": mock_pool, "semaphore": threading.Semaphore(1)}):
+        with pytest.raises(psycopg2.OperationalError):
+            with get_db_connection():
+                raise psycopg2.OperationalError("server closed the connection")
+    mock_pool.putconn.assert_called_once_with(mock_conn, close=True)
+
+
+def test_get_db_connection_sets_autocommit_before_health_check():
+    """Test that autocommit is switched on before the health check opens a transaction."""
+    mock_pool = MagicMock()
+    mock_conn = MagicMock(closed=0)
+    mock_pool.getconn.return_value = mock_conn
+    calls = []
+    type(mock_conn).autocommit = property(lambda self: None,
+                                          lambda self, value: calls.append("autocommit"))
+    mock_conn.cursor.return_value.__enter__.return_value.execute.side_effect = \
+        lambda query: calls.append("health check")
+    with patch("data_source.get_db_pool",
+               return_value={"pool": mock_pool, "semaphore": threading.Semaphore(1)}):
+        with get_db_connection():
+            pass
+    assert calls == ["autocommit", "health check"]
+
+
+def test_get_db_connection_returns_connection_when_autocommit_fails():
+    """Test that a connection rejecting autocommit is closed rather than leaked."""
+    mock_pool = MagicMock()
+    broken, fresh = MagicMock(closed=0), MagicMock(closed=0)
+    type(broken).autocommit = property(
+        lambda self: None,
+        lambda self, value: (_ for _ in ()).throw(psycopg2.ProgrammingError("in transaction")))
+    mock_pool.getconn.side_effect = [broken, fresh]
+    with patch("data_source.get_db_pool",
+               return_value={"pool": mock_pool, "semaphore": threading.Semaphore(1)}):
+        with get_db_connection() as conn:
+            assert conn is fresh
+    mock_pool.putconn.assert_any_call(broken, close=True)
+    mock_pool.putconn.assert_called_with(fresh, close=False)
+
+
+def test_get_db_pool_sets_statement_timeout():
+    """Test that pooled connections are sized from the environment with a statement timeout."""
+    get_db_pool.clear()
+    with patch("data_source.ThreadedConnectionPool") as mock_pool, \
+         patch.dict("os.environ", {"DB_POOL_MIN": "2", "DB_POOL_MAX": "8",
+                                   "DB_STATEMENT_TIMEOUT": "5000"}):
+        get_db_pool()
+    args, kwargs = mock_pool.call_args
+    assert args == (2, 8)
+    assert kwargs["options"] == "-c statement_timeout=5000"
+    get_db_pool.clear()
 
 
 def test_display_as_table():
@@ -76,17 +134,6 @@ def test_display_judgment_no_data():
         mock_write.assert_called_once_with("<p>No judgment found.")
 
 
-def test_get_random_judgment_with_summary_and_date(mock_db_conn):
-    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
-    mock_cursor.fetchone.return_value = {"neutral_citation": "RandomCase",
-                                         "judgment_summary": "Random summary", "judgement_date": "2025-02-01"}
-    result = get_random_judgment_with_summary_and_date(
-        mock_db_conn)
-    assert result["neutral_citation"] == "RandomCase"
-    assert result["judgment_summary"] == "Random summary"
-    assert result["judgement_date"] == "2025-02-01"
-
-
 def test_fetch_judgments_row_count(mock_db_conn):
     mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
     mock_cursor.fetchall.return_value = [
@@ -360,3 +407,223 @@ def test_fetch_case_overview_success(mock_connect):
     }
     
     assert result == expected
+
+
+@patch.dict("os.environ", {"BUCKET_NAME": "test-bucket"})
+def test_fetch_judgment_html_decompresses_gzip():
+    """Test fetch_judgment_html decodes html stored gzip-compressed by the pipeline."""
+    mock_s3 = MagicMock()
+    mock_s3.get_object.return_value = {
+        "Body": io.BytesIO(gzip.compress(b"<p>Judgment</p>")),
+        "ContentEncoding": "gzip"
+    }
+
+    result = fetch_judgment_html("[2025] EWCA Civ 123", mock_s3)
+
+    mock_s3.get_object.assert_called_once_with(Bucket="test-bucket",
+                                               Key="ewca-civ-2025-123.html")
+    assert result == "<p>Judgment</p>"
+
+
+@patch.dict("os.environ", {"BUCKET_NAME": "test-bucket"})
+def test_fetch_judgment_html_uncompressed():
+    """Test fetch_judgment_html still reads html uploaded without compression."""
+    mock_s3 = MagicMock()
+    mock_s3.get_object.return_value = {"Body": io.BytesIO(b"<p>Judgment</p>")}
+
+    assert fetch_judgment_html("[2025] UKSC 1", mock_s3) == "<p>Judgment</p>"
+
+
+def test_fetch_judgments_search_uses_full_text_index(mock_db_conn):
+    """Test that a search query is filtered in SQL instead of in pandas."""
+    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = [
+        ("[2023] UKSC 10", "2023-12-10", "the **contract** was void",
+         "Supreme Court", "civil", 0.4)
+    ]
+    df = fetch_judgments(mock_db_conn, "contract", court="supreme court")
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "websearch_to_tsquery" in query and "ts_headline" in query
+    assert "<%% neutral_citation" in query
+    assert params[5:] == ("contract", "contract", "contract", 10, "supreme court", 25)
+    assert df.iloc[0]["judgment_summary"] == "the **contract** was void"
+
+
+def test_fetch_judgments_search_orders_by_relevance(mock_db_conn):
+    """Test that search results keep their relevance order, citation matches first,
+    and page by (rank, citation) rather than by date."""
+    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = []
+    fetch_judgments(mock_db_conn, "uksc 10", after=(1.5, "[2023] UKSC 10"))
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "ORDER BY search_rank DESC, j.neutral_citation DESC" in query
+    assert "THEN 1 + word_similarity(%s, j.neutral_citation)" in query
+    assert "ts_rank(j.judgment_search" in query
+    assert "j.neutral_citation) < (%s, %s)" in query
+    assert "(j.judgment_date, j.neutral_citation) <" not in query
+    assert params[-3:] == (1.5, "[2023] UKSC 10", 25)
+
+
+def test_fetch_judgments_without_search_skips_ranking(mock_db_conn):
+    """Test that browsing without a search query previews the start of each summary."""
+    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = []
+    fetch_judgments(mock_db_conn, court="supreme court")
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "ts_headline" not in query
+    assert "left(j.judgment_summary, %s)" in query
+    assert params == (200, 200, "supreme court", 25)
+
+
+def test_fetch_judgments_keyset_pagination(mock_db_conn):
+    """Test that the next page starts after the last row of the previous one."""
+    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = []
+    fetch_judgments(mock_db_conn, after=("2023-12-10", "[2023] UKSC 10"), page_size=10)
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "(j.judgment_date, j.neutral_citation) < (%s, %s)" in query
+    assert "OFFSET" not in query
+    assert params[-3:] == ("2023-12-10", "[2023] UKSC 10", 10)
+
+
+def test_count_judgments_uses_same_filters(mock_db_conn):
+    """Test that the total count shares the page query's filters."""
+    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = {"total": 42}
+
+    assert count_judgments(mock_db_conn, court="supreme court", case_type="Civil") == 42
+    query, params = mock_cursor.execute.call_args[0]
+    assert "COUNT(*)" in query and "LIMIT" not in query
+    assert params == ("supreme court", "%Civil%")
+
+
+def test_fetch_filter_facets_reads_snapshot(mock_db_conn):
+    """Test that the filter options and date bounds come from one facet snapshot query."""
+    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = [
+        {"facet": "court", "facet_value": "supreme court", "judgment_count": 12,
+         "min_date": datetime(2024, 1, 2), "max_date": datetime(2025, 1, 2)},
+        {"facet": "judgment_type", "facet_value": "civil", "judgment_count": 30,
+         "min_date": datetime(2023, 1, 2), "max_date": datetime(2025, 1, 2)},
+        {"facet": "all", "facet_value": "all", "judgment_count": 40,
+         "min_date": datetime(2023, 1, 2), "max_date": datetime(2025, 2, 1)}
+    ]
+
+    facets = fetch_filter_facets(mock_db_conn)
+
+    assert mock_cursor.execute.call_count == 1
+    assert "FROM judgment_filter_facets" in mock_cursor.execute.call_args[0][0]
+    assert facets == {"courts": {"supreme court": 12}, "types": {"civil": 30}, "total": 40,
+                      "min_date": datetime(2023, 1, 2), "max_date": datetime(2025, 2, 1)}
+
+
+def test_format_facet_shows_counts():
+    """Test that filter options are labelled with their judgment counts."""
+    counts = {"supreme court": 1200}
+
+    assert format_facet("Supreme Court", counts, 5000) == "Supreme Court (1,200)"
+    assert format_facet("All", counts, 5000) == "All (5,000)"
+    assert format_facet("High Court", counts, 5000) == "High Court (0)"
+
+
+def test_fetch_home_snapshot_reads_one_document(mock_db_conn):
+    """Test that the home page is read from one snapshot row."""
+    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = {"snapshot": {
+        "most_recent_judgment": {"neutral_citation": "[2025] UKSC 1"},
+        "recent_judgments": [{"judgment": "[2025] UKSC 1", "court": "supreme court"}]}}
+
+    snapshot = fetch_home_snapshot(mock_db_conn)
+
+    assert mock_cursor.execute.call_count == 1
+    assert snapshot["most_recent_judgment"] == {"neutral_citation": "[2025] UKSC 1"}
+    assert snapshot["cases_by_court"] == []
+
+
+def test_fetch_home_snapshot_before_first_build(mock_db_conn):
+    """Test that empty sections are returned until the pipeline builds the snapshot."""
+    mock_cursor = mock_db_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = None
+
+    snapshot = fetch_home_snapshot(mock_db_conn)
+
+    assert snapshot["judgment_of_the_day"] == {}
+    assert snapshot["cases_over_time"] == []
+
+
+@patch("data_source.fetch_judgments")
+@patch("data_source.display_selected_judgment")
+@patch("data_source.fetch_case_overview", return_value={"Neutral Citation": "[2025] UKSC 1"})
+def test_display_judgment_search_deep_link_skips_search(mock_overview, mock_display_selected,
+                                                       mock_fetch_judgments, mock_db_conn):
+    """Test that a linked judgment is shown by primary key without running the search."""
+    mock_s3 = MagicMock()
+    with patch.object(st, "query_params", {"selected_citation": "[2025] UKSC 1"}), \
+         patch("streamlit.button", return_value=False):
+        display_judgment_search(mock_db_conn, mock_s3)
+
+    mock_overview.assert_called_once_with(mock_db_conn, "[2025] UKSC 1")
+    mock_display_selected.assert_called_once_with(mock_db_conn, mock_s3, "[2025] UKSC 1")
+    mock_fetch_judgments.assert_not_called()
+
+
+@patch("data_source.fetch_filter_facets")
+@patch("data_source.fetch_judgments")
+@patch("data_source.fetch_case_overview", return_value=None)
+def test_display_judgment_search_unknown_deep_link_falls_back(mock_overview,
+                                                              mock_fetch_judgments,
+                                                              mock_facets, mock_db_conn):
+    """Test that an unknown linked citation falls back to the search page."""
+    mock_facets.return_value = {"courts": {}, "types": {}, "total": 0,
+                                "min_date": datetime(2025, 1, 1), "max_date": datetime(2025, 2, 1)}
+    mock_fetch_judgments.return_value = pd.DataFrame(
+        columns=["neutral_citation", "judgment_date", "judgment_summary",
+                 "court_name", "judgment_type"])
+    with patch.object(st, "query_params", {"selected_citation": "[2099] UKSC 9"}), \
+         patch("streamlit.text_input", return_value=""), \
+         patch("streamlit.date_input", return_value=()), \
+         patch("streamlit.html") as mock_html:
+        display_judgment_search(mock_db_conn, MagicMock())
+
+    mock_fetch_judgments.assert_called_once()
+    assert "[2099] UKSC 9 was not found" in mock_html.call_args_list[0].args[0]
+
+
+
+@patch("data_source.fetch_filter_facets")
+@patch("data_source.fetch_judgments")
+@patch("data_source.fetch_case_overview", return_value=None)
+def test_display_judgment_search_escapes_unknown_deep_link(mock_overview,
+                                                          mock_fetch_judgments,
+                                                          mock_facets, mock_db_conn):
+    """Test that a linked citation is escaped before it is shown."""
+    mock_facets.return_value = {"courts": {}, "types": {}, "total": 0,
+                                "min_date": datetime(2025, 1, 1), "max_date": datetime(2025, 2, 1)}
+    mock_fetch_judgments.return_value = pd.DataFrame(
+        columns=["neutral_citation", "judgment_date", "judgment_summary",
+                 "court_name", "judgment_type"])
+    with patch.object(st, "query_params", {"selected_citation": "<script>alert(1)</script>"}), \
+         patch("streamlit.text_input", return_value=""), \
+         patch("streamlit.date_input", return_value=()), \
+         patch("streamlit.html") as mock_html:
+        display_judgment_search(mock_db_conn, MagicMock())
+
+    assert "&lt;script&gt;alert(1)&lt;/script&gt; was not found" in \
+        mock_html.call_args_list[0].args[0]
+
+
+def test_display_page_buttons_pages_search_results_by_rank():
+    """Test that the next page of search results starts after the last row's rank."""
+    df = pd.DataFrame([{"neutral_citation": "[2023] UKSC 10", "judgment_date": "2023-12-10",
+                        "search_rank": 1.5}])
+    with patch.object(st, "session_state", MagicMock(page_cursors=[None])) as state, \
+         patch("streamlit.columns", return_value=(MagicMock(), MagicMock())), \
+         patch("streamlit.button", return_value=True), \
+         patch("streamlit.rerun"):
+        display_page_buttons(df, page_size=1)
+
+    assert state.page_cursors == [None, (1.5, "[2023] UKSC 10")]
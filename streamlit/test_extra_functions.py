@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock, patch
+import streamlit as st
+from extra_functions import fetch_chamber_stats, compare_chambers
+
+
+def test_fetch_chamber_stats_uses_one_query():
+    """Tests that every selected chamber is read from the rollup in a single query."""
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [("Chamber A", 10, 4, 6), ("Chamber B", 5, 1, 4)]
+
+    result = fetch_chamber_stats(conn, [1, 2, 3])
+
+    query, params = cursor.execute.call_args[0]
+    assert cursor.execute.call_count == 1
+    assert "FROM chamber_judgment_stats" in query and "ANY(%s)" in query
+    assert params == ([1, 2, 3],)
+    assert len(result) == 2
+
+
+@patch("extra_functions.fetch_chamber_stats")
+@patch("extra_functions.fetch_chambers")
+def test_compare_chambers_compares_every_selected_chamber(mock_fetch_chambers,
+                                                          mock_fetch_stats):
+    """Tests that any number of selected chambers are compared, skipping invalid names."""
+    mock_fetch_chambers.return_value = [
+        {"chamber_id": 1, "chamber_name": "chamber a"},
+        {"chamber_id": 2, "chamber_name": "none"},
+        {"chamber_id": 3, "chamber_name": "chamber c"},
+        {"chamber_id": 4, "chamber_name": "chamber d"}
+    ]
+    mock_fetch_stats.return_value = [("chamber a", 10, 4, 6), ("chamber c", 5, 1, 4),
+                                     ("chamber d", 2, 2, 0)]
+    conn = MagicMock()
+    with patch.object(st, "multiselect",
+                      return_value=["Chamber A", "Chamber C", "Chamber D"]) as mock_select, \
+         patch.object(st, "altair_chart") as mock_chart:
+        compare_chambers(conn)
+
+    assert mock_select.call_args.args[1] == ["Chamber A", "Chamber C", "Chamber D"]
+    mock_fetch_stats.assert_called_once_with(conn, [1, 3, 4])
+    assert mock_chart.call_count == 3
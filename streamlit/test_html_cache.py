@@ -0,0 +1,69 @@
+import io
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError
+from html_cache import (create_html_cache, load_html, get_html, prefetch_html,
+                        put_entry, REVALIDATE_SECONDS)
+
+
+def make_s3(html: bytes, etag: str = '"abc"') -> MagicMock:
+    mock_s3 = MagicMock()
+    mock_s3.get_object.side_effect = lambda **_: {"Body": io.BytesIO(html), "ETag": etag}
+    return mock_s3
+
+
+def test_load_html_serves_repeat_views_from_memory():
+    """Test that recently viewed html is not downloaded again."""
+    cache = create_html_cache(1024)
+    mock_s3 = make_s3(b"<p>Judgment</p>")
+
+    assert load_html(cache, mock_s3, "bucket", "uksc-2025-1.html") == "<p>Judgment</p>"
+    assert load_html(cache, mock_s3, "bucket", "uksc-2025-1.html") == "<p>Judgment</p>"
+    mock_s3.get_object.assert_called_once_with(Bucket="bucket", Key="uksc-2025-1.html")
+
+
+def test_put_entry_evicts_least_recently_used_within_byte_budget():
+    """Test that the cache evicts the least recently used html to stay within its bytes."""
+    cache = create_html_cache(10)
+    for key in ["a", "b", "c"]:
+        put_entry(cache, key, {"etag": "", "html": "x" * 4, "size": 4, "checked": 0.0})
+
+    assert list(cache["entries"]) == ["b", "c"]
+    assert cache["size"] == 8
+
+
+def test_load_html_revalidates_stale_entry_with_etag():
+    """Test that stale html is checked against its ETag and kept when unchanged."""
+    cache = create_html_cache(1024)
+    mock_s3 = make_s3(b"<p>Judgment</p>")
+    load_html(cache, mock_s3, "bucket", "key.html")
+    cache["entries"]["key.html"]["checked"] -= REVALIDATE_SECONDS + 1
+    mock_s3.get_object.side_effect = ClientError(
+        {"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject")
+
+    assert load_html(cache, mock_s3, "bucket", "key.html") == "<p>Judgment</p>"
+    mock_s3.get_object.assert_called_with(Bucket="bucket", Key="key.html", IfNoneMatch='"abc"')
+
+
+def test_load_html_reads_disk_tier(tmp_path):
+    """Test that html kept on disk survives a new in-memory cache and is revalidated."""
+    mock_s3 = make_s3(b"<p>Judgment</p>")
+    load_html(create_html_cache(1024, str(tmp_path)), mock_s3, "bucket", "key.html")
+    mock_s3.get_object.side_effect = ClientError(
+        {"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject")
+
+    cache = create_html_cache(1024, str(tmp_path))
+    assert load_html(cache, mock_s3, "bucket", "key.html") == "<p>Judgment</p>"
+    assert mock_s3.get_object.call_args.kwargs["IfNoneMatch"] == '"abc"'
+
+
+def test_prefetch_html_fills_cache_in_background():
+    """Test that a prefetched judgment is then read without another download."""
+    cache = create_html_cache(1024)
+    mock_s3 = make_s3(b"<p>Judgment</p>")
+
+    prefetch_html(cache, mock_s3, "bucket", "key.html")
+    assert get_html(cache, mock_s3, "bucket", "key.html") == "<p>Judgment</p>"
+    cache["executor"].shutdown(wait=True)
+
+    assert mock_s3.get_object.call_count == 1
+    assert cache["in_flight"] == {}
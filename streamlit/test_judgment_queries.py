@@ -0,0 +1,19 @@
+from judgment_queries import build_judgments_query, build_count_query
+
+
+def test_build_judgments_query_pages_browsing_by_date():
+    """Test that browsing is keyset paginated on the judgment date and citation."""
+    query, params, columns = build_judgments_query(25, after=("2025-01-01", "[2025] UKSC 1"))
+
+    assert "(j.judgment_date, j.neutral_citation) < (%s, %s)" in query
+    assert "search_rank" not in columns
+    assert params[-3:] == ["2025-01-01", "[2025] UKSC 1", 25]
+
+
+def test_build_count_query_shares_the_page_filters():
+    """Test that the count and the page apply the same filters with the same parameters."""
+    page_query, page_params, _ = build_judgments_query(25, "negligence", "Supreme Court")
+    count_query, count_params = build_count_query("negligence", "Supreme Court")
+
+    assert count_query.split("WHERE")[1].strip() in page_query
+    assert page_params[5:-1] == count_params
@@ -3,6 +3,15 @@ from unittest.mock import patch, MagicMock
 import streamlit as st
 from Home import main
 
+SNAPSHOT = {
+    "most_recent_judgment": "most_recent_judgment",
+    "judgment_of_the_day": "random_judgment",
+    "cases_over_time": ["over_time"],
+    "cases_by_type": ["by_type"],
+    "cases_by_court": ["by_court"],
+    "recent_judgments": ["judgment1", "judgment2"]
+}
+
 @pytest.fixture
 def mock_dependencies(mocker):
     """Fixture to mock all dependencies."""
@@ -11,16 +20,16 @@ def mock_dependencies(mocker):
         "mock_dashboard_title": mocker.patch("Home.dashboard_title"),
         "mock_homepage_text": mocker.patch("Home.homepage_text"),
         "mock_get_db_connection": mocker.patch("Home.get_db_connection"),
-        "mock_get_most_recent_judgments": mocker.patch("Home.get_most_recent_judgments"),
+        "mock_fetch_home_snapshot": mocker.patch("Home.fetch_home_snapshot",
+                                                 return_value=SNAPSHOT),
         "mock_display_as_table": mocker.patch("Home.display_as_table"),
-        "mock_get_most_recent_judgment": mocker.patch("Home.get_most_recent_judgment"),
         "mock_display_judgment": mocker.patch("Home.display_judgment"),
-        "mock_get_random_judgment": mocker.patch("Home.get_random_judgment_with_summary_and_date"),
         "mock_st_columns": mocker.patch("streamlit.columns", return_value=(MagicMock(), MagicMock())),
         "mock_st_subheader": mocker.patch("streamlit.subheader"),
-        "mock_cases_by_court": mocker.patch("Home.cases_by_court"),
-        "mock_cases_by_judgment_type": mocker.patch("Home.cases_by_judgment_type"),
-        "mock_cases_over_time":mocker.patch("Home.cases_over_time")
+        "mock_cases_by_court": mocker.patch("Home.display_cases_by_court"),
+        "mock_cases_by_judgment_type": mocker.patch("Home.display_cases_by_judgment_type"),
+        "mock_cases_over_time":mocker.patch("Home.display_cases_over_time"),
+        "mock_display_cache_stats": mocker.patch("Home.display_cache_stats")
     }
 
 
@@ -37,11 +46,15 @@ def test_renders_dashboard_title(mock_dependencies):
 
 def test_cases_by_court(mock_dependencies):
     main()
-    mock_dependencies["mock_cases_by_court"].assert_called_once()
+    mock_dependencies["mock_cases_by_court"].assert_called_once_with(["by_court"])
 
 def test_cases_by_judgment_type(mock_dependencies):
     main()
-    mock_dependencies["mock_cases_by_judgment_type"].assert_called_once()
+    mock_dependencies["mock_cases_by_judgment_type"].assert_called_once_with(["by_type"])
+
+def test_cases_over_time(mock_dependencies):
+    main()
+    mock_dependencies["mock_cases_over_time"].assert_called_once_with(["over_time"])
 
 def test_renders_homepage_text(mock_dependencies):
     """Tests if the homepage text function is called."""
@@ -55,44 +68,51 @@ def test_fetches_db_connection(mock_dependencies):
     mock_dependencies["mock_get_db_connection"].assert_called_once()
 
 
-def test_fetches_and_displays_recent_judgments(mock_dependencies):
-    """Tests if recent judgments are fetched and displayed in a table."""
+def test_fetches_home_snapshot_once(mock_dependencies):
+    """Tests if the whole page is rendered from a single snapshot fetch."""
     mock_conn = MagicMock()
-    mock_dependencies["mock_get_db_connection"].return_value = mock_conn
-    mock_dependencies["mock_get_most_recent_judgments"].return_value = [
-        "judgment1", "judgment2"]
+    mock_dependencies["mock_get_db_connection"].return_value.__enter__.return_value = mock_conn
 
     main()
 
-    mock_dependencies["mock_get_most_recent_judgments"].assert_called_once_with(
-        mock_conn)
+    mock_dependencies["mock_fetch_home_snapshot"].assert_called_once_with(mock_conn)
+
+
+def test_displays_recent_judgments(mock_dependencies):
+    """Tests if recent judgments are displayed in a table."""
+    main()
+
     mock_dependencies["mock_display_as_table"].assert_called_once_with(
         ["judgment1", "judgment2"])
 
 
-def test_fetches_and_displays_most_recent_judgment(mock_dependencies):
-    """Tests if the most recent judgment is retrieved and displayed."""
-    mock_conn = MagicMock()
-    mock_dependencies["mock_get_db_connection"].return_value = mock_conn
-    mock_dependencies["mock_get_most_recent_judgment"].return_value = "most_recent_judgment"
-
+def test_displays_most_recent_judgment(mock_dependencies):
+    """Tests if the most recent judgment is displayed."""
     main()
 
-    mock_dependencies["mock_get_most_recent_judgment"].assert_called_once_with(
-        mock_conn)
     mock_dependencies["mock_display_judgment"].assert_any_call(
         "most_recent_judgment")
 
 
-def test_fetches_and_displays_random_judgment(mock_dependencies):
-    """Tests if the random judgment is retrieved and displayed."""
-    mock_conn = MagicMock()
-    mock_dependencies["mock_get_db_connection"].return_value = mock_conn
-    mock_dependencies["mock_get_random_judgment"].return_value = "random_judgment"
-
+def test_displays_random_judgment(mock_dependencies):
+    """Tests if the judgment of the day is displayed."""
     main()
 
-    mock_dependencies["mock_get_random_judgment"].assert_called_once_with(
-        mock_conn)
     mock_dependencies["mock_display_judgment"].assert_any_call(
         "random_judgment")
+
+
+def test_hides_cache_stats_by_default(mock_dependencies):
+    """Tests that visitors are not shown the query cache statistics."""
+    with patch.dict("os.environ", {}, clear=True):
+        main()
+
+    mock_dependencies["mock_display_cache_stats"].assert_not_called()
+
+
+def test_shows_cache_stats_when_enabled(mock_dependencies):
+    """Tests that the query cache statistics are shown when SHOW_CACHE_STATS is set."""
+    with patch.dict("os.environ", {"SHOW_CACHE_STATS": "true"}):
+        main()
+
+    mock_dependencies["mock_display_cache_stats"].assert_called_once()
@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock, patch
+from query_cache import versioned_cache, get_cache_stats, get_data_version, CACHE_STATS
+
+
+@versioned_cache
+def fetch_citations(_conn, court):
+    """Test query returning the citations of a court."""
+    with _conn.cursor() as cursor:
+        cursor.execute("SELECT neutral_citation FROM judgment WHERE court = %s", (court,))
+        return cursor.fetchall()
+
+
+def make_conn(rows):
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value.fetchall.return_value = rows
+    return mock_conn
+
+
+def test_versioned_cache_reuses_results_until_data_changes():
+    """Test that repeated calls are served from the cache until the data version is bumped."""
+    CACHE_STATS.clear()
+    mock_conn = make_conn([{"neutral_citation": "[2023] UKSC 10"}])
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+    assert fetch_citations(mock_conn, "uksc") == [{"neutral_citation": "[2023] UKSC 10"}]
+    assert fetch_citations(mock_conn, "uksc") == [{"neutral_citation": "[2023] UKSC 10"}]
+    assert mock_cursor.execute.call_count == 1
+
+    with patch("query_cache.get_data_version", return_value=2):
+        fetch_citations(mock_conn, "uksc")
+    assert mock_cursor.execute.call_count == 2
+
+
+def test_versioned_cache_keys_on_arguments():
+    """Test that different arguments are cached separately."""
+    mock_conn = make_conn([])
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+
+    fetch_citations(mock_conn, "uksc")
+    fetch_citations(mock_conn, "ewca")
+
+    assert mock_cursor.execute.call_count == 2
+
+
+def test_get_cache_stats_counts_hits_and_misses():
+    """Test that cache lookups are reported per query with a hit rate."""
+    CACHE_STATS.clear()
+    mock_conn = make_conn([])
+
+    for _ in range(4):
+        fetch_citations(mock_conn, "uksc")
+
+    stats = get_cache_stats()
+    row = stats[stats["query"] == "fetch_citations"].iloc[0]
+    assert (row["hits"], row["misses"], row["hit_rate"]) == (3, 1, 0.75)
+
+
+def test_get_data_version_reads_current_version():
+    """Test that the data version is read from the data_version table."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = {"version": 5}
+
+    assert get_data_version(mock_conn) == 5
+    assert "FROM data_version" in mock_cursor.execute.call_args[0][0]